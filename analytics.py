@@ -0,0 +1,195 @@
+import math
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from product import Product
+from enums import TransactionType
+from journal import TRANSACTION_TYPES, TYPE_CODES, TransactionJournal
+
+GRANULARITIES = ('hour', 'day', 'month')
+DEFAULT_TURNOVER_DAYS = 30
+SHIPMENT_CODE = TYPE_CODES[TransactionType.SHIPMENT]
+
+Volumes = Dict[TransactionType, int]
+
+
+class InventoryAnalytics:
+
+    def __init__(self, products: Callable[[], Iterable[Product]], journal: TransactionJournal):
+        self._products = products
+        self._journal = journal
+        self._stock_ready = True
+        self._history_ready = True
+        self._total_cents = 0
+        self._total_quantity = 0
+        self._supplier_cents: Dict[str, int] = {}
+        self._rollups: Dict[str, Dict[datetime, List[int]]] = {}
+        self._daily_volumes: Dict[str, Dict[date, List[int]]] = {}
+        self._hour_start = 0.0
+        self._hour_end = 0.0
+        self._buckets: Tuple[datetime, datetime, datetime] = (datetime.min, datetime.min, datetime.min)
+        self._day = date.min
+        self._reset_history()
+
+    def invalidate(self) -> None:
+        self._stock_ready = False
+        self._history_ready = False
+
+    def total_stock_value(self) -> float:
+        self._ensure_stock()
+        return self._total_cents / 100
+
+    def total_quantity(self) -> int:
+        self._ensure_stock()
+        return self._total_quantity
+
+    def supplier_stock_value(self, supplier_name: str) -> float:
+        self._ensure_stock()
+        return self._supplier_cents.get(supplier_name, 0) / 100
+
+    def supplier_stock_values(self) -> Dict[str, float]:
+        self._ensure_stock()
+        return {supplier_name: cents / 100 for supplier_name, cents in self._supplier_cents.items()}
+
+    def shipped_units(
+        self,
+        product_name: Optional[str] = None,
+        days: int = DEFAULT_TURNOVER_DAYS,
+        now: Optional[datetime] = None,
+    ) -> int:
+        if days <= 0:
+            raise ValueError("Кількість днів повинна бути більше нуля")
+        self._ensure_history()
+        first_day = (now or datetime.now()).date() - timedelta(days=days - 1)
+        if product_name is None:
+            first_bucket = datetime.combine(first_day, datetime.min.time())
+            return sum(totals[SHIPMENT_CODE] for bucket, totals in self._rollups['day'].items()
+                       if bucket >= first_bucket)
+        return sum(totals[SHIPMENT_CODE] for day, totals in self._daily_volumes.get(product_name, {}).items()
+                   if day >= first_day)
+
+    def turnover(
+        self,
+        on_hand: int,
+        product_name: Optional[str] = None,
+        days: int = DEFAULT_TURNOVER_DAYS,
+        now: Optional[datetime] = None,
+    ) -> float:
+        shipped = self.shipped_units(product_name, days, now)
+        if on_hand:
+            return shipped / on_hand
+        return math.inf if shipped else 0.0
+
+    def rollup(
+        self,
+        granularity: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Tuple[datetime, Volumes]]:
+        if granularity not in GRANULARITIES:
+            raise ValueError("Неправильна гранулярність. Доступні: 'hour', 'day', 'month'")
+        self._ensure_history()
+        return [
+            (bucket, _volumes(totals))
+            for bucket, totals in sorted(self._rollups[granularity].items())
+            if (start is None or bucket >= start) and (end is None or bucket < end)
+        ]
+
+    def product_daily_volumes(self, product_name: str) -> Dict[date, Volumes]:
+        self._ensure_history()
+        days = self._daily_volumes.get(product_name, {})
+        return {day: _volumes(totals) for day, totals in sorted(days.items())}
+
+    def product_day_volume(self, product_name: str, day: date) -> Volumes:
+        self._ensure_history()
+        return _volumes(self._daily_volumes.get(product_name, {}).get(day, [0] * len(TRANSACTION_TYPES)))
+
+    def on_product_added(self, product: Product) -> None:
+        if self._stock_ready:
+            self._add_value(product.supplier.name, _cents(product.quantity, product.price), product.quantity)
+
+    def on_product_removed(self, product: Product) -> None:
+        if self._stock_ready:
+            self._add_value(product.supplier.name, -_cents(product.quantity, product.price), -product.quantity)
+
+    def on_product_changed(self, product: Product, attribute: str, old_value) -> None:
+        if not self._stock_ready:
+            return
+        if attribute == 'quantity':
+            delta = _cents(product.quantity, product.price) - _cents(old_value, product.price)
+            self._add_value(product.supplier.name, delta, product.quantity - old_value)
+        elif attribute == 'price':
+            delta = _cents(product.quantity, product.price) - _cents(product.quantity, old_value)
+            self._add_value(product.supplier.name, delta, 0)
+
+    def on_transaction(self, product_name: str, quantity: int, type_code: int, timestamp: float) -> None:
+        if self._history_ready:
+            self._add_volume(product_name, quantity, type_code, timestamp)
+
+    def on_transactions(self, product_names: Iterable[str], quantities: Iterable[int],
+                        type_code: int, timestamp: float) -> None:
+        if self._history_ready:
+            for product_name, quantity in zip(product_names, quantities):
+                self._add_volume(product_name, quantity, type_code, timestamp)
+
+    def _add_value(self, supplier_name: str, cents: int, quantity: int) -> None:
+        self._total_cents += cents
+        self._total_quantity += quantity
+        self._supplier_cents[supplier_name] = self._supplier_cents.get(supplier_name, 0) + cents
+
+    def _add_volume(self, product_name: str, quantity: int, type_code: int, timestamp: float) -> None:
+        if not self._hour_start <= timestamp < self._hour_end:
+            self._set_hour(timestamp)
+        for granularity, bucket in zip(GRANULARITIES, self._buckets):
+            totals = self._rollups[granularity].get(bucket)
+            if totals is None:
+                totals = self._rollups[granularity][bucket] = [0] * len(TRANSACTION_TYPES)
+            totals[type_code] += quantity
+
+        days = self._daily_volumes.get(product_name)
+        if days is None:
+            days = self._daily_volumes[product_name] = {}
+        totals = days.get(self._day)
+        if totals is None:
+            totals = days[self._day] = [0] * len(TRANSACTION_TYPES)
+        totals[type_code] += quantity
+
+    def _set_hour(self, timestamp: float) -> None:
+        hour = datetime.fromtimestamp(timestamp).replace(minute=0, second=0, microsecond=0)
+        self._hour_start = hour.timestamp()
+        self._hour_end = self._hour_start + 3600
+        day = hour.replace(hour=0)
+        self._buckets = (hour, day, day.replace(day=1))
+        self._day = day.date()
+
+    def _reset_history(self) -> None:
+        self._rollups = {granularity: {} for granularity in GRANULARITIES}
+        self._daily_volumes = {}
+        self._hour_start = self._hour_end = 0.0
+
+    def _ensure_stock(self) -> None:
+        if self._stock_ready:
+            return
+        self._total_cents = 0
+        self._total_quantity = 0
+        self._supplier_cents = {}
+        self._stock_ready = True
+        for product in self._products():
+            self._add_value(product.supplier.name, _cents(product.quantity, product.price), product.quantity)
+
+    def _ensure_history(self) -> None:
+        if self._history_ready:
+            return
+        self._reset_history()
+        self._history_ready = True
+        product_name = self._journal.product_name
+        for chunk in self._journal.chunks():
+            for product_id, quantity, type_code, timestamp in zip(*chunk.columns()):
+                self._add_volume(product_name(product_id), quantity, type_code, timestamp)
+
+
+def _cents(quantity: int, price: float) -> int:
+    return round(quantity * price * 100)
+
+
+def _volumes(totals: List[int]) -> Volumes:
+    return {transaction_type: totals[code] for code, transaction_type in enumerate(TRANSACTION_TYPES)}
@@ -0,0 +1,119 @@
+import argparse
+import random
+import threading
+import time
+from collections import Counter
+from typing import Dict, List
+from supplier import Supplier
+from product import Product
+from enums import TransactionType
+from concurrent_warehouse import ConcurrentWarehouse
+
+
+def build_warehouse(sku_count: int, stock: int) -> ConcurrentWarehouse:
+    warehouse = ConcurrentWarehouse("Стрес-тест")
+    supplier = Supplier("ТОВ Стрес", "stress@example.com", "+380991234567", "м. Київ")
+    warehouse.add_supplier(supplier)
+    for i in range(sku_count):
+        warehouse.add_product(Product(f"SKU-{i:06d}", stock, 100.0, supplier))
+    return warehouse
+
+
+def stress(threads: int, sku_count: int, stock: int, operations: int, seed: int) -> bool:
+    warehouse = build_warehouse(sku_count, stock)
+    supplier = warehouse.suppliers["ТОВ Стрес"]
+    names = list(warehouse.products)
+    shipped: List[Counter] = [Counter() for _ in range(threads)]
+    received: List[Counter] = [Counter() for _ in range(threads)]
+    start = threading.Barrier(threads)
+
+    def worker(number: int) -> None:
+        rng = random.Random(seed + number)
+        start.wait()
+        for _ in range(operations):
+            roll = rng.random()
+            try:
+                if roll < 0.6:
+                    lines = [(rng.choice(names), rng.randint(1, 5)) for _ in range(rng.randint(1, 3))]
+                    warehouse.ship_order(lines)
+                    for name, quantity in lines:
+                        shipped[number][name] += quantity
+                elif roll < 0.9:
+                    name = rng.choice(names)
+                    quantity = rng.randint(1, 5)
+                    warehouse.remove_product(name, quantity)
+                    shipped[number][name] += quantity
+                else:
+                    name = rng.choice(names)
+                    quantity = rng.randint(1, 10)
+                    warehouse.add_product(Product(name, quantity, 100.0, supplier))
+                    received[number][name] += quantity
+            except ValueError:
+                pass
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    total_shipped = sum(shipped, Counter())
+    total_received = sum(received, Counter())
+    journal_shipped: Dict[str, int] = Counter()
+    for transaction in warehouse.transactions:
+        if transaction.transaction_type is TransactionType.SHIPMENT:
+            journal_shipped[transaction.product.name] += transaction.quantity
+
+    consistent = True
+    for name in names:
+        product = warehouse.products.get(name)
+        on_hand = product.quantity if product is not None else 0
+        expected = stock + total_received[name] - total_shipped[name]
+        if on_hand != expected or on_hand < 0 or journal_shipped[name] != total_shipped[name]:
+            print(f"Розбіжність для {name}: на складі {on_hand}, очікувалось {expected}")
+            consistent = False
+
+    print(f"Потоків: {threads}, відвантажено одиниць: {sum(total_shipped.values())}, "
+          f"операцій у журналі: {len(warehouse.transactions)}")
+    print("Втрачених оновлень не виявлено" if consistent else "ВИЯВЛЕНО ВТРАЧЕНІ ОНОВЛЕННЯ")
+    return consistent
+
+
+def scaling(thread_counts: List[int], operations: int) -> None:
+    for threads in thread_counts:
+        warehouse = build_warehouse(threads, operations + 1)
+        names = list(warehouse.products)
+        start = threading.Barrier(threads + 1)
+
+        def worker(name: str) -> None:
+            start.wait()
+            for _ in range(operations):
+                warehouse.remove_product(name, 1)
+
+        workers = [threading.Thread(target=worker, args=(name,)) for name in names]
+        for thread in workers:
+            thread.start()
+        start.wait()
+        began = time.perf_counter()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - began
+        print(f"Потоків: {threads:>3}  операцій/с: {threads * operations / elapsed:>12,.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Стрес-тест конкурентного складу")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--skus", type=int, default=20)
+    parser.add_argument("--stock", type=int, default=1000)
+    parser.add_argument("--operations", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    consistent = stress(args.threads, args.skus, args.stock, args.operations, args.seed)
+    scaling([1, 2, 4, 8], args.operations)
+    raise SystemExit(0 if consistent else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+import random
+import time
+from typing import List, Optional
+from supplier import Supplier
+from product import Product
+from warehouse import Warehouse
+from server import WarehouseServer
+from protocol import DEFAULT_HOST, MAX_MESSAGE_SIZE, decode_message, encode_message
+
+SUPPLIER_NAME = "ТОВ Навантаження"
+READ_PAGE_SIZE = 50
+
+
+def build_warehouse(sku_count: int) -> Warehouse:
+    warehouse = Warehouse("Навантажувальний тест")
+    supplier = Supplier(SUPPLIER_NAME, "load@example.com", "+380991234567", "м. Київ")
+    warehouse.add_supplier(supplier)
+    for i in range(sku_count):
+        warehouse.add_product(Product(f"SKU-{i:06d}", 1_000_000, 100.0, supplier))
+    return warehouse
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+async def run_client(host: str, port: int, requests: int, depth: int, sku_count: int,
+                     read_ratio: float, seed: int, latencies: List[float]) -> int:
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port, limit=MAX_MESSAGE_SIZE)
+    sent_at = {}
+    failures = 0
+
+    async def receive(expected: int) -> None:
+        nonlocal failures
+        for _ in range(expected):
+            response = decode_message(await reader.readline())
+            latencies.append(time.perf_counter() - sent_at.pop(response['id']))
+            if not response['ok']:
+                failures += 1
+
+    for start in range(0, requests, depth):
+        window = min(depth, requests - start)
+        for request_id in range(start, start + window):
+            name = f"SKU-{rng.randrange(sku_count):06d}"
+            roll = rng.random()
+            if roll < read_ratio:
+                message = {'op': 'list_products', 'args': {'after': name, 'limit': READ_PAGE_SIZE}}
+            elif roll < read_ratio + (1 - read_ratio) / 2:
+                message = {'op': 'remove_product', 'args': {'name': name, 'quantity': 1}}
+            else:
+                message = {'op': 'add_product', 'args': {'name': name, 'quantity': 1, 'price': 100.0,
+                                                         'supplier': SUPPLIER_NAME}}
+            message['id'] = request_id
+            sent_at[request_id] = time.perf_counter()
+            writer.write(encode_message(message))
+        await writer.drain()
+        await receive(window)
+
+    writer.close()
+    await writer.wait_closed()
+    return failures
+
+
+async def run(clients: int, requests: int, depth: int, sku_count: int, read_ratio: float,
+              host: Optional[str], port: int, seed: int) -> None:
+    server = None
+    if host is None:
+        server = WarehouseServer(build_warehouse(sku_count), DEFAULT_HOST, 0)
+        await server.start()
+        host, port = server.host, server.port
+
+    latencies: List[float] = []
+    began = time.perf_counter()
+    failures = await asyncio.gather(*(
+        run_client(host, port, requests, depth, sku_count, read_ratio, seed + i, latencies)
+        for i in range(clients)
+    ))
+    elapsed = time.perf_counter() - began
+
+    latencies.sort()
+    total = clients * requests
+    print(f"Клієнтів: {clients}, запитів: {total}, глибина конвеєра: {depth}, помилок: {sum(failures)}")
+    print(f"Пропускна здатність: {total / elapsed:,.0f} запитів/с")
+    for label, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p99.9", 0.999)):
+        print(f"{label:>6}: {percentile(latencies, fraction) * 1000:8.2f} мс")
+
+    if server is not None:
+        print(f"Мікропакетів: {server.batcher.batches}, операцій у них: {server.batcher.items}")
+        await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Генератор навантаження для сервера складу")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=16)
+    parser.add_argument("--skus", type=int, default=1000)
+    parser.add_argument("--read-ratio", type=float, default=0.1)
+    parser.add_argument("--host", default=None, help="адреса запущеного сервера; без неї сервер стартує в процесі")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.clients, args.requests, args.depth, args.skus, args.read_ratio,
+                    args.host, args.port, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+from supplier import Supplier
+from product import Product
+from warehouse import Warehouse
+
+SUPPLIER_NAME = "ТОВ Пам'ять"
+
+
+class LegacyProduct:
+
+    def __init__(self, name: str, quantity: int, price: float, supplier: Supplier,
+                 arrival_date: Optional[datetime] = None, description: str = ""):
+        self.name = name
+        self.quantity = quantity
+        self.price = price
+        self.supplier = supplier
+        self.arrival_date = arrival_date or datetime.now()
+        self.description = description
+
+
+def make_supplier() -> Supplier:
+    return Supplier(SUPPLIER_NAME, "memory@example.com", "+380991234567", "м. Київ")
+
+
+def measure(build: Callable[[], object]) -> Tuple[int, object]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used, result
+
+
+def build_products(count: int, product_class: type = Product) -> list:
+    supplier = make_supplier()
+    return [product_class(f"SKU-{i:07d}", i % 1000, 100.0 + i % 50, supplier) for i in range(count)]
+
+
+def build_listened_products(count: int) -> list:
+    products = build_products(count)
+    listeners = (lambda product, attribute, old_value: None,)
+    for product in products:
+        product.add_listeners(listeners)
+    return products
+
+
+def build_warehouse(count: int) -> Warehouse:
+    warehouse = Warehouse("Тест пам'яті")
+    warehouse.add_supplier(make_supplier())
+    warehouse.bulk_add_products(
+        {'name': f"SKU-{i:07d}", 'quantity': i % 1000 + 1, 'price': 100.0 + i % 50, 'supplier': SUPPLIER_NAME}
+        for i in range(count)
+    )
+    return warehouse
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Вимірювання пам'яті на один товар")
+    parser.add_argument("--products", type=int, default=100_000)
+    args = parser.parse_args()
+    count = args.products
+
+    names_bytes, names = measure(lambda: [f"SKU-{i:07d}" for i in range(count)])
+    del names
+
+    legacy_bytes, products = measure(lambda: build_products(count, LegacyProduct))
+    del products
+    print(f"До: Product з __dict__ і datetime: {legacy_bytes / count:8.1f} байт/товар "
+          f"(без назв: {(legacy_bytes - names_bytes) / count:8.1f})")
+
+    objects_bytes, products = measure(lambda: build_products(count))
+    del products
+    print(f"Після: Product з __slots__:        {objects_bytes / count:8.1f} байт/товар "
+          f"(без назв: {(objects_bytes - names_bytes) / count:8.1f})")
+    print(f"Економія: {(legacy_bytes - objects_bytes) / count:8.1f} байт/товар "
+          f"({(legacy_bytes - names_bytes) / (objects_bytes - names_bytes):.1f}x без назв)")
+
+    listened_bytes, products = measure(lambda: build_listened_products(count))
+    del products
+    print(f"Після, з підписаним складом:      {listened_bytes / count:8.1f} байт/товар")
+
+    warehouse_bytes, warehouse = measure(lambda: build_warehouse(count))
+    del warehouse
+    print(f"Склад з індексами та журналом: {warehouse_bytes / count:8.1f} байт/товар")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+from datetime import datetime
+from supplier import Supplier
+from product import Product
+from journal import TYPE_CODES
+from enums import TransactionType
+from warehouse import Warehouse
+from storage import SNAPSHOT_FILE, write_snapshot
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+MENU_MARKER = "0. Вихід".encode('utf-8')
+SUPPLIERS_MARKER = "Адреса".encode('utf-8')
+SUPPLIER_COUNT = 100
+
+
+def build_dataset(directory: str, products: int, transactions: int) -> None:
+    warehouse = Warehouse("Головний склад")
+    suppliers = [Supplier._restore(f"Постачальник {i:03d}", f"supplier{i}@example.com", "+380991234567", "м. Київ")
+                 for i in range(SUPPLIER_COUNT)]
+    arrival = int(datetime.now().timestamp())
+    warehouse._restore_state(suppliers, (
+        Product._restore(f"SKU-{i:07d}", i % 1000 + 1, 100.0 + i % 50, suppliers[i % SUPPLIER_COUNT], arrival, "")
+        for i in range(products)
+    ))
+
+    journal = warehouse.transactions
+    journal.restore_product_names([f"SKU-{i:07d}" for i in range(products)])
+    start = arrival - transactions
+    journal.extend_columns(
+        array('I', (i % products for i in range(transactions))),
+        array('q', [1]) * transactions,
+        array('B', [TYPE_CODES[TransactionType.SHIPMENT]]) * transactions,
+        array('d', (float(start + i) for i in range(transactions))),
+    )
+
+    with open(os.path.join(directory, SNAPSHOT_FILE), 'wb') as f:
+        write_snapshot(f, warehouse, 0)
+
+
+def read_until(process: subprocess.Popen, marker: bytes) -> None:
+    output = b""
+    while marker not in output:
+        chunk = os.read(process.stdout.fileno(), 65536)
+        if not chunk:
+            raise ValueError("Процес завершився раніше, ніж з'явився очікуваний вивід")
+        output += chunk
+
+
+def measure_startup(directory: str) -> tuple:
+    environment = dict(os.environ, WAREHOUSE_DATA_DIR=directory, PYTHONUNBUFFERED="1")
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, MAIN], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, env=environment)
+    try:
+        read_until(process, MENU_MARKER)
+        first_menu = time.perf_counter() - started
+        process.stdin.write("5\n".encode('utf-8'))
+        process.stdin.flush()
+        read_until(process, SUPPLIERS_MARKER)
+        first_answer = time.perf_counter() - started
+    finally:
+        process.kill()
+        process.wait()
+    return first_menu, first_answer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Час запуску консольного меню складу")
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="warehouse-startup-")
+    try:
+        build_dataset(directory, args.products, args.transactions)
+        size = os.path.getsize(os.path.join(directory, SNAPSHOT_FILE))
+        print(f"Знімок: {args.products} товарів, {args.transactions} операцій, {size / 2 ** 20:.1f} МіБ")
+
+        runs = [measure_startup(directory) for _ in range(args.runs)]
+        for number, (first_menu, first_answer) in enumerate(runs, 1):
+            print(f"Запуск {number}: перше меню {first_menu * 1000:8.1f} мс, "
+                  f"перша відповідь {first_answer * 1000:8.1f} мс")
+
+        median = statistics.median(first_menu for first_menu, _ in runs) * 1000
+        print(f"Медіана до першого меню: {median:.1f} мс (бюджет {args.budget_ms:.0f} мс)")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    raise SystemExit(0 if median <= args.budget_ms else 1)
+
+
+if __name__ == "__main__":
+    main()
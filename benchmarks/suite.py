@@ -0,0 +1,262 @@
+import argparse
+import io
+import json
+import multiprocessing
+import platform
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+from product import Product
+from warehouse import Warehouse
+from storage import read_snapshot, write_snapshot
+from benchmarks.workload import (
+    Catalog, generate_catalog, operation_stream, popular_names, popular_suppliers, supplier_count_for,
+)
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+RESULTS_FORMAT = "warehouse-bench/1"
+DEFAULT_SIZES = "1k,10k,100k"
+SCAN_BUDGET = 10_000_000
+
+Result = Dict[str, Any]
+
+
+def peak_memory() -> Optional[int]:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def percentile(samples: List[int], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))] / 1000
+
+
+def result(benchmark: str, size: int, seconds: float, operations: int, rejected: int = 0,
+           latencies: Optional[List[int]] = None, memory_bytes: Optional[int] = None) -> Result:
+    entry: Result = {
+        'benchmark': benchmark,
+        'size': size,
+        'operations': operations,
+        'rejected': rejected,
+        'seconds': round(seconds, 6),
+        'ops_per_sec': round(operations / seconds, 1) if seconds > 0 else None,
+    }
+    if latencies:
+        latencies.sort()
+        entry['latency_us'] = {
+            'p50': percentile(latencies, 0.5),
+            'p90': percentile(latencies, 0.9),
+            'p99': percentile(latencies, 0.99),
+            'max': latencies[-1] / 1000,
+        }
+    if memory_bytes is not None:
+        entry['memory_bytes'] = memory_bytes
+    return entry
+
+
+def run_calls(benchmark: str, size: int, calls: Iterable[Callable[[], Any]]) -> Result:
+    clock = time.perf_counter_ns
+    latencies: List[int] = []
+    rejected = 0
+    began = clock()
+    for call in calls:
+        started = clock()
+        try:
+            call()
+        except ValueError:
+            rejected += 1
+        latencies.append(clock() - started)
+    elapsed = (clock() - began) / 1e9
+    return result(benchmark, size, elapsed, len(latencies), rejected, latencies)
+
+
+def scan_repeats(size: int, operations: int) -> int:
+    return max(3, min(operations, SCAN_BUDGET // max(size, 1)))
+
+
+def bench_load(catalog: Catalog, size: int) -> Any:
+    warehouse = Warehouse("Бенчмарк")
+    memory_before = peak_memory()
+    began = time.perf_counter()
+    warehouse.bulk_add_suppliers(catalog.suppliers)
+    report = warehouse.bulk_add_products(catalog.products)
+    elapsed = time.perf_counter() - began
+    memory_after = peak_memory()
+    memory = (memory_after - memory_before) // size if memory_before is not None else None
+    return warehouse, result('macro.load', size, elapsed, size, len(report.rejected), memory_bytes=memory)
+
+
+def bench_micro(warehouse: Warehouse, catalog: Catalog, size: int, operations: int, seed: int) -> List[Result]:
+    results = []
+    names = popular_names(catalog, operations, seed)
+    suppliers = [warehouse.suppliers[name] for name in popular_suppliers(catalog, operations, seed)]
+    prices = {product['name']: product['price'] for product in catalog.products}
+
+    receipts = [Product(name, 5, prices[name], supplier) for name, supplier in zip(names, suppliers)]
+    results.append(run_calls('micro.add_product', size,
+                             (lambda product=product: warehouse.add_product(product) for product in receipts)))
+    results.append(run_calls('micro.remove_product', size,
+                             (lambda name=name: warehouse.remove_product(name, 1) for name in names)))
+
+    repeats = scan_repeats(size, operations)
+    for sort_key in ('name', 'price'):
+        results.append(run_calls(f'micro.get_products_sorted.{sort_key}', size,
+                                 (lambda: warehouse.get_products_sorted(sort_key) for _ in range(repeats))))
+    results.append(run_calls('micro.get_supplier_products', size,
+                             (lambda supplier=supplier: warehouse.get_supplier_products(supplier.name)
+                              for supplier in suppliers[:repeats])))
+    results.append(run_calls('micro.iter_products.page', size,
+                             (lambda name=name: list(warehouse.iter_products('name', name, 100))
+                              for name in names)))
+
+    queries = [name.split()[-2] + " " + name.split()[0][:4] for name in names[:min(operations, 2000)]]
+    results.append(run_calls('micro.search_products.prefix', size,
+                             (lambda query=query: warehouse.search_products(query) for query in queries)))
+    typos = [name.split()[0][:-2] + name.split()[0][-1] for name in names[:min(operations, 500)]]
+    results.append(run_calls('micro.search_products.fuzzy', size,
+                             (lambda query=query: warehouse.search_products(query) for query in typos)))
+    return results
+
+
+def bench_stream(warehouse: Warehouse, catalog: Catalog, size: int, operations: int, seed: int) -> Result:
+    products = {product['name']: product for product in catalog.products}
+    supplier_objects = warehouse.suppliers
+
+    def call(operation):
+        if operation.kind == 'receipt':
+            data = products[operation.name]
+            product = Product(operation.name, operation.quantity, data['price'], supplier_objects[data['supplier']])
+            return lambda: warehouse.add_product(product)
+        return lambda: warehouse.remove_product(operation.name, operation.quantity)
+
+    transactions_before = len(warehouse.transactions)
+    memory_before = peak_memory()
+    entry = run_calls('macro.mixed_stream', size, (call(operation) for operation in
+                                                   operation_stream(catalog, operations * 10, seed + 1)))
+    growth = len(warehouse.transactions) - transactions_before
+    if memory_before is not None and growth:
+        entry['memory_bytes'] = (peak_memory() - memory_before) // growth
+    entry['transactions'] = len(warehouse.transactions)
+    return entry
+
+
+def bench_history(warehouse: Warehouse, size: int) -> Result:
+    began = time.perf_counter()
+    count = sum(1 for _ in warehouse.iter_transactions())
+    return result('macro.iter_transactions', size, time.perf_counter() - began, count)
+
+
+def bench_snapshot(warehouse: Warehouse, size: int) -> List[Result]:
+    buffer = io.BytesIO()
+    began = time.perf_counter()
+    write_snapshot(buffer, warehouse, 0)
+    written = result('macro.snapshot', size, time.perf_counter() - began, len(warehouse.products))
+    written['bytes'] = buffer.tell()
+
+    buffer.seek(0)
+    restored = Warehouse("Бенчмарк")
+    began = time.perf_counter()
+    read_snapshot(buffer, restored)
+    restored_entry = result('macro.restore', size, time.perf_counter() - began, len(restored.products))
+    return [written, restored_entry]
+
+
+def run_size(size: int, operations: int, seed: int) -> List[Result]:
+    catalog = generate_catalog(size, supplier_count_for(size), seed)
+    warehouse, load = bench_load(catalog, size)
+    results = [load]
+    results.extend(bench_micro(warehouse, catalog, size, operations, seed))
+    results.append(bench_stream(warehouse, catalog, size, operations, seed))
+    results.append(bench_history(warehouse, size))
+    results.extend(bench_snapshot(warehouse, size))
+    return results
+
+
+def run_isolated(size: int, operations: int, seed: int) -> List[Result]:
+    with multiprocessing.Pool(1) as pool:
+        return pool.apply(run_size, (size, operations, seed))
+
+
+def parse_sizes(text: str) -> List[int]:
+    sizes = []
+    for part in text.split(","):
+        part = part.strip().lower()
+        multiplier = 1
+        if part.endswith("k"):
+            part, multiplier = part[:-1], 1_000
+        elif part.endswith("m"):
+            part, multiplier = part[:-1], 1_000_000
+        sizes.append(int(part) * multiplier)
+    return sizes
+
+
+def print_results(results: Sequence[Result]) -> None:
+    print(f"{'Бенчмарк':<36} {'Розмір':>10} {'оп/с':>14} {'p50, мкс':>10} {'p99, мкс':>10} {'байт':>8}")
+    print("-" * 93)
+    for entry in results:
+        latency = entry.get('latency_us', {})
+        memory = entry.get('memory_bytes')
+        print(f"{entry['benchmark']:<36} {entry['size']:>10,} {entry['ops_per_sec'] or 0:>14,.0f} "
+              f"{latency.get('p50', 0):>10.1f} {latency.get('p99', 0):>10.1f} "
+              f"{memory if memory is not None else '':>8}")
+
+
+def compare(old_path: str, new_path: str) -> None:
+    with open(old_path, encoding='utf-8') as f:
+        old = {(entry['benchmark'], entry['size']): entry for entry in json.load(f)['results']}
+    with open(new_path, encoding='utf-8') as f:
+        new = json.load(f)['results']
+
+    print(f"{'Бенчмарк':<36} {'Розмір':>10} {'оп/с, було':>14} {'оп/с, стало':>14} {'зміна':>8}")
+    print("-" * 86)
+    for entry in new:
+        before = old.get((entry['benchmark'], entry['size']))
+        if before is None or not before['ops_per_sec'] or not entry['ops_per_sec']:
+            continue
+        change = entry['ops_per_sec'] / before['ops_per_sec'] - 1
+        print(f"{entry['benchmark']:<36} {entry['size']:>10,} {before['ops_per_sec']:>14,.0f} "
+              f"{entry['ops_per_sec']:>14,.0f} {change:>+8.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Набір бенчмарків складу")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="розміри каталогу, напр. 1k,100k,10m")
+    parser.add_argument("--operations", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--label", default="")
+    parser.add_argument("--output", help="файл для результатів у форматі JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="порівняти два файли результатів")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results: List[Result] = []
+    for size in parse_sizes(args.sizes):
+        results.extend(run_isolated(size, args.operations, args.seed))
+
+    print_results(results)
+    if args.output:
+        document = {
+            'format': RESULTS_FORMAT,
+            'label': args.label,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'operations': args.operations,
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import random
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, NamedTuple
+
+CATEGORIES = ("Ноутбук", "Монітор", "Смартфон", "Планшет", "Клавіатура", "Миша", "Навушники",
+              "Кабель", "Зарядний пристрій", "Чохол", "Маршрутизатор", "Принтер")
+BRANDS = ("Dell", "HP", "Lenovo", "Asus", "Acer", "Apple", "Samsung", "Xiaomi", "Logitech", "TP-Link", "Canon")
+MODELS = ("Pro", "Max", "Mini", "Air", "Plus", "Ultra", "Lite", "X", "S", "Neo")
+
+SUPPLIER_SKEW = 1.0
+SKU_SKEW = 1.1
+RECEIPT_SHARE = 0.4
+
+
+class Catalog(NamedTuple):
+    suppliers: List[Dict[str, Any]]
+    products: List[Dict[str, Any]]
+    popularity: List[float]
+
+
+class Operation(NamedTuple):
+    kind: str
+    name: str
+    quantity: int
+
+
+def zipf_weights(count: int, skew: float) -> List[float]:
+    return list(accumulate(1.0 / rank ** skew for rank in range(1, count + 1)))
+
+
+def generate_catalog(sku_count: int, supplier_count: int, seed: int = 42) -> Catalog:
+    rng = random.Random(seed)
+    suppliers = [
+        {
+            'name': f"ТОВ Постачальник {i:05d}",
+            'email': f"supplier{i}@example.com",
+            'phone': f"+38099{rng.randrange(10 ** 7):07d}",
+            'address': f"м. Київ, вул. Складська {i + 1}",
+        }
+        for i in range(supplier_count)
+    ]
+    supplier_names = [supplier['name'] for supplier in suppliers]
+    supplier_picks = rng.choices(supplier_names, cum_weights=zipf_weights(supplier_count, SUPPLIER_SKEW),
+                                 k=sku_count)
+
+    products = [
+        {
+            'name': f"{rng.choice(CATEGORIES)} {rng.choice(BRANDS)} {rng.choice(MODELS)} {i:08d}",
+            'quantity': rng.randint(1, 1000),
+            'price': round(max(0.01, rng.lognormvariate(6.0, 1.2)), 2),
+            'supplier': supplier,
+            'description': "",
+        }
+        for i, supplier in enumerate(supplier_picks)
+    ]
+    rng.shuffle(products)
+    return Catalog(suppliers, products, zipf_weights(sku_count, SKU_SKEW))
+
+
+def operation_stream(catalog: Catalog, count: int, seed: int = 42,
+                     receipt_share: float = RECEIPT_SHARE) -> Iterator[Operation]:
+    rng = random.Random(seed)
+    names = [product['name'] for product in catalog.products]
+    for name in rng.choices(names, cum_weights=catalog.popularity, k=count):
+        kind = 'receipt' if rng.random() < receipt_share else 'shipment'
+        yield Operation(kind, name, rng.randint(1, 5))
+
+
+def popular_names(catalog: Catalog, count: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    names = [product['name'] for product in catalog.products]
+    return rng.choices(names, cum_weights=catalog.popularity, k=count)
+
+
+def popular_suppliers(catalog: Catalog, count: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    names = [supplier['name'] for supplier in catalog.suppliers]
+    return rng.choices(names, cum_weights=zipf_weights(len(names), SUPPLIER_SKEW), k=count)
+
+
+def supplier_count_for(sku_count: int) -> int:
+    return max(3, min(5000, sku_count // 200))
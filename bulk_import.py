@@ -0,0 +1,192 @@
+import csv
+import json
+import re
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Set, Union
+import product
+import supplier
+
+BULK_BATCH_SIZE = 10000
+MAX_QUANTITY = 2 ** 63 - 1
+
+QUANTITY_LIMIT_ERROR = f"Кількість товару не може перевищувати {MAX_QUANTITY}"
+
+PRODUCT_FIELDS = ('name', 'quantity', 'price', 'supplier', 'description')
+SUPPLIER_FIELDS = ('name', 'email', 'phone', 'address')
+
+_EMAIL_PATTERN = re.compile(r'[^ ]+@[^@]+\.[^@.]{2,}', re.DOTALL)
+
+Row = Dict[str, Any]
+RowSource = Union[str, Iterable[Row]]
+
+
+class ProductRow(NamedTuple):
+    line: int
+    name: str
+    quantity: int
+    price: float
+    supplier: str
+    description: str
+
+
+class SupplierRow(NamedTuple):
+    line: int
+    name: str
+    email: str
+    phone: str
+    address: str
+
+
+class RejectedRow(NamedTuple):
+    line: int
+    name: str
+    reason: str
+
+
+class ImportReport:
+
+    def __init__(self):
+        self.accepted = 0
+        self.rejected: List[RejectedRow] = []
+
+    def reject(self, line: int, name: Any, reason: str) -> None:
+        self.rejected.append(RejectedRow(line, str(name or ''), reason))
+
+    def __str__(self) -> str:
+        return f"Імпортовано: {self.accepted}, відхилено: {len(self.rejected)}"
+
+
+def read_rows(source: RowSource) -> Iterator[Row]:
+    if not isinstance(source, str):
+        yield from source
+        return
+
+    with open(source, encoding='utf-8', newline='') as f:
+        if source.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif source.endswith('.csv'):
+            yield from csv.DictReader(f)
+        else:
+            raise ValueError(f"Непідтримуваний формат файлу: '{source}'. Доступні: .csv, .jsonl")
+
+
+def iter_batches(rows: Iterable[Row], batch_size: int = BULK_BATCH_SIZE) -> Iterator[List[Row]]:
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def check_product_names(names: List[str]) -> List[bool]:
+    return [bool(name) and len(name) >= 3 for name in names]
+
+
+def check_quantities(quantities: List[int]) -> List[bool]:
+    return [quantity >= 0 for quantity in quantities]
+
+
+def check_quantity_limits(quantities: List[int]) -> List[bool]:
+    return [quantity <= MAX_QUANTITY for quantity in quantities]
+
+
+def check_prices(prices: List[float]) -> List[bool]:
+    return [price > 0 for price in prices]
+
+
+def check_supplier_names(names: List[str]) -> List[bool]:
+    return [bool(name) and len(name) >= 2 for name in names]
+
+
+def check_emails(emails: List[str]) -> List[bool]:
+    match = _EMAIL_PATTERN.fullmatch
+    return [bool(email) and match(email) is not None for email in emails]
+
+
+def check_phones(phones: List[str]) -> List[bool]:
+    digits = [phone[1:] if phone and phone.startswith('+') else phone for phone in phones]
+    return [bool(phone) and phone.isdigit() and 10 <= len(phone) <= 15 for phone in digits]
+
+
+def validate_product_rows(
+    batch: List[Row],
+    first_line: int,
+    registered_suppliers: Set[str],
+    report: ImportReport,
+) -> List[ProductRow]:
+    lines, names, quantities, prices, suppliers, descriptions = [], [], [], [], [], []
+
+    for line, row in enumerate(batch, first_line):
+        try:
+            quantity = _parse_int(row.get('quantity'))
+            price = float(row.get('price'))
+        except (TypeError, ValueError):
+            report.reject(line, row.get('name'), "Кількість і ціна повинні бути числами")
+            continue
+        lines.append(line)
+        names.append(str(row.get('name') or ''))
+        quantities.append(quantity)
+        prices.append(price)
+        suppliers.append(str(row.get('supplier') or ''))
+        descriptions.append(str(row.get('description') or ''))
+
+    name_ok = check_product_names(names)
+    quantity_ok = check_quantities(quantities)
+    limit_ok = check_quantity_limits(quantities)
+    price_ok = check_prices(prices)
+    supplier_ok = [name in registered_suppliers for name in suppliers]
+
+    valid = []
+    for i, row in enumerate(zip(lines, names, quantities, prices, suppliers, descriptions)):
+        if not name_ok[i]:
+            report.reject(lines[i], names[i], product.NAME_ERROR)
+        elif not quantity_ok[i]:
+            report.reject(lines[i], names[i], product.QUANTITY_ERROR)
+        elif not limit_ok[i]:
+            report.reject(lines[i], names[i], QUANTITY_LIMIT_ERROR)
+        elif not price_ok[i]:
+            report.reject(lines[i], names[i], product.PRICE_ERROR)
+        elif not supplier_ok[i]:
+            report.reject(lines[i], names[i], f"Постачальник '{suppliers[i]}' не зареєстрований")
+        else:
+            valid.append(ProductRow(*row))
+    return valid
+
+
+def validate_supplier_rows(
+    batch: List[Row],
+    first_line: int,
+    existing_suppliers: Set[str],
+    report: ImportReport,
+) -> List[SupplierRow]:
+    rows = [
+        SupplierRow(line, *(str(row.get(field) or '') for field in SUPPLIER_FIELDS))
+        for line, row in enumerate(batch, first_line)
+    ]
+    name_ok = check_supplier_names([row.name for row in rows])
+    email_ok = check_emails([row.email for row in rows])
+    phone_ok = check_phones([row.phone for row in rows])
+
+    valid = []
+    for i, row in enumerate(rows):
+        if not name_ok[i]:
+            report.reject(row.line, row.name, supplier.NAME_ERROR)
+        elif not email_ok[i]:
+            report.reject(row.line, row.name, supplier.EMAIL_ERROR)
+        elif not phone_ok[i]:
+            report.reject(row.line, row.name, supplier.PHONE_ERROR)
+        elif row.name in existing_suppliers:
+            report.reject(row.line, row.name, f"Постачальник з назвою '{row.name}' вже існує")
+        else:
+            existing_suppliers.add(row.name)
+            valid.append(row)
+    return valid
+
+
+def _parse_int(value: Any) -> int:
+    if isinstance(value, int):
+        return value
+    return int(str(value).strip())
@@ -0,0 +1,172 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+DEFAULT_CACHE_WEIGHT = 1_000_000
+COMPACT_SLACK = 1024
+
+Dependency = Hashable
+Dependencies = Union[Iterable[Dependency], Callable[[Any], Iterable[Dependency]]]
+
+CATALOG: Dependency = ('catalog',)
+SUPPLIERS: Dependency = ('suppliers',)
+
+
+def product_key(product_name: str) -> Dependency:
+    return product_name
+
+
+def supplier_key(supplier_name: str) -> Dependency:
+    return 'supplier', supplier_name
+
+
+def attribute_key(attribute: str) -> Dependency:
+    return 'attribute', attribute
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    stale: int
+    evictions: int
+    entries: int
+    weight: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _Entry:
+
+    __slots__ = ('value', 'clock', 'dependencies', 'weight')
+
+    def __init__(self, value: Any, clock: int, dependencies: Tuple[Dependency, ...], weight: int):
+        self.value = value
+        self.clock = clock
+        self.dependencies = dependencies
+        self.weight = weight
+
+
+class QueryCache:
+
+    def __init__(self, max_weight: int = DEFAULT_CACHE_WEIGHT):
+        if max_weight <= 0:
+            raise ValueError("Місткість кешу повинна бути більше нуля")
+        self.max_weight = max_weight
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._versions: Dict[Dependency, List[int]] = {}
+        self._referenced = 0
+        self._clock = 0
+        self._floor = 0
+        self._weight = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        dependencies: Dependencies,
+        weigh: Optional[Callable[[Any], int]] = None,
+    ) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._current(entry):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+                self.stale += 1
+                self._remove(key, entry)
+            self.misses += 1
+            clock = self._clock
+
+        value = compute()
+        weight = weigh(value) if weigh is not None else 1
+        if weight > self.max_weight:
+            return value
+        if callable(dependencies):
+            dependencies = dependencies(value)
+
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None:
+                self._remove(key, previous)
+            entry = _Entry(value, clock, tuple(dependencies), weight)
+            for dependency in entry.dependencies:
+                self._reference(dependency)
+            self._entries[key] = entry
+            self._weight += weight
+            while self._weight > self.max_weight:
+                self._remove(*self._entries.popitem(last=False), popped=True)
+                self.evictions += 1
+        return value
+
+    def bump(self, *dependencies: Dependency) -> None:
+        with self._lock:
+            self._clock += 1
+            versions = self._versions
+            for dependency in dependencies:
+                version = versions.get(dependency)
+                if version is None:
+                    versions[dependency] = [self._clock, 0]
+                else:
+                    version[0] = self._clock
+            if len(versions) > 2 * self._referenced + COMPACT_SLACK:
+                self._compact()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions = {}
+            self._referenced = 0
+            self._weight = 0
+            self._clock += 1
+            self._floor = self._clock
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.stale, self.evictions, len(self._entries), self._weight)
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.stale = self.evictions = 0
+
+    def _current(self, entry: _Entry) -> bool:
+        versions, floor, clock = self._versions, self._floor, entry.clock
+        for dependency in entry.dependencies:
+            version = versions.get(dependency)
+            if (version[0] if version is not None else floor) > clock:
+                return False
+        return True
+
+    def _reference(self, dependency: Dependency) -> None:
+        version = self._versions.get(dependency)
+        if version is None:
+            version = self._versions[dependency] = [self._floor, 0]
+        if not version[1]:
+            self._referenced += 1
+        version[1] += 1
+
+    def _remove(self, key: Hashable, entry: _Entry, popped: bool = False) -> None:
+        if not popped:
+            del self._entries[key]
+        self._weight -= entry.weight
+        versions = self._versions
+        for dependency in entry.dependencies:
+            version = versions.get(dependency)
+            if version is None:
+                continue
+            version[1] -= 1
+            if not version[1]:
+                self._referenced -= 1
+
+    def _compact(self) -> None:
+        self._versions = {dependency: version for dependency, version in self._versions.items() if version[1]}
+        self._floor = self._clock
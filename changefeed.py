@@ -0,0 +1,200 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set
+
+DEFAULT_FEED_CAPACITY = 65536
+DEFAULT_FEED_BATCH = 500
+
+
+class ChangeEvent(NamedTuple):
+    offset: int
+    event: str
+    data: Dict[str, Any]
+    timestamp: float
+
+
+class ChangeFeed:
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_FEED_CAPACITY,
+        start_offset: int = 0,
+        block: bool = False,
+        block_timeout: Optional[float] = None,
+    ):
+        if capacity <= 0:
+            raise ValueError("Місткість стрічки змін повинна бути більше нуля")
+        self.capacity = capacity
+        self.block = block
+        self.block_timeout = block_timeout
+        self.evicted = 0
+        self._events: List[Optional[ChangeEvent]] = [None] * capacity
+        self._next_offset = start_offset
+        self._first_offset = start_offset
+        self._subscriptions: Set["Subscription"] = set()
+        self._condition = threading.Condition()
+
+    @property
+    def next_offset(self) -> int:
+        return self._next_offset
+
+    @property
+    def oldest_offset(self) -> int:
+        return max(self._first_offset, self._next_offset - self.capacity)
+
+    def __len__(self) -> int:
+        return self._next_offset - self.oldest_offset
+
+    def attach(self, warehouse: Any) -> "ChangeFeed":
+        warehouse.add_observer(self.publish)
+        return self
+
+    def detach(self, warehouse: Any) -> None:
+        warehouse.remove_observer(self.publish)
+
+    def publish(self, event: str, data: Dict[str, Any]) -> None:
+        with self._condition:
+            if self.block:
+                self._wait_for_room()
+            offset = self._next_offset
+            if offset - self._first_offset >= self.capacity:
+                self.evicted += 1
+            self._events[offset % self.capacity] = ChangeEvent(offset, event, data, time.time())
+            self._next_offset = offset + 1
+            self._condition.notify_all()
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription._wake()
+
+    def subscribe(self, offset: Optional[int] = None) -> "Subscription":
+        with self._condition:
+            subscription = Subscription(self, self._next_offset if offset is None else offset)
+            self._subscriptions.add(subscription)
+            return subscription
+
+    def read(self, offset: int, limit: int = DEFAULT_FEED_BATCH) -> List[ChangeEvent]:
+        with self._condition:
+            return self._read(offset, limit)
+
+    def _read(self, offset: int, limit: int) -> List[ChangeEvent]:
+        if offset < self.oldest_offset:
+            raise ValueError(f"Зміни з позиції {offset} вже витіснені зі стрічки. "
+                             f"Найстаріша доступна позиція: {self.oldest_offset}")
+        if offset > self._next_offset:
+            raise ValueError(f"Позиція {offset} ще не існує. Наступна позиція: {self._next_offset}")
+        stop = min(self._next_offset, offset + limit)
+        return [self._events[position % self.capacity] for position in range(offset, stop)]
+
+    def _wait_for_room(self) -> None:
+        deadline = time.monotonic() + self.block_timeout if self.block_timeout is not None else None
+        while self._subscriptions:
+            slowest = min(subscription.offset for subscription in self._subscriptions)
+            if self._next_offset - slowest < self.capacity:
+                return
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                return
+            self._condition.wait(remaining)
+
+    def _unsubscribe(self, subscription: "Subscription") -> None:
+        with self._condition:
+            self._subscriptions.discard(subscription)
+            self._condition.notify_all()
+
+
+class Subscription:
+
+    def __init__(self, feed: ChangeFeed, offset: int):
+        self.feed = feed
+        self.offset = offset
+        self._waiters: List[asyncio.Future] = []
+        self._closed = False
+
+    def __iter__(self) -> Iterator[ChangeEvent]:
+        while not self._closed:
+            yield from self.poll(timeout=None)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def lag(self) -> int:
+        return self.feed.next_offset - self.offset
+
+    def close(self) -> None:
+        self._closed = True
+        self.feed._unsubscribe(self)
+        with self.feed._condition:
+            self.feed._condition.notify_all()
+        self._wake()
+
+    def seek(self, offset: int) -> None:
+        with self.feed._condition:
+            self.offset = offset
+            self.feed._condition.notify_all()
+
+    def poll(self, max_events: int = DEFAULT_FEED_BATCH, timeout: Optional[float] = 0) -> List[ChangeEvent]:
+        condition = self.feed._condition
+        with condition:
+            if timeout != 0:
+                condition.wait_for(lambda: self._closed or self.feed.next_offset > self.offset, timeout)
+            return self._take(max_events)
+
+    def batches(self, max_events: int = DEFAULT_FEED_BATCH,
+                timeout: Optional[float] = None) -> Iterator[List[ChangeEvent]]:
+        while not self._closed:
+            batch = self.poll(max_events, timeout)
+            if not batch and timeout is not None:
+                return
+            if batch:
+                yield batch
+
+    async def poll_async(self, max_events: int = DEFAULT_FEED_BATCH,
+                         timeout: Optional[float] = None) -> List[ChangeEvent]:
+        batch = self.poll(max_events)
+        if batch or self._closed:
+            return batch
+
+        waiter = asyncio.get_running_loop().create_future()
+        with self.feed._condition:
+            if self.feed.next_offset > self.offset:
+                return self._take(max_events)
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self.feed._condition:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        return self.poll(max_events)
+
+    async def aiter_batches(self, max_events: int = DEFAULT_FEED_BATCH):
+        while not self._closed:
+            batch = await self.poll_async(max_events)
+            if batch:
+                yield batch
+
+    def _take(self, max_events: int) -> List[ChangeEvent]:
+        batch = self.feed._read(self.offset, max_events)
+        if batch:
+            self.offset = batch[-1].offset + 1
+            self.feed._condition.notify_all()
+        return batch
+
+    def _wake(self) -> None:
+        with self.feed._condition:
+            waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            loop = waiter.get_loop()
+            loop.call_soon_threadsafe(_resolve, waiter)
+
+
+def _resolve(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,240 @@
+import socket
+import time
+from itertools import count
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from supplier import Supplier
+from product import Product
+from transaction import Transaction
+from enums import TransactionType
+from search import DEFAULT_SEARCH_LIMIT
+from reservations import DEFAULT_HOLD_TTL, Hold
+from lots import StockLot
+from replenishment import ReorderSuggestion
+from changefeed import DEFAULT_FEED_BATCH, ChangeEvent
+from analytics import DEFAULT_TURNOVER_DAYS
+from protocol import (
+    DEFAULT_HOST, DEFAULT_PORT, decode_lot, decode_message, decode_product,
+    decode_supplier, decode_transaction, encode_message,
+)
+
+
+class RemoteWarehouse:
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, name: str = "Віддалений склад"):
+        self.name = name
+        self._socket = socket.create_connection((host, port))
+        self._reader = self._socket.makefile('rb')
+        self._ids = count(1)
+
+    def close(self) -> None:
+        self._reader.close()
+        self._socket.close()
+
+    @property
+    def products(self) -> Dict[str, Product]:
+        return {product.name: product for product in self.get_all_products()}
+
+    @property
+    def suppliers(self) -> Dict[str, Supplier]:
+        return {supplier.name: supplier for supplier in self.get_all_suppliers()}
+
+    @property
+    def transactions(self) -> List[Transaction]:
+        return list(self.iter_transactions())
+
+    def add_supplier(self, supplier: Supplier) -> None:
+        self._call('add_supplier', {
+            'name': supplier.name,
+            'email': supplier.email,
+            'phone': supplier.phone,
+            'address': supplier.address,
+        })
+
+    def update_supplier_info(
+        self,
+        supplier_name: str,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        address: Optional[str] = None,
+    ) -> None:
+        self._call('update_supplier_info', {'name': supplier_name, 'email': email, 'phone': phone, 'address': address})
+
+    def add_product(self, product: Product, expiry_date: Optional[datetime] = None) -> None:
+        self._call('add_product', {
+            'name': product.name,
+            'quantity': product.quantity,
+            'price': product.price,
+            'supplier': product.supplier.name,
+            'description': product.description,
+            'expiry_date': expiry_date.timestamp() if expiry_date is not None else None,
+        })
+
+    def remove_product(self, product_name: str, quantity: int) -> None:
+        self._call('remove_product', {'name': product_name, 'quantity': quantity})
+
+    def ship_order(self, lines: List[Tuple[str, int]]) -> None:
+        self._call('ship_order', {'lines': [list(line) for line in lines]})
+
+    def update_product_info(
+        self,
+        product_name: str,
+        new_quantity: Optional[int] = None,
+        new_price: Optional[float] = None,
+    ) -> None:
+        self._call('update_product_info', {'name': product_name, 'quantity': new_quantity, 'price': new_price})
+
+    def get_all_products(self) -> List[Product]:
+        return list(self.iter_products())
+
+    def get_products_sorted(self, sort_key: str) -> List[Product]:
+        return list(self.iter_products(sort_key))
+
+    def iter_products(
+        self,
+        sort_by: Optional[str] = None,
+        after: Optional[Any] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Product]:
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page = self._call('list_products', {'sort_by': sort_by, 'after': after, 'limit': remaining})
+            for data in page['items']:
+                yield decode_product(data)
+            if remaining is not None:
+                remaining -= len(page['items'])
+            after = page['next']
+            if after is None:
+                return
+
+    def iter_transactions(
+        self,
+        since: Optional[datetime] = None,
+        transaction_type: Optional[TransactionType] = None,
+        limit: Optional[int] = None,
+        until: Optional[datetime] = None,
+        product_name: Optional[str] = None,
+        supplier_name: Optional[str] = None,
+    ) -> Iterator[Transaction]:
+        args = _history_filters(since, until, transaction_type, product_name, supplier_name)
+        after = -1
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page = self._call('list_transactions', dict(args, after=after, limit=remaining))
+            for data in page['items']:
+                yield decode_transaction(data)
+            if remaining is not None:
+                remaining -= len(page['items'])
+            after = page['next']
+            if after is None:
+                return
+
+    def transaction_totals(
+        self,
+        period: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        transaction_type: Optional[TransactionType] = None,
+        product_name: Optional[str] = None,
+        supplier_name: Optional[str] = None,
+    ) -> List[Tuple[datetime, Dict[TransactionType, int]]]:
+        args = _history_filters(since, until, transaction_type, product_name, supplier_name)
+        return [
+            (datetime.fromtimestamp(bucket), {TransactionType[name]: quantity for name, quantity in volumes.items()})
+            for bucket, volumes in self._call('transaction_totals', dict(args, period=period))
+        ]
+
+    def read_changes(self, after: Optional[int] = None, limit: int = DEFAULT_FEED_BATCH) -> List[ChangeEvent]:
+        page = self._call('read_changes', {'after': after, 'limit': limit})
+        return [ChangeEvent(*item) for item in page['items']]
+
+    def iter_changes(self, after: Optional[int] = None, poll_interval: float = 0.5,
+                     limit: int = DEFAULT_FEED_BATCH) -> Iterator[ChangeEvent]:
+        while True:
+            events = self.read_changes(after, limit)
+            yield from events
+            if events:
+                after = events[-1].offset
+            else:
+                time.sleep(poll_interval)
+
+    def search_products(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[Product]:
+        return [decode_product(data) for data in self._call('search_products', {'query': query, 'limit': limit})]
+
+    def reserve_product(self, product_name: str, quantity: int, ttl: float = DEFAULT_HOLD_TTL) -> Hold:
+        data = self._call('reserve_product', {'name': product_name, 'quantity': quantity, 'ttl': ttl})
+        return Hold(data['hold_id'], data['name'], data['quantity'], time.monotonic() + data['expires_in'])
+
+    def confirm_reservation(self, hold_id: int) -> None:
+        self._call('confirm_reservation', {'hold_id': hold_id})
+
+    def release_reservation(self, hold_id: int) -> None:
+        self._call('release_reservation', {'hold_id': hold_id})
+
+    def get_availability(self, product_name: str) -> Dict[str, int]:
+        return self._call('get_availability', {'name': product_name})
+
+    def get_product_lots(self, product_name: str) -> List[StockLot]:
+        return [decode_lot(data) for data in self._call('get_product_lots', {'name': product_name})]
+
+    def stock_cost(self) -> float:
+        return self._call('get_stock_cost')['stock_cost']
+
+    def cost_of_goods_sold(self, product_name: Optional[str] = None) -> float:
+        return self._call('get_stock_cost', {'name': product_name})['cost_of_goods_sold']
+
+    def stock_value(self, supplier_name: Optional[str] = None) -> float:
+        values = self._call('get_stock_value')
+        if supplier_name is None:
+            return values['total']
+        return values['suppliers'].get(supplier_name, 0.0)
+
+    def supplier_stock_values(self) -> Dict[str, float]:
+        return self._call('get_stock_value')['suppliers']
+
+    def inventory_turnover(self, product_name: Optional[str] = None, days: int = DEFAULT_TURNOVER_DAYS) -> float:
+        return self._call('get_turnover', {'name': product_name, 'days': days})
+
+    def reorder_suggestions(
+        self,
+        lead_time_days: Optional[float] = None,
+        cover_days: Optional[float] = None,
+    ) -> Dict[str, List[ReorderSuggestion]]:
+        grouped = self._call('reorder_suggestions', {'lead_time_days': lead_time_days, 'cover_days': cover_days})
+        return {supplier_name: [ReorderSuggestion(*row) for row in rows] for supplier_name, rows in grouped.items()}
+
+    def get_supplier_products(self, supplier_name: str) -> List[Product]:
+        products = self._call('get_supplier_products', {'supplier_name': supplier_name})
+        return [decode_product(data) for data in products]
+
+    def get_all_suppliers(self) -> List[Supplier]:
+        return [decode_supplier(data) for data in self._call('get_all_suppliers')]
+
+    def _call(self, operation: str, args: Optional[Dict[str, Any]] = None) -> Any:
+        request_id = next(self._ids)
+        self._socket.sendall(encode_message({'id': request_id, 'op': operation, 'args': args or {}}))
+
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Сервер складу закрив з'єднання")
+
+        response = decode_message(line)
+        if not response['ok']:
+            raise ValueError(response['error'])
+        return response.get('result')
+
+
+def _history_filters(
+    since: Optional[datetime],
+    until: Optional[datetime],
+    transaction_type: Optional[TransactionType],
+    product_name: Optional[str],
+    supplier_name: Optional[str],
+) -> Dict[str, Any]:
+    return {
+        'since': since.timestamp() if since is not None else None,
+        'until': until.timestamp() if until is not None else None,
+        'type': transaction_type.name if transaction_type is not None else None,
+        'product': product_name,
+        'supplier': supplier_name,
+    }
@@ -0,0 +1,267 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import datetime
+from itertools import accumulate
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+from supplier import Supplier
+from product import Product
+from enums import TransactionType
+from transaction import Transaction
+from journal import TRANSACTION_TYPES, TYPE_CODES, ProductRef
+
+COLUMNAR_MAGIC = b'WHCOL001'
+ALIGNMENT = 8
+
+_FOOTER = struct.Struct('<Q8s')
+
+SUPPLIER_COLUMNS = ('name', 'email', 'phone', 'address')
+PRODUCT_STRING_COLUMNS = ('name', 'description')
+TRANSACTION_COLUMNS = (('product_id', 'I'), ('quantity', 'q'), ('type_code', 'B'), ('timestamp', 'd'))
+
+ColumnEntry = List[Any]
+
+
+class RowGroup(NamedTuple):
+    count: int
+    min_timestamp: float
+    max_timestamp: float
+    product_ids: memoryview
+    quantities: memoryview
+    type_codes: memoryview
+    timestamps: memoryview
+
+
+class StringColumn:
+
+    def __init__(self, offsets: memoryview, data: memoryview):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, position: int) -> str:
+        if position < 0:
+            position += len(self)
+        return str(self._data[self._offsets[position]:self._offsets[position + 1]], 'utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        data = bytes(self._data)
+        offsets = self._offsets
+        for start, end in zip(offsets, offsets[1:]):
+            yield str(data[start:end], 'utf-8')
+
+
+def export_columnar(warehouse: Any, path: str) -> None:
+    suppliers = list(warehouse.suppliers.values())
+    supplier_ids = {supplier.name: i for i, supplier in enumerate(suppliers)}
+    products = list(warehouse.products.values())
+    journal = warehouse.transactions
+
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as f:
+        f.write(COLUMNAR_MAGIC)
+        writer = _ColumnWriter(f)
+
+        for column in SUPPLIER_COLUMNS:
+            writer.strings(f'suppliers.{column}', (getattr(supplier, column) for supplier in suppliers))
+        for column in PRODUCT_STRING_COLUMNS:
+            writer.strings(f'products.{column}', (getattr(product, column) for product in products))
+        writer.array('products.supplier_id', array('I', [supplier_ids[p.supplier.name] for p in products]))
+        writer.array('products.quantity', array('q', [p.quantity for p in products]))
+        writer.array('products.price', array('d', [p.price for p in products]))
+        writer.array('products.arrival_timestamp', array('q', [p.arrival_timestamp for p in products]))
+        writer.strings('transactions.product_names', journal.product_names())
+
+        row_groups = []
+        for chunk in journal.chunks():
+            columns = {}
+            for (column, _), values in zip(TRANSACTION_COLUMNS, chunk.columns()):
+                columns[column] = writer.entry(values)
+            row_groups.append({
+                'count': chunk.count,
+                'min_timestamp': chunk.min_timestamp,
+                'max_timestamp': chunk.max_timestamp,
+                'columns': columns,
+            })
+
+        footer = {
+            'name': warehouse.name,
+            'byteorder': sys.byteorder,
+            'created': datetime.now().timestamp(),
+            'supplier_count': len(suppliers),
+            'product_count': len(products),
+            'transaction_count': len(journal),
+            'transaction_types': [transaction_type.name for transaction_type in TRANSACTION_TYPES],
+            'columns': writer.columns,
+            'row_groups': row_groups,
+        }
+        footer_bytes = json.dumps(footer, ensure_ascii=False).encode('utf-8')
+        f.write(footer_bytes)
+        f.write(_FOOTER.pack(len(footer_bytes), COLUMNAR_MAGIC))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary_path, path)
+
+
+class _ColumnWriter:
+
+    def __init__(self, f):
+        self._f = f
+        self.columns: Dict[str, ColumnEntry] = {}
+
+    def array(self, name: str, values: array) -> None:
+        self.columns[name] = self.entry(values)
+
+    def strings(self, name: str, values: Iterable[str]) -> None:
+        encoded = [value.encode('utf-8') for value in values]
+        offsets = array('q', [0])
+        offsets.extend(accumulate(len(value) for value in encoded))
+        self.columns[f'{name}.offsets'] = self.entry(offsets)
+        self.columns[f'{name}.data'] = self.entry(array('B', b''.join(encoded)))
+
+    def entry(self, values: array) -> ColumnEntry:
+        padding = -self._f.tell() % ALIGNMENT
+        if padding:
+            self._f.write(b'\0' * padding)
+        offset = self._f.tell()
+        values.tofile(self._f)
+        return [values.typecode, offset, len(values)]
+
+
+class ColumnarFile:
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Файл '{path}' порожній або пошкоджений")
+        self._buffer = memoryview(self._map)
+        self._views: List[memoryview] = [self._buffer]
+
+        if len(self._map) < len(COLUMNAR_MAGIC) + _FOOTER.size:
+            self.close()
+            raise ValueError("Невірний формат колонкового файлу")
+        footer_length, magic = _FOOTER.unpack_from(self._map, len(self._map) - _FOOTER.size)
+        if self._map[:len(COLUMNAR_MAGIC)] != COLUMNAR_MAGIC or magic != COLUMNAR_MAGIC:
+            self.close()
+            raise ValueError("Невірний формат колонкового файлу")
+        footer_start = len(self._map) - _FOOTER.size - footer_length
+        footer = json.loads(bytes(self._buffer[footer_start:footer_start + footer_length]))
+        if footer['byteorder'] != sys.byteorder:
+            self.close()
+            raise ValueError("Колонковий файл записано з іншим порядком байтів")
+
+        self.name: str = footer['name']
+        self.created = datetime.fromtimestamp(footer['created'])
+        self.supplier_count: int = footer['supplier_count']
+        self.product_count: int = footer['product_count']
+        self.transaction_count: int = footer['transaction_count']
+        self._columns: Dict[str, ColumnEntry] = footer['columns']
+        self._transaction_types = [TransactionType[name] for name in footer['transaction_types']]
+        self.row_groups = [
+            RowGroup(group['count'], group['min_timestamp'], group['max_timestamp'],
+                     *(self._view(group['columns'][column]) for column, _ in TRANSACTION_COLUMNS))
+            for group in footer['row_groups']
+        ]
+        self.product_names = self.strings('transactions.product_names')
+
+    def __enter__(self) -> "ColumnarFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self.row_groups = []
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+    def column(self, name: str) -> memoryview:
+        entry = self._columns.get(name)
+        if entry is None:
+            raise ValueError(f"Колонку '{name}' не знайдено")
+        return self._view(entry)
+
+    def strings(self, name: str) -> StringColumn:
+        return StringColumn(self.column(f'{name}.offsets'), self.column(f'{name}.data'))
+
+    def suppliers(self) -> List[Supplier]:
+        columns = [self.strings(f'suppliers.{column}') for column in SUPPLIER_COLUMNS]
+        return [Supplier._restore(*fields) for fields in zip(*columns)]
+
+    def products(self, suppliers: Optional[Sequence[Supplier]] = None) -> Iterator[Product]:
+        suppliers = suppliers if suppliers is not None else self.suppliers()
+        restore = Product._restore
+        columns = zip(
+            self.strings('products.name'),
+            self.column('products.quantity'),
+            self.column('products.price'),
+            self.column('products.supplier_id'),
+            self.column('products.arrival_timestamp'),
+            self.strings('products.description'),
+        )
+        for name, quantity, price, supplier_id, arrival_timestamp, description in columns:
+            yield restore(name, quantity, price, suppliers[supplier_id], arrival_timestamp, description)
+
+    def transactions(
+        self,
+        since: Optional[datetime] = None,
+        transaction_type: Optional[TransactionType] = None,
+    ) -> Iterator[Transaction]:
+        since_timestamp = since.timestamp() if since is not None else None
+        types = self._transaction_types
+        type_code = types.index(transaction_type) if transaction_type is not None else None
+        names = [ProductRef(name) for name in self.product_names]
+
+        for group in self.row_groups:
+            if since_timestamp is not None and group.max_timestamp < since_timestamp:
+                continue
+            for product_id, quantity, code, timestamp in zip(group.product_ids, group.quantities,
+                                                             group.type_codes, group.timestamps):
+                if type_code is not None and code != type_code:
+                    continue
+                if since_timestamp is not None and timestamp < since_timestamp:
+                    continue
+                yield Transaction(names[product_id], quantity, types[code], datetime.fromtimestamp(timestamp))
+
+    def load_into(self, warehouse: Any) -> None:
+        suppliers = self.suppliers()
+        warehouse._restore_state(suppliers, list(self.products(suppliers)))
+
+        journal = warehouse.transactions
+        journal.restore_product_names(list(self.product_names))
+        recode = bytearray(range(256))
+        for code, transaction_type in enumerate(self._transaction_types):
+            recode[code] = TYPE_CODES[transaction_type]
+        for group in self.row_groups:
+            product_ids, quantities, type_codes, timestamps = (
+                _copy(typecode, view) for (_, typecode), view in zip(TRANSACTION_COLUMNS, group[3:]))
+            journal.extend_columns(product_ids, quantities, array('B', type_codes.tobytes().translate(recode)),
+                                   timestamps)
+
+    def _view(self, entry: ColumnEntry) -> memoryview:
+        typecode, offset, length = entry
+        raw = self._buffer[offset:offset + length * array(typecode).itemsize]
+        view = raw.cast(typecode)
+        self._views.extend((raw, view))
+        return view
+
+
+def _copy(typecode: str, view: memoryview) -> array:
+    values = array(typecode)
+    values.frombytes(view.cast('B'))
+    return values
@@ -0,0 +1,213 @@
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from supplier import Supplier
+from product import Product
+from enums import TransactionType
+from warehouse import Warehouse
+from bulk_import import BULK_BATCH_SIZE, ImportReport, RowSource
+from indexes import SortedIndex
+from search import DEFAULT_SEARCH_LIMIT
+from reservations import DEFAULT_HOLD_TTL, Hold
+from lots import FIFO, LotLayer, StockLot
+from replenishment import ReorderSuggestion
+from analytics import DEFAULT_TURNOVER_DAYS
+
+DEFAULT_LOCK_STRIPES = 64
+
+
+class ConcurrentWarehouse(Warehouse):
+
+    def __init__(self, name: str, journal_dir: Optional[str] = None,
+                 lock_stripes: int = DEFAULT_LOCK_STRIPES, picking_policy: str = FIFO):
+        if lock_stripes <= 0:
+            raise ValueError("Кількість блокувань повинна бути більше нуля")
+        super().__init__(name, journal_dir, picking_policy)
+        self._stripes = [threading.Lock() for _ in range(lock_stripes)]
+        self._catalog_lock = threading.RLock()
+        self._journal_lock = threading.RLock()
+        self._reservation_lock = threading.Lock()
+        self._feed_lock = threading.Lock()
+
+    def add_supplier(self, supplier: Supplier) -> None:
+        with self._catalog_lock:
+            super().add_supplier(supplier)
+
+    def update_supplier_info(
+        self,
+        supplier_name: str,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        address: Optional[str] = None,
+    ) -> None:
+        with self._catalog_lock:
+            super().update_supplier_info(supplier_name, email, phone, address)
+
+    def add_product(
+        self,
+        product: Product,
+        date: Optional[datetime] = None,
+        expiry_date: Optional[datetime] = None,
+    ) -> None:
+        with self._locked([product.name]):
+            super().add_product(product, date, expiry_date)
+
+    def remove_product(self, product_name: str, quantity: int, date: Optional[datetime] = None) -> None:
+        with self._locked([product_name]):
+            super().remove_product(product_name, quantity, date)
+
+    def ship_order(self, lines: List[Tuple[str, int]], date: Optional[datetime] = None) -> None:
+        with self._locked([product_name for product_name, _ in lines]):
+            super().ship_order(lines, date)
+
+    def transfer_out(self, product_name: str, quantity: int, date: Optional[datetime] = None) -> List[LotLayer]:
+        with self._locked([product_name]):
+            return super().transfer_out(product_name, quantity, date)
+
+    def transfer_in(self, product: Product, date: Optional[datetime] = None,
+                    lots: Optional[Iterable[LotLayer]] = None) -> None:
+        with self._locked([product.name]):
+            super().transfer_in(product, date, lots)
+
+    def update_product_info(
+        self,
+        product_name: str,
+        new_quantity: Optional[int] = None,
+        new_price: Optional[float] = None,
+    ) -> None:
+        with self._locked([product_name]):
+            super().update_product_info(product_name, new_quantity, new_price)
+
+    def reserve_product(self, product_name: str, quantity: int, ttl: float = DEFAULT_HOLD_TTL) -> Hold:
+        with self._locked([product_name]), self._reservation_lock:
+            return super().reserve_product(product_name, quantity, ttl)
+
+    def confirm_reservation(self, hold_id: int, date: Optional[datetime] = None) -> None:
+        with self._reservation_lock:
+            hold = self.reservations.get(hold_id)
+        with self._locked([hold.product_name]):
+            super().confirm_reservation(hold_id, date)
+
+    def release_reservation(self, hold_id: int) -> Hold:
+        with self._reservation_lock:
+            return super().release_reservation(hold_id)
+
+    def reserved_quantity(self, product_name: str) -> int:
+        with self._reservation_lock:
+            return super().reserved_quantity(product_name)
+
+    def get_product_lots(self, product_name: str) -> List[StockLot]:
+        with self._locked([product_name]):
+            return super().get_product_lots(product_name)
+
+    def stock_cost(self) -> float:
+        with self._all_locked():
+            return super().stock_cost()
+
+    def cost_of_goods_sold(self, product_name: Optional[str] = None) -> float:
+        with self._all_locked():
+            return super().cost_of_goods_sold(product_name)
+
+    def reorder_suggestions(
+        self,
+        lead_time_days: Optional[float] = None,
+        cover_days: Optional[float] = None,
+    ) -> Dict[str, List[ReorderSuggestion]]:
+        with self._catalog_lock, self._journal_lock:
+            return super().reorder_suggestions(lead_time_days, cover_days)
+
+    def stockout_risk(self, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        with self._catalog_lock, self._journal_lock:
+            return super().stockout_risk(limit)
+
+    def stock_value(self, supplier_name: Optional[str] = None) -> float:
+        with self._catalog_lock, self._journal_lock:
+            return super().stock_value(supplier_name)
+
+    def supplier_stock_values(self) -> Dict[str, float]:
+        with self._catalog_lock, self._journal_lock:
+            return super().supplier_stock_values()
+
+    def inventory_turnover(self, product_name: Optional[str] = None, days: int = DEFAULT_TURNOVER_DAYS) -> float:
+        with self._catalog_lock, self._journal_lock:
+            return super().inventory_turnover(product_name, days)
+
+    def bulk_add_suppliers(self, source: RowSource, batch_size: int = BULK_BATCH_SIZE) -> ImportReport:
+        with self._catalog_lock:
+            return super().bulk_add_suppliers(source, batch_size)
+
+    def bulk_add_products(
+        self,
+        source: RowSource,
+        batch_size: int = BULK_BATCH_SIZE,
+        date: Optional[datetime] = None,
+    ) -> ImportReport:
+        with self._all_locked():
+            return super().bulk_add_products(source, batch_size, date)
+
+    def bulk_remove_products(
+        self,
+        lines: List[Tuple[str, int]],
+        date: Optional[datetime] = None,
+    ) -> List[Optional[str]]:
+        with self._all_locked():
+            return super().bulk_remove_products(lines, date)
+
+    def search_products(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[Product]:
+        with self._catalog_lock:
+            return super().search_products(query, limit)
+
+    @contextmanager
+    def _locked(self, product_names: Iterable[str]) -> Iterator[None]:
+        stripes = sorted({hash(name) % len(self._stripes) for name in product_names})
+        for stripe in stripes:
+            self._stripes[stripe].acquire()
+        try:
+            yield
+        finally:
+            for stripe in reversed(stripes):
+                self._stripes[stripe].release()
+
+    @contextmanager
+    def _all_locked(self) -> Iterator[None]:
+        for stripe in self._stripes:
+            stripe.acquire()
+        try:
+            with self._catalog_lock, self._journal_lock:
+                yield
+        finally:
+            for stripe in reversed(self._stripes):
+                stripe.release()
+
+    def _get_sorted_index(self, sort_key: str) -> SortedIndex:
+        index = super()._get_sorted_index(sort_key)
+        if index.pending:
+            with self._catalog_lock:
+                index.ensure_built()
+        return index
+
+    def _available(self, product: Product) -> int:
+        with self._reservation_lock:
+            return super()._available(product)
+
+    def _insert_product(self, product: Product) -> None:
+        with self._catalog_lock, self._journal_lock:
+            super()._insert_product(product)
+
+    def _delete_product(self, product: Product) -> None:
+        with self._catalog_lock, self._journal_lock:
+            super()._delete_product(product)
+
+    def _record_transaction(self, product_name: str, quantity: int,
+                            transaction_type: TransactionType, date: datetime) -> None:
+        with self._journal_lock:
+            super()._record_transaction(product_name, quantity, transaction_type, date)
+
+    def _on_product_changed(self, product: Product, attribute: str, old_value: Any) -> None:
+        with self._catalog_lock, self._journal_lock:
+            super()._on_product_changed(product, attribute, old_value)
+
+    def _emit(self, event: str, data: Dict[str, Any]) -> None:
+        with self._feed_lock:
+            super()._emit(event, data)
@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import Optional
+
+
+def display_menu():
+    print("\n" + "=" * 50)
+    print("СИСТЕМА УПРАВЛІННЯ СКЛАДОМ".center(50))
+    print("=" * 50)
+    print("1. Додати нового постачальника")
+    print("2. Додати новий товар")
+    print("3. Переглянути всі товари")
+    print("4. Переглянути товари (сортування)")
+    print("5. Переглянути всіх постачальників")
+    print("6. Переглянути товари постачальника")
+    print("7. Видалити товар (відвантажити)")
+    print("8. Оновити інформацію про товар")
+    print("9. Переглянути історію операцій")
+    print("10. Інструментування та профілювання")
+    print("11. Партії товару та собівартість")
+    print("12. План поповнення запасів")
+    print("13. Вартість запасів та оборотність")
+    print("0. Вихід")
+    print("=" * 50)
+
+
+def get_int_input(prompt: str, min_value: int = None, max_value: int = None) -> int:
+    while True:
+        try:
+            value = int(input(prompt))
+
+            if min_value is not None and value < min_value:
+                print(f"Значення повинно бути не менше {min_value}")
+                continue
+
+            if max_value is not None and value > max_value:
+                print(f"Значення повинно бути не більше {max_value}")
+                continue
+
+            return value
+        except ValueError:
+            print("Будь ласка, введіть ціле число")
+
+
+def get_float_input(prompt: str, min_value: float = None) -> float:
+    while True:
+        try:
+            value = float(input(prompt))
+
+            if min_value is not None and value < min_value:
+                print(f"Значення повинно бути не менше {min_value}")
+                continue
+
+            return value
+        except ValueError:
+            print("Будь ласка, введіть число")
+
+
+def get_date_input(prompt: str) -> Optional[datetime]:
+    while True:
+        text = input(prompt).strip()
+        if not text:
+            return None
+        try:
+            return datetime.strptime(text, "%d.%m.%Y")
+        except ValueError:
+            print("Будь ласка, введіть дату у форматі ДД.ММ.РРРР")
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from product import Product
+from enums import TransactionType
+from transaction import Transaction
+from journal import TRANSACTION_TYPES, TYPE_CODES, Row, TransactionJournal
+
+PERIODS = ('hour', 'day', 'week', 'month')
+
+
+def period_start(moment: datetime, period: str) -> datetime:
+    if period == 'hour':
+        return moment.replace(minute=0, second=0, microsecond=0)
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == 'day':
+        return day
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def next_period(start: datetime, period: str) -> datetime:
+    if period == 'hour':
+        return start + timedelta(hours=1)
+    if period == 'day':
+        return start + timedelta(days=1)
+    if period == 'week':
+        return start + timedelta(weeks=1)
+    return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+
+
+class TransactionHistory:
+
+    def __init__(self, journal: TransactionJournal, supplier_products: Callable[[str], Iterable[str]]):
+        self._journal = journal
+        self._supplier_products = supplier_products
+        self._departed: Dict[str, Set[str]] = {}
+
+    def rows(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        transaction_type: Optional[TransactionType] = None,
+        product_name: Optional[str] = None,
+        supplier_name: Optional[str] = None,
+        after: int = -1,
+    ) -> Iterator[Row]:
+        product_ids = self._product_ids(product_name, supplier_name)
+        if product_ids is not None and not product_ids:
+            return iter(())
+        return self._journal.select(
+            after + 1,
+            start.timestamp() if start is not None else None,
+            end.timestamp() if end is not None else None,
+            TYPE_CODES[transaction_type] if transaction_type is not None else None,
+            product_ids,
+        )
+
+    def transactions(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        transaction_type: Optional[TransactionType] = None,
+        product_name: Optional[str] = None,
+        supplier_name: Optional[str] = None,
+        after: int = -1,
+    ) -> Iterator[Tuple[int, Transaction]]:
+        make_transaction = self._journal._make_transaction
+        for position, product_id, quantity, type_code, timestamp in self.rows(
+                start, end, transaction_type, product_name, supplier_name, after):
+            yield position, make_transaction(product_id, quantity, type_code, timestamp)
+
+    def totals(
+        self,
+        period: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        transaction_type: Optional[TransactionType] = None,
+        product_name: Optional[str] = None,
+        supplier_name: Optional[str] = None,
+    ) -> List[Tuple[datetime, Dict[TransactionType, int]]]:
+        if period not in PERIODS:
+            raise ValueError("Неправильний період. Доступні: 'hour', 'day', 'week', 'month'")
+
+        buckets: Dict[datetime, List[int]] = {}
+        bucket_start = bucket_end = 0.0
+        totals = [0] * len(TRANSACTION_TYPES)
+        for _, _, quantity, type_code, timestamp in self.rows(start, end, transaction_type,
+                                                              product_name, supplier_name):
+            if not bucket_start <= timestamp < bucket_end:
+                bucket = period_start(datetime.fromtimestamp(timestamp), period)
+                bucket_start, bucket_end = bucket.timestamp(), next_period(bucket, period).timestamp()
+                totals = buckets.get(bucket)
+                if totals is None:
+                    totals = buckets[bucket] = [0] * len(TRANSACTION_TYPES)
+            totals[type_code] += quantity
+
+        return [
+            (bucket, {t: totals[code] for code, t in enumerate(TRANSACTION_TYPES) if totals[code]})
+            for bucket, totals in sorted(buckets.items())
+        ]
+
+    def on_product_removed(self, product: Product) -> None:
+        self._departed.setdefault(product.supplier.name, set()).add(product.name)
+
+    def restore_departed(self, departed: Iterable[Tuple[str, str]]) -> None:
+        for product_name, supplier_name in departed:
+            self._departed.setdefault(supplier_name, set()).add(product_name)
+
+    def _product_ids(self, product_name: Optional[str], supplier_name: Optional[str]) -> Optional[Set[int]]:
+        if product_name is None and supplier_name is None:
+            return None
+        if supplier_name is not None:
+            names = set(self._supplier_products(supplier_name))
+            names.update(self._departed.get(supplier_name, ()))
+            if product_name is not None:
+                names &= {product_name}
+        else:
+            names = {product_name}
+        return set(self._journal.product_ids_of(names))
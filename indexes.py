@@ -0,0 +1,230 @@
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+_value = itemgetter(0)
+
+BULK_THRESHOLD = 64
+CHUNK_SIZE = 1024
+
+Entry = Tuple[Any, str]
+
+
+class _Snapshot(NamedTuple):
+    chunks: List[List[Entry]]
+    maxes: List[Entry]
+    length: int
+
+
+_EMPTY = _Snapshot([], [], 0)
+
+
+class SortedIndex:
+
+    def __init__(self, attribute: str, chunk_size: int = CHUNK_SIZE):
+        if chunk_size < 2:
+            raise ValueError("Розмір блоку індексу повинен бути не менше 2")
+        self.attribute = attribute
+        self.chunk_size = chunk_size
+        self._snapshot = _EMPTY
+        self._source: Optional[Callable[[], Iterable[Entry]]] = None
+
+    def __len__(self) -> int:
+        self.ensure_built()
+        return self._snapshot.length
+
+    @property
+    def pending(self) -> bool:
+        return self._source is not None
+
+    def build(self, entries: Iterable[Entry]) -> None:
+        entries = sorted(entries)
+        size = self.chunk_size
+        chunks = [entries[i:i + size] for i in range(0, len(entries), size)]
+        self._snapshot = _Snapshot(chunks, [chunk[-1] for chunk in chunks], len(entries))
+        self._source = None
+
+    def build_lazily(self, source: Callable[[], Iterable[Entry]]) -> None:
+        self._snapshot = _EMPTY
+        self._source = source
+
+    def add(self, name: str, value: Any) -> None:
+        if self._source is not None:
+            return
+        self._insert([(value, name)])
+
+    def add_many(self, entries: Iterable[Entry]) -> None:
+        if self._source is not None:
+            return
+        entries = sorted(entries)
+        if entries:
+            self._insert(entries)
+
+    def remove(self, name: str, value: Any) -> None:
+        if self._source is not None:
+            return
+        self._delete([(value, name)])
+
+    def update(self, name: str, old_value: Any, new_value: Any) -> None:
+        if self._source is not None or old_value == new_value:
+            return
+        self.remove(name, old_value)
+        self.add(name, new_value)
+
+    def update_many(self, changes: Iterable[Tuple[str, Any, Any]]) -> None:
+        if self._source is not None:
+            return
+        changes = [change for change in changes if change[1] != change[2]]
+        if len(changes) < BULK_THRESHOLD:
+            for name, old_value, new_value in changes:
+                self.update(name, old_value, new_value)
+            return
+        self._delete(sorted((old_value, name) for name, old_value, _ in changes))
+        self.add_many((new_value, name) for name, _, new_value in changes)
+
+    def names(self, reverse: bool = False) -> Iterator[str]:
+        self.ensure_built()
+        chunks = self._snapshot.chunks
+        if reverse:
+            return (name for chunk in reversed(chunks) for _, name in reversed(chunk))
+        return (name for chunk in chunks for _, name in chunk)
+
+    def iter_after(
+        self,
+        after: Optional[Entry] = None,
+        limit: Optional[int] = None,
+        page_size: int = 1024,
+    ) -> Iterator[Entry]:
+        self.ensure_built()
+        remaining = limit
+        while remaining is None or remaining > 0:
+            chunks, maxes, _ = self._snapshot
+            if after is None:
+                start = (0, 0)
+            else:
+                i = bisect_right(maxes, after)
+                start = (i, bisect_right(chunks[i], after) if i < len(chunks) else 0)
+            size = page_size if remaining is None else min(page_size, remaining)
+            page = []
+            for entry in _iterate(chunks, start):
+                page.append(entry)
+                if len(page) == size:
+                    break
+            if not page:
+                return
+            yield from page
+            after = page[-1]
+            if remaining is not None:
+                remaining -= len(page)
+
+    def names_between(self, low: Optional[Any] = None, high: Optional[Any] = None) -> Iterator[str]:
+        self.ensure_built()
+        chunks, maxes, _ = self._snapshot
+        start = (0, 0) if low is None else _position(chunks, maxes, low, bisect_left)
+        stop = (len(chunks), 0) if high is None else _position(chunks, maxes, high, bisect_right)
+        return (name for _, name in _iterate(chunks, start, stop))
+
+    def ensure_built(self) -> None:
+        if self._source is not None:
+            self.build(self._source())
+
+    def _insert(self, entries: List[Entry]) -> None:
+        chunks, maxes, length = self._snapshot
+        if not chunks:
+            self.build(_merge([], entries))
+            return
+
+        chunks, maxes = list(chunks), list(maxes)
+        last = len(maxes) - 1
+        groups: Dict[int, List[Entry]] = {}
+        for entry in entries:
+            groups.setdefault(min(bisect_left(maxes, entry), last), []).append(entry)
+
+        size = self.chunk_size
+        for i in sorted(groups, reverse=True):
+            chunk = chunks[i]
+            merged = _merge(chunk, groups[i])
+            length += len(merged) - len(chunk)
+            if len(merged) > 2 * size:
+                pieces = [merged[k:k + size] for k in range(0, len(merged), size)]
+            else:
+                pieces = [merged]
+            chunks[i:i + 1] = pieces
+            maxes[i:i + 1] = [piece[-1] for piece in pieces]
+
+        self._snapshot = _Snapshot(chunks, maxes, length)
+
+    def _delete(self, entries: List[Entry]) -> None:
+        chunks, maxes, length = self._snapshot
+        groups: Dict[int, List[Entry]] = {}
+        for entry in entries:
+            i = bisect_left(maxes, entry)
+            if i < len(maxes):
+                groups.setdefault(i, []).append(entry)
+        if not groups:
+            return
+
+        chunks, maxes = list(chunks), list(maxes)
+        size = self.chunk_size
+        for i in sorted(groups, reverse=True):
+            chunk = chunks[i]
+            kept = _without(chunk, groups[i])
+            if len(kept) == len(chunk):
+                continue
+            length -= len(chunk) - len(kept)
+            if len(kept) < size // 2 and i + 1 < len(chunks):
+                kept += chunks[i + 1]
+                del chunks[i + 1], maxes[i + 1]
+                if len(kept) > 2 * size:
+                    middle = len(kept) // 2
+                    chunks.insert(i + 1, kept[middle:])
+                    maxes.insert(i + 1, kept[-1])
+                    kept = kept[:middle]
+            if kept:
+                chunks[i], maxes[i] = kept, kept[-1]
+            else:
+                del chunks[i], maxes[i]
+
+        self._snapshot = _Snapshot(chunks, maxes, length)
+
+
+def _merge(chunk: List[Entry], entries: List[Entry]) -> List[Entry]:
+    if len(entries) == 1:
+        entry = entries[0]
+        i = bisect_left(chunk, entry)
+        if i < len(chunk) and chunk[i] == entry:
+            return chunk
+        return chunk[:i] + entries + chunk[i:]
+    merged = chunk + entries
+    merged.sort()
+    return [entry for i, entry in enumerate(merged) if i == 0 or entry != merged[i - 1]]
+
+
+def _without(chunk: List[Entry], entries: List[Entry]) -> List[Entry]:
+    if len(entries) == 1:
+        i = bisect_left(chunk, entries[0])
+        if i < len(chunk) and chunk[i] == entries[0]:
+            return chunk[:i] + chunk[i + 1:]
+        return chunk
+    stale = set(entries)
+    return [entry for entry in chunk if entry not in stale]
+
+
+def _position(chunks: List[List[Entry]], maxes: List[Entry], value: Any, bisect: Callable) -> Tuple[int, int]:
+    i = bisect(maxes, value, key=_value)
+    if i == len(chunks):
+        return i, 0
+    return i, bisect(chunks[i], value, key=_value)
+
+
+def _iterate(
+    chunks: List[List[Entry]],
+    start: Tuple[int, int],
+    stop: Optional[Tuple[int, int]] = None,
+) -> Iterator[Entry]:
+    i, j = start
+    k, m = (len(chunks), 0) if stop is None else stop
+    while i < k or (i == k and j < m):
+        chunk = chunks[i]
+        yield from chunk[j:m] if i == k else chunk[j:]
+        i, j = i + 1, 0
@@ -0,0 +1,347 @@
+import json
+import re
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from supplier import Supplier
+from product import Product
+from bulk_import import ImportReport
+
+SUB_BUCKET_BITS = 5
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+WAREHOUSE_OPERATIONS = (
+    'add_supplier', 'update_supplier_info', 'add_product', 'remove_product', 'ship_order', 'update_product_info',
+    'transfer_out', 'transfer_in', 'bulk_add_suppliers', 'bulk_add_products', 'bulk_remove_products',
+    'get_all_products', 'get_products_sorted', 'get_products_in_range', 'get_supplier_products',
+    'get_all_suppliers', 'search_products',
+)
+
+_QUOTED = re.compile(r"'[^']*'")
+_NUMBER = re.compile(r"\d+(\.\d+)?")
+
+
+def rejection_reason(message: str) -> str:
+    return _NUMBER.sub("N", _QUOTED.sub("'…'", message))
+
+
+class Histogram:
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+        self._counts: Dict[int, int] = {}
+
+    def record(self, value: int) -> None:
+        magnitude = max(0, value.bit_length() - SUB_BUCKET_BITS - 1)
+        index = (magnitude << SUB_BUCKET_BITS) + (value >> magnitude)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def percentile(self, fraction: float) -> int:
+        if not self.count:
+            return 0
+        rank = max(1, int(fraction * self.count + 0.5))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return min(self.max, _bucket_upper(index))
+        return self.max
+
+
+def _bucket_upper(index: int) -> int:
+    magnitude = max(0, (index >> SUB_BUCKET_BITS) - 1)
+    mantissa = index - (magnitude << SUB_BUCKET_BITS)
+    return ((mantissa + 1) << magnitude) - 1
+
+
+class Metrics:
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self.latencies: Dict[str, Histogram] = {}
+        self.rejections: Counter = Counter()
+        self.gauges: Dict[str, Callable[[], float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, elapsed_ns: int, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.calls[operation] += 1
+            histogram = self.latencies.get(operation)
+            if histogram is None:
+                histogram = self.latencies[operation] = Histogram()
+            histogram.record(elapsed_ns)
+            if error is not None:
+                self.rejections[operation, rejection_reason(error)] += 1
+
+    def reject(self, operation: str, error: str, count: int = 1) -> None:
+        with self._lock:
+            self.rejections[operation, rejection_reason(error)] += count
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'calls': dict(self.calls),
+                'latency_seconds': {
+                    operation: {
+                        'count': histogram.count,
+                        'sum': histogram.total / 1e9,
+                        'min': histogram.min / 1e9,
+                        'max': histogram.max / 1e9,
+                        **{f"p{quantile * 100:g}": histogram.percentile(quantile) / 1e9 for quantile in QUANTILES},
+                    }
+                    for operation, histogram in self.latencies.items()
+                },
+                'rejections': [
+                    {'operation': operation, 'reason': reason, 'count': count}
+                    for (operation, reason), count in self.rejections.items()
+                ],
+                'gauges': {name: gauge() for name, gauge in self.gauges.items()},
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP warehouse_calls_total Number of warehouse operation calls",
+            "# TYPE warehouse_calls_total counter",
+        ]
+        for operation, calls in snapshot['calls'].items():
+            lines.append(f'warehouse_calls_total{{operation="{_escape(operation)}"}} {calls}')
+
+        lines.append("# HELP warehouse_operation_latency_seconds Warehouse operation latency")
+        lines.append("# TYPE warehouse_operation_latency_seconds summary")
+        for operation, latency in snapshot['latency_seconds'].items():
+            label = f'operation="{_escape(operation)}"'
+            for quantile in QUANTILES:
+                value = latency[f"p{quantile * 100:g}"]
+                lines.append(f'warehouse_operation_latency_seconds{{{label},quantile="{quantile:g}"}} {value:.9f}')
+            lines.append(f'warehouse_operation_latency_seconds_sum{{{label}}} {latency["sum"]:.9f}')
+            lines.append(f'warehouse_operation_latency_seconds_count{{{label}}} {latency["count"]}')
+
+        lines.append("# HELP warehouse_rejections_total Validation rejections by reason")
+        lines.append("# TYPE warehouse_rejections_total counter")
+        for rejection in snapshot['rejections']:
+            lines.append(f'warehouse_rejections_total{{operation="{_escape(rejection["operation"])}",'
+                         f'reason="{_escape(rejection["reason"])}"}} {rejection["count"]}')
+
+        for name, value in snapshot['gauges'].items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def resident_memory_bytes() -> float:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * 4096
+    except (OSError, IndexError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Instrumentation:
+
+    def __init__(self, warehouse: Any):
+        self._warehouse = weakref.ref(warehouse)
+        self.metrics = Metrics()
+        self.profiler = SamplingProfiler()
+        self.enabled = False
+        self.metrics.gauges['process_resident_memory_bytes'] = resident_memory_bytes
+        if isinstance(getattr(type(warehouse), 'products', None), property):
+            return
+        self.metrics.gauges['warehouse_products'] = lambda: len(self._target().products)
+        self.metrics.gauges['warehouse_suppliers'] = lambda: len(self._target().suppliers)
+        self.metrics.gauges['warehouse_transactions'] = lambda: len(self._target().transactions)
+        if getattr(warehouse, 'cache', None) is not None:
+            self.metrics.gauges['warehouse_cache_hits'] = lambda: self._target().cache.hits
+            self.metrics.gauges['warehouse_cache_misses'] = lambda: self._target().cache.misses
+            self.metrics.gauges['warehouse_cache_stale'] = lambda: self._target().cache.stale
+            self.metrics.gauges['warehouse_cache_evictions'] = lambda: self._target().cache.evictions
+            self.metrics.gauges['warehouse_cache_entries'] = lambda: len(self._target().cache)
+
+    def enable(self) -> None:
+        if self.enabled:
+            return
+        warehouse = self._target()
+        for operation in WAREHOUSE_OPERATIONS:
+            method = getattr(warehouse, operation, None)
+            if method is not None:
+                setattr(warehouse, operation, self._wrap(operation, method))
+        _validation_metrics.append(self.metrics)
+        if len(_validation_metrics) == 1:
+            _patch_validation()
+        self.enabled = True
+
+    def disable(self) -> None:
+        if not self.enabled:
+            return
+        warehouse = self._target()
+        for operation in WAREHOUSE_OPERATIONS:
+            warehouse.__dict__.pop(operation, None)
+        _validation_metrics.remove(self.metrics)
+        if not _validation_metrics:
+            _unpatch_validation()
+        self.enabled = False
+
+    def _target(self) -> Any:
+        warehouse = self._warehouse()
+        if warehouse is None:
+            raise ValueError("Склад для інструментування більше не існує")
+        return warehouse
+
+    def _wrap(self, operation: str, method: Callable) -> Callable:
+        metrics = self.metrics
+        clock = time.perf_counter_ns
+
+        @wraps(method)
+        def instrumented(*args, **kwargs):
+            started = clock()
+            try:
+                result = method(*args, **kwargs)
+            except ValueError as e:
+                metrics.record(operation, clock() - started, str(e))
+                raise
+            metrics.record(operation, clock() - started)
+
+            if isinstance(result, ImportReport):
+                for rejected in result.rejected:
+                    metrics.reject(operation, rejected.reason)
+            elif operation == 'bulk_remove_products':
+                for error in result:
+                    if error is not None:
+                        metrics.reject(operation, error)
+            return result
+
+        return instrumented
+
+
+_instrumentations: "weakref.WeakKeyDictionary[Any, Instrumentation]" = weakref.WeakKeyDictionary()
+_validation_metrics: List[Metrics] = []
+_originals: Dict[Tuple[type, str], Any] = {}
+
+VALIDATORS = (
+    (Product, '_validate_product_data', 'Product.validate'),
+    (Product, 'update_quantity', 'Product.update_quantity'),
+    (Product, 'update_price', 'Product.update_price'),
+    (Supplier, '_validate_supplier_data', 'Supplier.validate'),
+)
+
+
+def instrumentation_for(warehouse: Any) -> Instrumentation:
+    instrumentation = _instrumentations.get(warehouse)
+    if instrumentation is None:
+        instrumentation = _instrumentations[warehouse] = Instrumentation(warehouse)
+    return instrumentation
+
+
+def _patch_validation() -> None:
+    for cls, attribute, operation in VALIDATORS:
+        original = cls.__dict__[attribute]
+        _originals[cls, attribute] = original
+        function = original.__func__ if isinstance(original, staticmethod) else original
+        wrapper = _validation_wrapper(operation, function)
+        setattr(cls, attribute, staticmethod(wrapper) if isinstance(original, staticmethod) else wrapper)
+
+
+def _unpatch_validation() -> None:
+    for (cls, attribute), original in _originals.items():
+        setattr(cls, attribute, original)
+    _originals.clear()
+
+
+def _validation_wrapper(operation: str, function: Callable) -> Callable:
+    clock = time.perf_counter_ns
+
+    @wraps(function)
+    def validated(*args, **kwargs):
+        started = clock()
+        try:
+            result = function(*args, **kwargs)
+        except ValueError as e:
+            elapsed = clock() - started
+            for metrics in _validation_metrics:
+                metrics.record(operation, elapsed, str(e))
+            raise
+        elapsed = clock() - started
+        for metrics in _validation_metrics:
+            metrics.record(operation, elapsed)
+        return result
+
+    return validated
+
+
+class SamplingProfiler:
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.main_thread().ident
+        self.samples = 0
+        self.own: Counter = Counter()
+        self.cumulative: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def report(self, limit: int = 20) -> List[Tuple[str, int, int]]:
+        return [(location, count, self.cumulative[location]) for location, count in self.own.most_common(limit)]
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            self.own[_location(frame)] += 1
+            seen = set()
+            while frame is not None:
+                location = _location(frame)
+                if location not in seen:
+                    seen.add(location)
+                    self.cumulative[location] += 1
+                frame = frame.f_back
+
+
+def _location(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno} {code.co_name}"
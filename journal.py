@@ -0,0 +1,360 @@
+import os
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime
+from itertools import compress
+from operator import le
+from typing import Callable, Collection, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from enums import TransactionType
+from transaction import Transaction
+
+TRANSACTION_TYPES: List[TransactionType] = list(TransactionType)
+TYPE_CODES: Dict[TransactionType, int] = {t: code for code, t in enumerate(TRANSACTION_TYPES)}
+
+DEFAULT_CHUNK_SIZE = 65536
+DEFAULT_SPILL_CACHE_CHUNKS = 4
+POSTING_SCAN_RATIO = 16
+
+Row = Tuple[int, int, int, int, float]
+Columns = Tuple[array, array, array, array]
+
+
+class ProductRef(NamedTuple):
+    name: str
+
+
+class SpilledChunkCache:
+
+    def __init__(self, capacity: int = DEFAULT_SPILL_CACHE_CHUNKS):
+        self.capacity = capacity
+        self._entries: "OrderedDict[str, Columns]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, load: Callable[[], Columns]) -> Columns:
+        with self._lock:
+            columns = self._entries.get(path)
+            if columns is not None:
+                self._entries.move_to_end(path)
+                return columns
+        columns = load()
+        if self.capacity > 0:
+            with self._lock:
+                self._entries[path] = columns
+                while len(self._entries) > self.capacity:
+                    self._entries.popitem(last=False)
+        return columns
+
+
+class JournalChunk:
+
+    def __init__(self):
+        self.product_ids = array('I')
+        self.quantities = array('q')
+        self.type_codes = array('B')
+        self.timestamps = array('d')
+        self.count = 0
+        self.min_timestamp = float('inf')
+        self.max_timestamp = float('-inf')
+        self.ordered = True
+        self.sealed = False
+        self.path: Optional[str] = None
+        self._spill_cache: Optional[SpilledChunkCache] = None
+        self._source: Optional[Callable[[], Columns]] = None
+        self._posting_keys: Optional[array] = None
+        self._posting_starts = array('I')
+        self._posting_offsets = array('I')
+
+    def extend(self, product_ids: array, quantities: array, type_codes: array, timestamps: array) -> None:
+        if not timestamps:
+            return
+        self.ordered = (self.ordered and timestamps[0] >= self.max_timestamp
+                        and all(map(le, timestamps, timestamps[1:])))
+        self.product_ids.extend(product_ids)
+        self.quantities.extend(quantities)
+        self.type_codes.extend(type_codes)
+        self.timestamps.extend(timestamps)
+        self.count += len(timestamps)
+        self.min_timestamp = min(self.min_timestamp, min(timestamps))
+        self.max_timestamp = max(self.max_timestamp, max(timestamps))
+
+    def append(self, product_id: int, quantity: int, type_code: int, timestamp: float) -> None:
+        self.product_ids.append(product_id)
+        self.quantities.append(quantity)
+        self.type_codes.append(type_code)
+        self.timestamps.append(timestamp)
+        self.count += 1
+        if timestamp < self.max_timestamp:
+            self.ordered = False
+        if timestamp < self.min_timestamp:
+            self.min_timestamp = timestamp
+        if timestamp > self.max_timestamp:
+            self.max_timestamp = timestamp
+
+    def columns(self) -> Columns:
+        if self._source is not None:
+            self.product_ids, self.quantities, self.type_codes, self.timestamps = self._source()
+            self._source = None
+        if self.path is None:
+            return self.product_ids, self.quantities, self.type_codes, self.timestamps
+        if self._spill_cache is not None:
+            return self._spill_cache.get(self.path, self._read_spilled)
+        return self._read_spilled()
+
+    def _read_spilled(self) -> Columns:
+        columns = (array('I'), array('q'), array('B'), array('d'))
+        with open(self.path, 'rb') as f:
+            for column in columns:
+                column.fromfile(f, self.count)
+        return columns
+
+    def offsets(
+        self,
+        product_ids: array,
+        timestamps: array,
+        first: int = 0,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        wanted: Optional[Collection[int]] = None,
+    ) -> Iterable[int]:
+        if wanted is not None:
+            if self.sealed and len(wanted) * POSTING_SCAN_RATIO < self.count:
+                return sorted(offset for product_id in wanted for offset in self.postings(product_id, product_ids)
+                              if offset >= first)
+            if len(wanted) == 1:
+                return _positions(product_ids, next(iter(wanted)), first)
+            return compress(range(first, self.count), (product_id in wanted for product_id in product_ids[first:]))
+
+        start, stop = first, self.count
+        if self.ordered:
+            if since is not None:
+                start = bisect_left(timestamps, since, start)
+            if until is not None:
+                stop = bisect_left(timestamps, until, start)
+        return range(start, stop)
+
+    def postings(self, product_id: int, product_ids: Optional[array] = None) -> array:
+        if self._posting_keys is None:
+            self._build_postings(product_ids if product_ids is not None else self.columns()[0])
+        keys = self._posting_keys
+        index = bisect_left(keys, product_id)
+        if index == len(keys) or keys[index] != product_id:
+            return array('I')
+        return self._posting_offsets[self._posting_starts[index]:self._posting_starts[index + 1]]
+
+    def _build_postings(self, product_ids: array) -> None:
+        order = array('I', sorted(range(self.count), key=product_ids.__getitem__))
+        keys, starts = array('I'), array('I')
+        previous = -1
+        for position, offset in enumerate(order):
+            product_id = product_ids[offset]
+            if product_id != previous:
+                keys.append(product_id)
+                starts.append(position)
+                previous = product_id
+        starts.append(len(order))
+        self._posting_keys, self._posting_starts, self._posting_offsets = keys, starts, order
+
+    def spill(self, path: str, cache: Optional[SpilledChunkCache] = None) -> None:
+        with open(path, 'wb') as f:
+            for column in (self.product_ids, self.quantities, self.type_codes, self.timestamps):
+                column.tofile(f)
+        self.path = path
+        self._spill_cache = cache
+        self.product_ids = array('I')
+        self.quantities = array('q')
+        self.type_codes = array('B')
+        self.timestamps = array('d')
+
+
+def _positions(product_ids: array, product_id: int, first: int) -> Iterator[int]:
+    index = first
+    try:
+        while True:
+            index = product_ids.index(product_id, index)
+            yield index
+            index += 1
+    except ValueError:
+        return
+
+
+class TransactionJournal:
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        spill_dir: Optional[str] = None,
+        resolve_product: Optional[Callable[[str], Optional[object]]] = None,
+        spill_cache_chunks: int = DEFAULT_SPILL_CACHE_CHUNKS,
+    ):
+        if chunk_size <= 0:
+            raise ValueError("Розмір блоку журналу повинен бути більше нуля")
+        self.chunk_size = chunk_size
+        self.spill_dir = spill_dir
+        self.resolve_product = resolve_product
+        self._spill_cache = SpilledChunkCache(spill_cache_chunks)
+        self._product_ids: Dict[str, int] = {}
+        self._product_names: List[str] = []
+        self._sealed: List[JournalChunk] = []
+        self._active = JournalChunk()
+        self._length = 0
+
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def __iter__(self) -> Iterator[Transaction]:
+        for chunk in self.chunks():
+            yield from self._chunk_transactions(chunk)
+
+    def __getitem__(self, position: int) -> Transaction:
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("Індекс операції поза межами журналу")
+
+        chunk_number, offset = divmod(position, self.chunk_size)
+        chunk = self._sealed[chunk_number] if chunk_number < len(self._sealed) else self._active
+        product_ids, quantities, type_codes, timestamps = chunk.columns()
+        return self._make_transaction(product_ids[offset], quantities[offset],
+                                      type_codes[offset], timestamps[offset])
+
+    def scan(
+        self,
+        start: int = 0,
+        since: Optional[datetime] = None,
+        transaction_type: Optional[TransactionType] = None,
+    ) -> Iterator[Tuple[int, Transaction]]:
+        since_timestamp = since.timestamp() if since is not None else None
+        type_code = TYPE_CODES[transaction_type] if transaction_type is not None else None
+        for position, product_id, quantity, code, timestamp in self.select(start, since_timestamp, None, type_code):
+            yield position, self._make_transaction(product_id, quantity, code, timestamp)
+
+    def select(
+        self,
+        start: int = 0,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        type_code: Optional[int] = None,
+        product_ids: Optional[Collection[int]] = None,
+    ) -> Iterator[Row]:
+        chunk_start = 0
+        for chunk in self.chunks():
+            count = chunk.count
+            first = max(0, start - chunk_start)
+            skip = (first >= count
+                    or since is not None and chunk.max_timestamp < since
+                    or until is not None and chunk.min_timestamp >= until)
+            if not skip:
+                ids, quantities, type_codes, timestamps = chunk.columns()
+                for offset in chunk.offsets(ids, timestamps, first, since, until, product_ids):
+                    if type_code is not None and type_codes[offset] != type_code:
+                        continue
+                    timestamp = timestamps[offset]
+                    if since is not None and timestamp < since or until is not None and timestamp >= until:
+                        continue
+                    yield chunk_start + offset, ids[offset], quantities[offset], type_codes[offset], timestamp
+            chunk_start += count
+
+    def product_ids_of(self, product_names: Iterable[str]) -> List[int]:
+        return [self._product_ids[name] for name in product_names if name in self._product_ids]
+
+    def product_id(self, product_name: str) -> int:
+        product_id = self._product_ids.get(product_name)
+        if product_id is None:
+            product_id = len(self._product_names)
+            self._product_ids[product_name] = product_id
+            self._product_names.append(product_name)
+        return product_id
+
+    def product_name(self, product_id: int) -> str:
+        return self._product_names[product_id]
+
+    def record(
+        self,
+        product_name: str,
+        quantity: int,
+        transaction_type: TransactionType,
+        date: Optional[datetime] = None,
+    ) -> None:
+        timestamp = date.timestamp() if date is not None else datetime.now().timestamp()
+        self._active.append(self.product_id(product_name), quantity,
+                            TYPE_CODES[transaction_type], timestamp)
+        self._length += 1
+        if self._active.count >= self.chunk_size:
+            self._seal()
+
+    def extend_columns(self, product_ids: array, quantities: array,
+                       type_codes: array, timestamps: array) -> None:
+        start = 0
+        total = len(timestamps)
+        while start < total:
+            stop = min(total, start + self.chunk_size - self._active.count)
+            self._active.extend(product_ids[start:stop], quantities[start:stop],
+                                type_codes[start:stop], timestamps[start:stop])
+            self._length += stop - start
+            start = stop
+            if self._active.count >= self.chunk_size:
+                self._seal()
+
+    def restore_chunk(
+        self,
+        count: int,
+        min_timestamp: float,
+        max_timestamp: float,
+        ordered: bool,
+        load: Callable[[], Columns],
+    ) -> bool:
+        if count != self.chunk_size or self._active.count or self.spill_dir is not None:
+            return False
+        chunk = JournalChunk()
+        chunk.count = count
+        chunk.min_timestamp = min_timestamp
+        chunk.max_timestamp = max_timestamp
+        chunk.ordered = ordered
+        chunk.sealed = True
+        chunk._source = load
+        self._sealed.append(chunk)
+        self._length += count
+        return True
+
+    def product_names(self) -> List[str]:
+        return list(self._product_names)
+
+    def restore_product_names(self, names: List[str]) -> None:
+        self._product_names = list(names)
+        self._product_ids = {name: product_id for product_id, name in enumerate(self._product_names)}
+
+    def append(self, transaction: Transaction) -> None:
+        self.record(transaction.product.name, transaction.quantity,
+                    transaction.transaction_type, transaction.date)
+
+    def chunks(self) -> Iterator[JournalChunk]:
+        yield from self._sealed
+        if self._active.count:
+            yield self._active
+
+    def _seal(self) -> None:
+        chunk = self._active
+        chunk.sealed = True
+        if self.spill_dir is not None:
+            chunk.spill(os.path.join(self.spill_dir, f"chunk-{len(self._sealed):06d}.bin"), self._spill_cache)
+        self._sealed.append(chunk)
+        self._active = JournalChunk()
+
+    def _chunk_transactions(self, chunk: JournalChunk) -> Iterator[Transaction]:
+        for row in zip(*chunk.columns()):
+            yield self._make_transaction(*row)
+
+    def _make_transaction(self, product_id: int, quantity: int,
+                          type_code: int, timestamp: float) -> Transaction:
+        name = self._product_names[product_id]
+        product = self.resolve_product(name) if self.resolve_product is not None else None
+        return Transaction(product or ProductRef(name), quantity,
+                           TRANSACTION_TYPES[type_code], datetime.fromtimestamp(timestamp))
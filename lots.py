@@ -0,0 +1,225 @@
+import heapq
+from datetime import datetime
+from itertools import count
+from time import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from product import Product
+
+FIFO = 'fifo'
+FEFO = 'fefo'
+PICKING_POLICIES = (FIFO, FEFO)
+NO_EXPIRY = float('inf')
+COMPACT_SLACK = 32
+
+LotKey = Tuple[float, ...]
+LotLayer = Tuple[int, float, int, Optional[int]]
+
+
+class StockLot:
+
+    __slots__ = ('quantity', 'unit_cost', 'arrival_timestamp', 'expiry_timestamp', 'sequence')
+
+    def __init__(
+            self,
+            quantity: int,
+            unit_cost: float,
+            arrival_timestamp: int,
+            expiry_timestamp: Optional[int],
+            sequence: int,
+    ):
+        self.quantity = quantity
+        self.unit_cost = unit_cost
+        self.arrival_timestamp = arrival_timestamp
+        self.expiry_timestamp = expiry_timestamp
+        self.sequence = sequence
+
+    @property
+    def value(self) -> float:
+        return self.quantity * self.unit_cost
+
+    @property
+    def arrival_date(self) -> datetime:
+        return datetime.fromtimestamp(self.arrival_timestamp)
+
+    @property
+    def expiry_date(self) -> Optional[datetime]:
+        return datetime.fromtimestamp(self.expiry_timestamp) if self.expiry_timestamp is not None else None
+
+    def __str__(self) -> str:
+        expiry = f", до {self.expiry_date:%Y-%m-%d}" if self.expiry_timestamp is not None else ""
+        return f"{self.quantity} шт. по {self.unit_cost} грн, надійшло {self.arrival_date:%Y-%m-%d}{expiry}"
+
+
+class LotQueue:
+
+    __slots__ = ('_ordered', '_head', '_late', 'quantity', 'value')
+
+    def __init__(self):
+        self._ordered: List[Tuple[LotKey, StockLot]] = []
+        self._head = 0
+        self._late: List[Tuple[LotKey, StockLot]] = []
+        self.quantity = 0
+        self.value = 0.0
+
+    def __len__(self) -> int:
+        return len(self._ordered) - self._head + len(self._late)
+
+    def add(self, key: LotKey, lot: StockLot) -> None:
+        ordered = self._ordered
+        if self._head < len(ordered) and key < ordered[-1][0]:
+            heapq.heappush(self._late, (key, lot))
+        else:
+            ordered.append((key, lot))
+        self.quantity += lot.quantity
+        self.value += lot.value
+
+    def pick(self, quantity: int) -> List[Tuple[StockLot, int]]:
+        if quantity > self.quantity:
+            raise ValueError(f"Недостатньо товару в партіях. Доступно: {self.quantity}")
+
+        picked = []
+        ordered, late = self._ordered, self._late
+        while quantity > 0:
+            from_late = bool(late) and (self._head == len(ordered) or late[0][0] < ordered[self._head][0])
+            lot = late[0][1] if from_late else ordered[self._head][1]
+            taken = min(lot.quantity, quantity)
+            lot.quantity -= taken
+            quantity -= taken
+            self.quantity -= taken
+            self.value -= taken * lot.unit_cost
+            picked.append((lot, taken))
+            if lot.quantity == 0:
+                if from_late:
+                    heapq.heappop(late)
+                else:
+                    self._head += 1
+
+        if self._head > COMPACT_SLACK and 2 * self._head > len(ordered):
+            del ordered[:self._head]
+            self._head = 0
+        if not self.quantity:
+            self.value = 0.0
+        return picked
+
+    def lots(self) -> List[StockLot]:
+        live = heapq.merge(self._ordered[self._head:], sorted(self._late, key=lambda entry: entry[0]),
+                           key=lambda entry: entry[0])
+        return [lot for _, lot in live]
+
+
+class LotLedger:
+
+    def __init__(self, policy: str = FIFO):
+        if policy not in PICKING_POLICIES:
+            raise ValueError("Неправильна політика відбору. Доступні: 'fifo', 'fefo'")
+        self.policy = policy
+        self.cost_of_goods: Dict[str, float] = {}
+        self.written_off: Dict[str, float] = {}
+        self._queues: Dict[str, LotQueue] = {}
+        self._sequence = count()
+
+    def lots(self, product: Product) -> List[StockLot]:
+        queue = self._queues.get(product.name)
+        if queue is None:
+            return [self._implied_lot(product)] if product.quantity else []
+        self._reconcile(product, queue)
+        return queue.lots()
+
+    def stock_cost(self, product: Product) -> float:
+        queue = self._queues.get(product.name)
+        if queue is None:
+            return product.quantity * product.price
+        self._reconcile(product, queue)
+        return queue.value
+
+    def total_stock_cost(self, products: Iterable[Product]) -> float:
+        return sum(self.stock_cost(product) for product in products)
+
+    def total_cost_of_goods(self) -> float:
+        return sum(self.cost_of_goods.values(), 0.0)
+
+    def track(self, product: Product, expiry_timestamp: Optional[int] = None) -> None:
+        queue = self._queues.get(product.name)
+        if queue is None:
+            queue = self._queues[product.name] = LotQueue()
+            if product.quantity:
+                self._add(queue, product.quantity, product.price, product.arrival_timestamp, expiry_timestamp)
+
+    def receive(
+            self,
+            product: Product,
+            quantity: int,
+            unit_cost: float,
+            arrival_timestamp: int,
+            expiry_timestamp: Optional[int] = None,
+    ) -> None:
+        queue = self._queues.get(product.name)
+        if queue is None:
+            self.track(product)
+            queue = self._queues[product.name]
+        self._add(queue, quantity, unit_cost, arrival_timestamp, expiry_timestamp)
+
+    def pick(self, product: Product, quantity: int) -> List[LotLayer]:
+        lots = self.take(product, quantity)
+        cost = sum(taken * unit_cost for taken, unit_cost, _, _ in lots)
+        self.cost_of_goods[product.name] = self.cost_of_goods.get(product.name, 0.0) + cost
+        return lots
+
+    def take(self, product: Product, quantity: int) -> List[LotLayer]:
+        queue = self._queues.get(product.name)
+        if queue is None:
+            return [(quantity, product.price, product.arrival_timestamp, None)]
+        self._reconcile(product, queue)
+        return [(taken, lot.unit_cost, lot.arrival_timestamp, lot.expiry_timestamp)
+                for lot, taken in queue.pick(quantity)]
+
+    def receive_lots(self, product: Product, lots: Iterable[LotLayer]) -> None:
+        queue = self._queues.get(product.name)
+        if queue is None:
+            queue = self._queues[product.name] = LotQueue()
+            if product.quantity:
+                self._add(queue, product.quantity, product.price, product.arrival_timestamp, None)
+        for quantity, unit_cost, arrival_timestamp, expiry_timestamp in lots:
+            self._add(queue, quantity, unit_cost, arrival_timestamp, expiry_timestamp)
+
+    def discard(self, product_name: str) -> None:
+        self._queues.pop(product_name, None)
+
+    def on_product_changed(self, product: Product, attribute: str, old_value: Any) -> None:
+        queue = self._queues.get(product.name)
+        if attribute == 'price' and queue is None and product.quantity:
+            queue = self._queues[product.name] = LotQueue()
+            self._add(queue, product.quantity, old_value, product.arrival_timestamp, None)
+        elif attribute == 'quantity' and queue is not None:
+            self._reconcile(product, queue)
+
+    def iter_lots(self) -> Iterable[Tuple[str, List[StockLot]]]:
+        for name, queue in list(self._queues.items()):
+            yield name, queue.lots()
+
+    def restore(self, product: Product, lots: Iterable[LotLayer]) -> None:
+        queue = self._queues[product.name] = LotQueue()
+        for quantity, unit_cost, arrival_timestamp, expiry_timestamp in lots:
+            self._add(queue, quantity, unit_cost, arrival_timestamp, expiry_timestamp)
+
+    def _implied_lot(self, product: Product) -> StockLot:
+        return StockLot(product.quantity, product.price, product.arrival_timestamp, None, -1)
+
+    def _add(self, queue: LotQueue, quantity: int, unit_cost: float,
+             arrival_timestamp: int, expiry_timestamp: Optional[int]) -> None:
+        lot = StockLot(quantity, unit_cost, arrival_timestamp, expiry_timestamp, next(self._sequence))
+        queue.add(self._key(lot), lot)
+
+    def _key(self, lot: StockLot) -> LotKey:
+        if self.policy == FEFO:
+            expiry = lot.expiry_timestamp if lot.expiry_timestamp is not None else NO_EXPIRY
+            return expiry, lot.arrival_timestamp, lot.sequence
+        return lot.arrival_timestamp, lot.sequence
+
+    def _reconcile(self, product: Product, queue: LotQueue) -> None:
+        difference = product.quantity - queue.quantity
+        if difference > 0:
+            self._add(queue, difference, product.price, int(time()), None)
+        elif difference < 0:
+            cost = sum(lot.unit_cost * taken for lot, taken in queue.pick(-difference))
+            self.written_off[product.name] = self.written_off.get(product.name, 0.0) + cost
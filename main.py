@@ -1,15 +1,16 @@
-from warehouse import Warehouse
-from supplier import Supplier
-from product import Product
-from menu import (
-    display_menu, add_supplier, add_product, display_all_products,
-    display_sorted_products, display_all_suppliers, display_supplier_products,
-    remove_product, update_product_info, display_transactions, get_int_input
-)
+import argparse
+import os
+from typing import Any, Callable
+from console import display_menu, get_int_input
+from pending import PendingWarehouse
 
 
-def main():
-    warehouse = Warehouse("Головний склад")
+DATA_DIR = os.environ.get("WAREHOUSE_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+
+
+def seed_demo_data(warehouse: Any) -> None:
+    from supplier import Supplier
+    from product import Product
 
     try:
         supplier1 = Supplier("ТОВ Технології", "tech@example.com", "+380991234567", "м. Київ, вул. Центральна 1")
@@ -30,14 +31,94 @@ def main():
     except Exception as e:
         print(f"Помилка при додаванні тестових даних: {e}")
 
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Система управління складом")
+    parser.add_argument("mode", nargs="?", choices=["local", "serve", "connect", "export"], default="local")
+    parser.add_argument("--host", help="адреса сервера (за замовчуванням 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="порт сервера (за замовчуванням 8765)")
+    parser.add_argument("--output", default="warehouse.whc", help="файл колонкового експорту")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.mode in ("connect", "serve"):
+        from protocol import DEFAULT_HOST, DEFAULT_PORT
+        args.host = args.host or DEFAULT_HOST
+        args.port = args.port or DEFAULT_PORT
+
+    if args.mode == "connect":
+        from client import RemoteWarehouse
+        warehouse = RemoteWarehouse(args.host, args.port)
+        try:
+            run_menu(lambda: warehouse)
+        finally:
+            warehouse.close()
+        return
+
+    storage = None
+
+    def load() -> Any:
+        nonlocal storage
+        from storage import StorageEngine
+        storage = StorageEngine(DATA_DIR)
+        return storage.open("Головний склад")
+
+    pending = PendingWarehouse(load)
+
+    if args.mode == "export":
+        from columnar import export_columnar
+        warehouse = pending.result()
+        try:
+            export_columnar(warehouse, args.output)
+            print(f"Склад експортовано у '{args.output}'")
+        finally:
+            storage.close()
+        return
+
+    def open_warehouse() -> Any:
+        warehouse = pending.result()
+        if not warehouse.suppliers:
+            seed_demo_data(warehouse)
+        return warehouse
+
+    try:
+        if args.mode == "serve":
+            import asyncio
+            from server import serve
+            asyncio.run(serve(open_warehouse(), args.host, args.port))
+        else:
+            run_menu(open_warehouse)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if pending.ready and storage is not None:
+            storage.close()
+
+
+def run_menu(open_warehouse: Callable[[], Any]) -> None:
+    warehouse = None
     while True:
         display_menu()
-        choice = get_int_input("Виберіть опцію: ", 0, 9)
+        choice = get_int_input("Виберіть опцію: ", 0, 13)
 
         if choice == 0:
             print("\nДякуємо за використання системи управління складом!")
             break
-        elif choice == 1:
+
+        if warehouse is None:
+            warehouse = open_warehouse()
+
+        from menu import (
+            add_supplier, add_product, display_all_products,
+            display_sorted_products, display_all_suppliers, display_supplier_products,
+            remove_product, update_product_info, display_transactions, display_product_lots,
+            display_reorder_suggestions, display_stock_analytics, instrumentation_menu,
+        )
+
+        if choice == 1:
             add_supplier(warehouse)
         elif choice == 2:
             add_product(warehouse)
@@ -55,6 +136,14 @@ def main():
             update_product_info(warehouse)
         elif choice == 9:
             display_transactions(warehouse)
+        elif choice == 10:
+            instrumentation_menu(warehouse)
+        elif choice == 11:
+            display_product_lots(warehouse)
+        elif choice == 12:
+            display_reorder_suggestions(warehouse)
+        elif choice == 13:
+            display_stock_analytics(warehouse)
 
 
 if __name__ == "__main__":
@@ -1,55 +1,135 @@
+import sys
+from itertools import chain
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
 from warehouse import Warehouse
 from supplier import Supplier
 from product import Product
+from enums import TransactionType
+from history import PERIODS
+from cache import CATALOG, SUPPLIERS, Dependency, QueryCache, attribute_key, supplier_key
+from instrumentation import instrumentation_for
+from console import display_menu, get_date_input, get_float_input, get_int_input
+
+PAGE_SIZE = 200
+SEARCH_LIMIT = 20
+PERIOD_NAMES = {'hour': "година", 'day': "день", 'week': "тиждень", 'month': "місяць"}
+ROW_DEPENDENCIES = (attribute_key('quantity'), attribute_key('price'))
+
+
+def write_pages(lines: Iterable[str], page_size: int = PAGE_SIZE) -> None:
+    page = []
+    for line in lines:
+        page.append(line)
+        if len(page) >= page_size:
+            sys.stdout.write("\n".join(page) + "\n")
+            sys.stdout.flush()
+            page = []
+
+    if page:
+        sys.stdout.write("\n".join(page) + "\n")
+        sys.stdout.flush()
+
+
+def write_table(header: str, width: int, rows: Iterable[str], empty_message: str) -> None:
+    rows = iter(rows)
+    first_row = next(rows, None)
+
+    if first_row is None:
+        print(empty_message)
+        return
 
+    write_pages(chain([header, "-" * width, first_row], rows))
 
-def display_menu():
-    print("\n" + "=" * 50)
-    print("СИСТЕМА УПРАВЛІННЯ СКЛАДОМ".center(50))
-    print("=" * 50)
-    print("1. Додати нового постачальника")
-    print("2. Додати новий товар")
-    print("3. Переглянути всі товари")
-    print("4. Переглянути товари (сортування)")
-    print("5. Переглянути всіх постачальників")
-    print("6. Переглянути товари постачальника")
-    print("7. Видалити товар (відвантажити)")
-    print("8. Оновити інформацію про товар")
-    print("9. Переглянути історію операцій")
-    print("0. Вихід")
-    print("=" * 50)
-
-
-def get_int_input(prompt: str, min_value: int = None, max_value: int = None) -> int:
-    while True:
-        try:
-            value = int(input(prompt))
 
-            if min_value is not None and value < min_value:
-                print(f"Значення повинно бути не менше {min_value}")
-                continue
+def format_product_row(product: Product) -> str:
+    return f"{product.name:<30} {product.quantity:<10} {product.price:<15.2f} {product.supplier.name:<20}"
+
 
-            if max_value is not None and value > max_value:
-                print(f"Значення повинно бути не більше {max_value}")
-                continue
+def format_supplier_row(supplier: Supplier) -> str:
+    return f"{supplier.name:<30} {supplier.phone:<15} {supplier.email:<25} {supplier.address:<30}"
 
-            return value
-        except ValueError:
-            print("Будь ласка, введіть ціле число")
 
+def format_supplier_product_row(product: Product) -> str:
+    return f"{product.name:<30} {product.quantity:<10} {product.price:<15.2f}"
 
-def get_float_input(prompt: str, min_value: float = None) -> float:
+
+def cached_pages(
+    cache: QueryCache,
+    key: Tuple[Any, ...],
+    fetch: Callable[[Any], Iterable[Product]],
+    cursor: Callable[[Product], Any],
+    render: Callable[[Product], str],
+    dependencies: Tuple[Dependency, ...],
+) -> Iterator[str]:
+    after = None
     while True:
-        try:
-            value = float(input(prompt))
+        rows, after = cache.get(
+            key + (after,),
+            lambda: render_page(list(fetch(after)), cursor, render),
+            dependencies,
+            lambda page: len(page[0]),
+        )
+        yield from rows
+        if after is None:
+            return
 
-            if min_value is not None and value < min_value:
-                print(f"Значення повинно бути не менше {min_value}")
-                continue
 
-            return value
-        except ValueError:
-            print("Будь ласка, введіть число")
+def render_page(
+    products: List[Product],
+    cursor: Callable[[Product], Any],
+    render: Callable[[Product], str],
+) -> Tuple[List[str], Any]:
+    rows = [render(product) for product in products]
+    return rows, cursor(products[-1]) if len(products) == PAGE_SIZE else None
+
+
+def product_rows(warehouse: Warehouse, sort_key: Optional[str] = None) -> Iterator[str]:
+    cache = getattr(warehouse, 'cache', None)
+    if cache is None:
+        return map(format_product_row, warehouse.iter_products(sort_key))
+    return cached_pages(
+        cache,
+        ('product_rows', sort_key),
+        lambda after: warehouse.iter_products(sort_key, after, PAGE_SIZE),
+        lambda product: warehouse.product_cursor(product, sort_key),
+        format_product_row,
+        (CATALOG,) + ROW_DEPENDENCIES,
+    )
+
+
+def supplier_product_rows(warehouse: Warehouse, supplier_name: str) -> List[str]:
+    cache = getattr(warehouse, 'cache', None)
+    if cache is None:
+        return [format_supplier_product_row(product) for product in warehouse.get_supplier_products(supplier_name)]
+    return cache.get(
+        ('supplier_product_rows', supplier_name),
+        lambda: [format_supplier_product_row(product) for product in warehouse.get_supplier_products(supplier_name)],
+        (supplier_key(supplier_name),) + ROW_DEPENDENCIES,
+        len,
+    )
+
+
+def supplier_rows(warehouse: Warehouse) -> List[str]:
+    cache = getattr(warehouse, 'cache', None)
+    if cache is None:
+        return [format_supplier_row(supplier) for supplier in warehouse.get_all_suppliers()]
+    return cache.get(
+        ('supplier_rows',),
+        lambda: [format_supplier_row(supplier) for supplier in warehouse.get_all_suppliers()],
+        (SUPPLIERS,),
+        len,
+    )
+
+
+def find_products(warehouse: Warehouse) -> List[Product]:
+    query = input("Введіть назву або її частину для пошуку (Enter - показати всі): ").strip()
+    if not query:
+        return warehouse.get_all_products()
+
+    products = warehouse.search_products(query, SEARCH_LIMIT)
+    if not products:
+        print(f"За запитом '{query}' товарів не знайдено")
+    return products
 
 
 def add_supplier(warehouse: Warehouse) -> None:
@@ -79,6 +159,7 @@ def add_product(warehouse: Warehouse) -> None:
     quantity = get_int_input("Введіть кількість: ", 1)
     price = get_float_input("Введіть ціну за одиницю: ", 0.01)
     description = input("Введіть опис (необов'язково): ")
+    expiry_date = get_date_input("Введіть термін придатності ДД.ММ.РРРР (необов'язково): ")
 
     print("\nДоступні постачальники:")
     suppliers = warehouse.get_all_suppliers()
@@ -90,7 +171,7 @@ def add_product(warehouse: Warehouse) -> None:
 
     try:
         product = Product(name, quantity, price, selected_supplier, description=description)
-        warehouse.add_product(product)
+        warehouse.add_product(product, expiry_date=expiry_date)
         print(f"Товар '{name}' успішно доданий на склад")
     except (ValueError) as e:
         print(f"Помилка: {e}")
@@ -99,17 +180,12 @@ def add_product(warehouse: Warehouse) -> None:
 def display_all_products(warehouse: Warehouse) -> None:
     print("\n--- Список всіх товарів на складі ---")
 
-    products = warehouse.get_all_products()
-
-    if not products:
-        print("Склад порожній")
-        return
-
-    print(f"{'Назва':<30} {'Кількість':<10} {'Ціна, грн':<15} {'Постачальник':<20}")
-    print("-" * 75)
-
-    for product in products:
-        print(f"{product.name:<30} {product.quantity:<10} {product.price:<15.2f} {product.supplier.name:<20}")
+    write_table(
+        f"{'Назва':<30} {'Кількість':<10} {'Ціна, грн':<15} {'Постачальник':<20}",
+        75,
+        product_rows(warehouse),
+        "Склад порожній",
+    )
 
 
 def display_sorted_products(warehouse: Warehouse) -> None:
@@ -129,29 +205,23 @@ def display_sorted_products(warehouse: Warehouse) -> None:
     sort_keys = {1: 'name', 2: 'quantity', 3: 'price'}
     sort_key = sort_keys[choice]
 
-    products = warehouse.get_products_sorted(sort_key)
-
-    print(f"\n{'Назва':<30} {'Кількість':<10} {'Ціна, грн':<15} {'Постачальник':<20}")
-    print("-" * 75)
-
-    for product in products:
-        print(f"{product.name:<30} {product.quantity:<10} {product.price:<15.2f} {product.supplier.name:<20}")
+    write_table(
+        f"\n{'Назва':<30} {'Кількість':<10} {'Ціна, грн':<15} {'Постачальник':<20}",
+        75,
+        product_rows(warehouse, sort_key),
+        "Склад порожній",
+    )
 
 
 def display_all_suppliers(warehouse: Warehouse) -> None:
     print("\n--- Список всіх постачальників ---")
 
-    suppliers = warehouse.get_all_suppliers()
-
-    if not suppliers:
-        print("Немає зареєстрованих постачальників")
-        return
-
-    print(f"{'Назва':<30} {'Телефон':<15} {'Email':<25} {'Адреса':<30}")
-    print("-" * 100)
-
-    for supplier in suppliers:
-        print(f"{supplier.name:<30} {supplier.phone:<15} {supplier.email:<25} {supplier.address:<30}")
+    write_table(
+        f"{'Назва':<30} {'Телефон':<15} {'Email':<25} {'Адреса':<30}",
+        100,
+        supplier_rows(warehouse),
+        "Немає зареєстрованих постачальників",
+    )
 
 
 def display_supplier_products(warehouse: Warehouse) -> None:
@@ -170,9 +240,9 @@ def display_supplier_products(warehouse: Warehouse) -> None:
     selected_supplier = suppliers[supplier_idx]
 
     try:
-        products = warehouse.get_supplier_products(selected_supplier.name)
+        rows = supplier_product_rows(warehouse, selected_supplier.name)
 
-        if not products:
+        if not rows:
             print(f"У постачальника '{selected_supplier.name}' немає товарів на складі")
             return
 
@@ -180,8 +250,7 @@ def display_supplier_products(warehouse: Warehouse) -> None:
         print(f"{'Назва':<30} {'Кількість':<10} {'Ціна, грн':<15}")
         print("-" * 55)
 
-        for product in products:
-            print(f"{product.name:<30} {product.quantity:<10} {product.price:<15.2f}")
+        write_pages(rows)
 
     except ValueError as e:
         print(f"Помилка: {e}")
@@ -194,8 +263,11 @@ def remove_product(warehouse: Warehouse) -> None:
         print("Склад порожній")
         return
 
+    products = find_products(warehouse)
+    if not products:
+        return
+
     print("Виберіть товар для відвантаження:")
-    products = warehouse.get_all_products()
     for i, product in enumerate(products, 1):
         print(f"{i}. {product.name} (доступно: {product.quantity} шт)")
 
@@ -219,8 +291,11 @@ def update_product_info(warehouse: Warehouse) -> None:
         print("Склад порожній")
         return
 
+    products = find_products(warehouse)
+    if not products:
+        return
+
     print("Виберіть товар для оновлення:")
-    products = warehouse.get_all_products()
     for i, product in enumerate(products, 1):
         print(f"{i}. {product.name}")
 
@@ -259,15 +334,170 @@ def update_product_info(warehouse: Warehouse) -> None:
 def display_transactions(warehouse: Warehouse) -> None:
     print("\n--- Історія операцій на складі ---")
 
-    transactions = warehouse.transactions
+    since = get_date_input("Від дати ДД.ММ.РРРР (необов'язково): ")
+    until = get_date_input("До дати ДД.ММ.РРРР, не включно (необов'язково): ")
+
+    transaction_types = list(TransactionType)
+    print("Тип операції: 0. Усі")
+    for i, transaction_type in enumerate(transaction_types, 1):
+        print(f"{i}. {transaction_type.value}")
+    type_choice = get_int_input("Ваш вибір: ", 0, len(transaction_types))
+    transaction_type = transaction_types[type_choice - 1] if type_choice else None
+
+    product_name = input("Назва товару (необов'язково): ").strip() or None
+    supplier_name = input("Назва постачальника (необов'язково): ").strip() or None
+    filters = (since, until, transaction_type, product_name, supplier_name)
+
+    print("\n1. Перелік операцій")
+    for i, period in enumerate(PERIODS, 2):
+        print(f"{i}. Підсумки за період: {PERIOD_NAMES[period]}")
+    choice = get_int_input("Ваш вибір: ", 1, len(PERIODS) + 1)
+
+    if choice == 1:
+        write_table(
+            f"{'Тип операції':<15} {'Товар':<30} {'Кількість':<10} {'Дата і час':<20}",
+            75,
+            (f"{transaction.transaction_type.value:<15} {transaction.product.name:<30} "
+             f"{transaction.quantity:<10} {transaction.date.strftime('%d.%m.%Y %H:%M'):<20}"
+             for transaction in warehouse.iter_transactions(
+                 since, transaction_type, until=until, product_name=product_name, supplier_name=supplier_name)),
+            "Операцій не знайдено",
+        )
+        return
 
-    if not transactions:
-        print("Історія операцій порожня")
+    try:
+        totals = warehouse.transaction_totals(PERIODS[choice - 2], *filters)
+    except ValueError as e:
+        print(f"Помилка: {e}")
+        return
+    write_table(
+        f"{'Початок періоду':<20}" + "".join(f" {t.value:>15}" for t in transaction_types),
+        20 + 16 * len(transaction_types),
+        (f"{bucket.strftime('%d.%m.%Y %H:%M'):<20}" + "".join(f" {volumes.get(t, 0):>15}" for t in transaction_types)
+         for bucket, volumes in totals),
+        "Операцій не знайдено",
+    )
+
+
+def display_product_lots(warehouse: Warehouse) -> None:
+    print("\n--- Партії товару та собівартість ---")
+    print(f"Собівартість залишків: {warehouse.stock_cost():.2f} грн")
+    print(f"Собівартість відвантаженого: {warehouse.cost_of_goods_sold():.2f} грн")
+
+    if not warehouse.products:
+        return
+
+    products = find_products(warehouse)
+    if not products:
+        return
+
+    print("Виберіть товар:")
+    for i, product in enumerate(products, 1):
+        print(f"{i}. {product.name}")
+
+    selected_product = products[get_int_input("Ваш вибір: ", 1, len(products)) - 1]
+    try:
+        lots = warehouse.get_product_lots(selected_product.name)
+        sold = warehouse.cost_of_goods_sold(selected_product.name)
+    except ValueError as e:
+        print(f"Помилка: {e}")
         return
 
-    print(f"{'Тип операції':<15} {'Товар':<30} {'Кількість':<10} {'Дата і час':<20}")
-    print("-" * 75)
+    write_table(
+        f"{'Кількість':<10} {'Ціна, грн':<15} {'Надійшло':<12} {'Придатний до':<12}",
+        52,
+        (f"{lot.quantity:<10} {lot.unit_cost:<15.2f} {lot.arrival_date:%d.%m.%Y}   "
+         f"{lot.expiry_date.strftime('%d.%m.%Y') if lot.expiry_date else '—':<12}" for lot in lots),
+        "Партій немає",
+    )
+    print(f"Собівартість відвантаженого товару: {sold:.2f} грн")
+
+
+def display_reorder_suggestions(warehouse: Warehouse) -> None:
+    print("\n--- План поповнення запасів ---")
+    lead_time_days = get_float_input("Термін постачання, днів: ", 0)
+    cover_days = get_float_input("Запас після надходження, днів: ", 0)
 
-    for transaction in transactions:
-        print(f"{transaction.transaction_type.value:<15} {transaction.product.name:<30} "
-              f"{transaction.quantity:<10} {transaction.date.strftime('%d.%m.%Y %H:%M'):<20}")
\ No newline at end of file
+    try:
+        grouped = warehouse.reorder_suggestions(lead_time_days, cover_days)
+    except ValueError as e:
+        print(f"Помилка: {e}")
+        return
+    if not grouped:
+        print("Товарів, що потребують поповнення, немає")
+        return
+
+    lines = []
+    for supplier_name, suggestions in sorted(grouped.items()):
+        total = sum(suggestion.estimated_cost for suggestion in suggestions)
+        lines.append(f"\nПостачальник: {supplier_name} (замовлення на {total:.2f} грн)")
+        lines.append(f"{'Товар':<30} {'Залишок':<10} {'Попит/день':<12} {'Днів до нуля':<14} {'Замовити':<10}")
+        lines.append("-" * 80)
+        lines.extend(
+            f"{s.product_name:<30} {s.on_hand:<10} {s.daily_demand:<12.2f} {s.days_to_stockout:<14.1f} {s.quantity:<10}"
+            for s in suggestions)
+    write_pages(lines)
+
+
+def display_stock_analytics(warehouse: Warehouse) -> None:
+    print("\n--- Вартість запасів та оборотність ---")
+    days = get_int_input("Період оборотності, днів: ", 1)
+
+    print(f"Вартість запасів: {warehouse.stock_value():.2f} грн")
+    write_table(
+        f"{'Постачальник':<30} {'Вартість, грн':<15}",
+        46,
+        (f"{supplier_name:<30} {value:<15.2f}"
+         for supplier_name, value in sorted(warehouse.supplier_stock_values().items()) if value),
+        "Запасів немає",
+    )
+    print(f"Оборотність запасів за {days} дн.: {warehouse.inventory_turnover(days=days):.2f}")
+
+
+def instrumentation_menu(warehouse: Warehouse) -> None:
+    instrumentation = instrumentation_for(warehouse)
+    profiler = instrumentation.profiler
+
+    print("\n--- Інструментування та профілювання ---")
+    print(f"Збір метрик: {'увімкнено' if instrumentation.enabled else 'вимкнено'}, "
+          f"профілювальник: {'працює' if profiler.running else 'зупинено'}")
+    print("1. Увімкнути/вимкнути збір метрик")
+    print("2. Показати метрики (формат Prometheus)")
+    print("3. Зберегти метрики у JSON-файл")
+    print("4. Запустити/зупинити профілювальник")
+    print("5. Показати звіт профілювальника")
+    print("0. Назад")
+
+    choice = get_int_input("Ваш вибір: ", 0, 5)
+
+    if choice == 1:
+        if instrumentation.enabled:
+            instrumentation.disable()
+            print("Збір метрик вимкнено")
+        else:
+            instrumentation.enable()
+            print("Збір метрик увімкнено")
+    elif choice == 2:
+        write_pages(instrumentation.metrics.to_prometheus().splitlines())
+    elif choice == 3:
+        path = input("Введіть шлях до файлу: ").strip() or "metrics.json"
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(instrumentation.metrics.to_json())
+            print(f"Метрики збережено у '{path}'")
+        except OSError as e:
+            print(f"Помилка: {e}")
+    elif choice == 4:
+        if profiler.running:
+            profiler.stop()
+            print(f"Профілювальник зупинено, зібрано вибірок: {profiler.samples}")
+        else:
+            profiler.start()
+            print("Профілювальник запущено")
+    elif choice == 5:
+        write_table(
+            f"{'Власні':>8} {'Всього':>8}  Функція",
+            75,
+            (f"{own:>8} {cumulative:>8}  {location}" for location, own, cumulative in profiler.report()),
+            "Профілювальник ще не зібрав вибірок",
+        )
@@ -0,0 +1,31 @@
+import threading
+from typing import Any, Callable, Optional
+
+
+class PendingWarehouse:
+
+    def __init__(self, load: Callable[[], Any]):
+        self._load = load
+        self._warehouse: Any = None
+        self._error: Optional[BaseException] = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="warehouse-open", daemon=True)
+        self._thread.start()
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def result(self) -> Any:
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._warehouse
+
+    def _run(self) -> None:
+        try:
+            self._warehouse = self._load()
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._done.set()
@@ -1,16 +1,26 @@
 from datetime import datetime
+from time import time
+from typing import Any, Callable, Optional, Tuple
 from supplier import Supplier
 
+NAME_ERROR = "Назва товару повинна містити щонайменше 3 символи"
+QUANTITY_ERROR = "Кількість товару не може бути від'ємною"
+PRICE_ERROR = "Ціна товару повинна бути більше нуля"
+
+Listener = Callable[["Product", str, Any], None]
+
 
 class Product:
 
+    __slots__ = ('name', 'quantity', 'price', 'supplier', 'arrival_timestamp', 'description', '_listeners')
+
     def __init__(
             self,
             name: str,
             quantity: int,
             price: float,
             supplier: Supplier,
-            arrival_date: datetime = None,
+            arrival_date: Optional[datetime] = None,
             description: str = "",
     ):
         self._validate_product_data(name, quantity, price)
@@ -18,29 +28,78 @@ class Product:
         self.quantity = quantity
         self.price = price
         self.supplier = supplier
-        self.arrival_date = arrival_date or datetime.now()
+        self.arrival_timestamp = int(arrival_date.timestamp()) if arrival_date else int(time())
         self.description = description
+        self._listeners: Tuple[Listener, ...] = ()
+
+    @classmethod
+    def _restore(
+            cls,
+            name: str,
+            quantity: int,
+            price: float,
+            supplier: Supplier,
+            arrival_timestamp: int,
+            description: str,
+    ) -> "Product":
+        product = cls.__new__(cls)
+        product.name = name
+        product.quantity = quantity
+        product.price = price
+        product.supplier = supplier
+        product.arrival_timestamp = arrival_timestamp
+        product.description = description
+        product._listeners = ()
+        return product
+
+    @property
+    def arrival_date(self) -> datetime:
+        return datetime.fromtimestamp(self.arrival_timestamp)
+
+    @arrival_date.setter
+    def arrival_date(self, value: datetime) -> None:
+        self.arrival_timestamp = int(value.timestamp())
 
     @staticmethod
     def _validate_product_data(name: str, quantity: int, price: float) -> None:
         if not name or len(name) < 3:
-            raise ValueError("Назва товару повинна містити щонайменше 3 символи")
+            raise ValueError(NAME_ERROR)
 
         if quantity < 0:
-            raise ValueError("Кількість товару не може бути від'ємною")
+            raise ValueError(QUANTITY_ERROR)
 
         if price <= 0:
-            raise ValueError("Ціна товару повинна бути більше нуля")
+            raise ValueError(PRICE_ERROR)
 
     def update_quantity(self, new_quantity: int) -> None:
         if new_quantity < 0:
-            raise ValueError("Кількість товару не може бути від'ємною")
+            raise ValueError(QUANTITY_ERROR)
+        old_quantity = self.quantity
         self.quantity = new_quantity
+        self._notify('quantity', old_quantity)
 
     def update_price(self, new_price: float) -> None:
         if new_price <= 0:
-            raise ValueError("Ціна товару повинна бути більше нуля")
+            raise ValueError(PRICE_ERROR)
+        old_price = self.price
         self.price = new_price
+        self._notify('price', old_price)
+
+    def add_listener(self, listener: Listener) -> None:
+        self.add_listeners((listener,))
+
+    def add_listeners(self, listeners: Tuple[Listener, ...]) -> None:
+        self._listeners = self._listeners + listeners if self._listeners else listeners
+
+    def remove_listener(self, listener: Listener) -> None:
+        if listener in self._listeners:
+            listeners = list(self._listeners)
+            listeners.remove(listener)
+            self._listeners = tuple(listeners)
+
+    def _notify(self, attribute: str, old_value: Any) -> None:
+        for listener in self._listeners:
+            listener(self, attribute, old_value)
 
     def __str__(self) -> str:
         return f"{self.name} - {self.quantity} шт., {self.price} грн/шт."
\ No newline at end of file
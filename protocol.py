@@ -0,0 +1,99 @@
+import json
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict
+from supplier import Supplier
+from product import Product
+from transaction import Transaction
+from enums import TransactionType
+from journal import ProductRef
+from lots import StockLot
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_MESSAGE_SIZE = 16 * 2 ** 20
+SUPPLIER_CACHE_SIZE = 1024
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def decode_message(line: bytes) -> Dict[str, Any]:
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("Повідомлення повинно бути JSON-об'єктом")
+    return message
+
+
+def encode_supplier(supplier: Supplier) -> Dict[str, Any]:
+    return {
+        'name': supplier.name,
+        'email': supplier.email,
+        'phone': supplier.phone,
+        'address': supplier.address,
+    }
+
+
+def decode_supplier(data: Dict[str, Any]) -> Supplier:
+    return _intern_supplier(data['name'], data['email'], data['phone'], data['address'])
+
+
+@lru_cache(maxsize=SUPPLIER_CACHE_SIZE)
+def _intern_supplier(name: str, email: str, phone: str, address: str) -> Supplier:
+    return Supplier._restore(name, email, phone, address)
+
+
+def encode_product(product: Product) -> Dict[str, Any]:
+    return {
+        'name': product.name,
+        'quantity': product.quantity,
+        'price': product.price,
+        'supplier': encode_supplier(product.supplier),
+        'arrival_date': product.arrival_timestamp,
+        'description': product.description,
+    }
+
+
+def decode_product(data: Dict[str, Any]) -> Product:
+    return Product._restore(
+        data['name'],
+        data['quantity'],
+        data['price'],
+        decode_supplier(data['supplier']),
+        int(data['arrival_date']),
+        data['description'],
+    )
+
+
+def encode_lot(lot: StockLot) -> Dict[str, Any]:
+    return {
+        'quantity': lot.quantity,
+        'unit_cost': lot.unit_cost,
+        'arrival_date': lot.arrival_timestamp,
+        'expiry_date': lot.expiry_timestamp,
+    }
+
+
+def decode_lot(data: Dict[str, Any]) -> StockLot:
+    expiry = data['expiry_date']
+    return StockLot(data['quantity'], data['unit_cost'], int(data['arrival_date']),
+                    int(expiry) if expiry is not None else None, -1)
+
+
+def encode_transaction(transaction: Transaction) -> Dict[str, Any]:
+    return {
+        'type': transaction.transaction_type.name,
+        'product': transaction.product.name,
+        'quantity': transaction.quantity,
+        'date': transaction.date.timestamp(),
+    }
+
+
+def decode_transaction(data: Dict[str, Any]) -> Transaction:
+    return Transaction(
+        ProductRef(data['product']),
+        data['quantity'],
+        TransactionType[data['type']],
+        datetime.fromtimestamp(data['date']),
+    )
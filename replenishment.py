@@ -0,0 +1,256 @@
+import heapq
+import math
+import sys
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from product import Product
+from enums import TransactionType
+from journal import TYPE_CODES, TransactionJournal
+
+DAY = 86400.0
+DEFAULT_HALF_LIFE_DAYS = 14.0
+DEFAULT_LEAD_TIME_DAYS = 7.0
+DEFAULT_COVER_DAYS = 30.0
+MAX_EXPONENT = 600.0
+MIN_DAILY_DEMAND = 0.01
+COMPACT_SLACK = 64
+SHIPMENT_CODE = TYPE_CODES[TransactionType.SHIPMENT]
+
+HeapEntry = Tuple[float, int, str]
+DepartedProduct = Tuple[str, str, float]
+
+
+class ReorderSuggestion(NamedTuple):
+    product_name: str
+    supplier_name: str
+    on_hand: int
+    daily_demand: float
+    days_to_stockout: float
+    quantity: int
+    estimated_cost: float
+
+
+class _Demand:
+
+    __slots__ = ('level', 'on_hand', 'version')
+
+    def __init__(self, on_hand: int):
+        self.level = 0.0
+        self.on_hand = on_hand
+        self.version = 0
+
+
+class ReplenishmentPlanner:
+
+    def __init__(
+        self,
+        products: Callable[[str], Optional[Product]],
+        journal: TransactionJournal,
+        half_life_days: float = DEFAULT_HALF_LIFE_DAYS,
+        lead_time_days: float = DEFAULT_LEAD_TIME_DAYS,
+        cover_days: float = DEFAULT_COVER_DAYS,
+        clock: Callable[[], float] = time.time,
+    ):
+        if half_life_days <= 0:
+            raise ValueError("Період напіврозпаду попиту повинен бути більше нуля")
+        self._products = products
+        self._journal = journal
+        self.lead_time_days = lead_time_days
+        self.cover_days = cover_days
+        self.clock = clock
+        self._tau = half_life_days * DAY / math.log(2)
+        self._reference = clock()
+        self._demand: Dict[str, _Demand] = {}
+        self._departed: Dict[str, Tuple[str, float]] = {}
+        self._heap: List[HeapEntry] = []
+        self._live = 0
+        self._ready = True
+
+    def invalidate(self) -> None:
+        self._ready = False
+
+    def daily_demand(self, product_name: str, now: Optional[float] = None) -> float:
+        self._ensure()
+        demand = self._demand.get(product_name)
+        if demand is None or not demand.level:
+            return 0.0
+        return self._rate(demand.level, now) * DAY
+
+    def days_to_stockout(self, product_name: str, now: Optional[float] = None) -> float:
+        self._ensure()
+        demand = self._demand.get(product_name)
+        if demand is None or not demand.level:
+            return math.inf
+        return self._days(self._key(demand), now)
+
+    def at_risk(
+        self,
+        horizon_days: Optional[float] = None,
+        limit: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> List[Tuple[str, float]]:
+        self._ensure()
+        now = self.clock() if now is None else now
+        threshold = math.inf
+        if horizon_days is not None and horizon_days <= 0:
+            threshold = -sys.float_info.max
+        elif horizon_days is not None:
+            threshold = math.log(horizon_days * DAY / self._tau) - (now - self._reference) / self._tau
+        risky = []
+        faded = []
+        for key, name in self._ordered(threshold):
+            if self._rate(self._demand[name].level, now) * DAY < MIN_DAILY_DEMAND:
+                faded.append(name)
+                continue
+            risky.append((name, self._days(key, now)))
+            if limit is not None and len(risky) >= limit:
+                break
+        for name in faded:
+            self._forget(name)
+        return risky
+
+    def suggestions(
+        self,
+        lead_time_days: Optional[float] = None,
+        cover_days: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> Dict[str, List[ReorderSuggestion]]:
+        lead_time_days = self.lead_time_days if lead_time_days is None else lead_time_days
+        cover_days = self.cover_days if cover_days is None else cover_days
+        now = self.clock() if now is None else now
+
+        grouped: Dict[str, List[ReorderSuggestion]] = {}
+        for name, days in self.at_risk(lead_time_days, now=now):
+            demand = self._demand[name]
+            daily = self._rate(demand.level, now) * DAY
+            quantity = math.ceil(daily * (lead_time_days + cover_days) - demand.on_hand)
+            if quantity <= 0:
+                continue
+            product = self._products(name)
+            if product is not None:
+                supplier_name, price = product.supplier.name, product.price
+            elif name in self._departed:
+                supplier_name, price = self._departed[name]
+            else:
+                continue
+            grouped.setdefault(supplier_name, []).append(ReorderSuggestion(
+                name, supplier_name, demand.on_hand, daily, days, quantity, quantity * price))
+        return grouped
+
+    def on_transaction(self, product_name: str, quantity: int, type_code: int, timestamp: float) -> None:
+        if not self._ready or type_code != SHIPMENT_CODE:
+            return
+        demand = self._demand.get(product_name)
+        if demand is None:
+            product = self._products(product_name)
+            demand = self._demand[product_name] = _Demand(product.quantity if product is not None else 0)
+        exponent = (timestamp - self._reference) / self._tau
+        if exponent > MAX_EXPONENT:
+            self._rebase(timestamp)
+            exponent = 0.0
+        if not demand.level:
+            self._live += 1
+        demand.level += quantity * math.exp(exponent)
+        self._push(product_name, demand)
+
+    def on_product_added(self, product: Product) -> None:
+        self._departed.pop(product.name, None)
+        self._set_on_hand(product.name, product.quantity)
+
+    def on_product_removed(self, product: Product) -> None:
+        self._departed[product.name] = (product.supplier.name, product.price)
+        self._set_on_hand(product.name, 0)
+
+    def on_product_changed(self, product: Product, attribute: str, old_value) -> None:
+        if attribute == 'quantity':
+            self._set_on_hand(product.name, product.quantity)
+
+    def departed_products(self) -> List[DepartedProduct]:
+        return [(name, supplier_name, price) for name, (supplier_name, price) in self._departed.items()]
+
+    def restore_departed(self, departed: Iterable[DepartedProduct]) -> None:
+        for name, supplier_name, price in departed:
+            if self._products(name) is None:
+                self._departed[name] = (supplier_name, price)
+
+    def _set_on_hand(self, product_name: str, on_hand: int) -> None:
+        if not self._ready:
+            return
+        demand = self._demand.get(product_name)
+        if demand is None or demand.on_hand == on_hand:
+            return
+        demand.on_hand = on_hand
+        if demand.level:
+            self._push(product_name, demand)
+
+    def _forget(self, product_name: str) -> None:
+        if self._products(product_name) is None:
+            del self._demand[product_name]
+            self._live -= 1
+
+    def _rate(self, level: float, now: Optional[float]) -> float:
+        now = self.clock() if now is None else now
+        return level * math.exp(-(now - self._reference) / self._tau) / self._tau
+
+    def _days(self, key: float, now: Optional[float]) -> float:
+        now = self.clock() if now is None else now
+        return self._tau * math.exp(key + (now - self._reference) / self._tau) / DAY
+
+    @staticmethod
+    def _key(demand: _Demand) -> float:
+        if demand.on_hand <= 0:
+            return -math.inf
+        return math.log(demand.on_hand) - math.log(demand.level)
+
+    def _push(self, product_name: str, demand: _Demand) -> None:
+        demand.version += 1
+        heapq.heappush(self._heap, (self._key(demand), demand.version, product_name))
+        if len(self._heap) > 2 * self._live + COMPACT_SLACK:
+            self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(self._key(demand), demand.version, name)
+                      for name, demand in self._demand.items() if demand.level]
+        heapq.heapify(self._heap)
+        self._live = len(self._heap)
+
+    def _ordered(self, threshold: float) -> Iterator[Tuple[float, str]]:
+        heap = self._heap
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier:
+            (key, version, name), index = heapq.heappop(frontier)
+            if key >= threshold:
+                return
+            demand = self._demand.get(name)
+            if demand is not None and demand.version == version:
+                yield key, name
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+
+    def _rebase(self, timestamp: float) -> None:
+        scale = math.exp(-(timestamp - self._reference) / self._tau)
+        for demand in self._demand.values():
+            demand.level *= scale
+        self._reference = timestamp
+        self._rebuild_heap()
+
+    def _ensure(self) -> None:
+        if self._ready:
+            return
+        self._demand = {}
+        self._heap = []
+        self._live = 0
+        self._reference = self.clock()
+        self._ready = True
+        self._departed = {name: departed for name, departed in self._departed.items() if self._products(name) is None}
+        product_name = self._journal.product_name
+        levels: Dict[str, float] = {}
+        for _, product_id, quantity, _, timestamp in self._journal.select(type_code=SHIPMENT_CODE):
+            name = product_name(product_id)
+            levels[name] = levels.get(name, 0.0) + quantity * math.exp((timestamp - self._reference) / self._tau)
+        for name, level in levels.items():
+            product = self._products(name)
+            demand = self._demand[name] = _Demand(product.quantity if product is not None else 0)
+            demand.level = level
+        self._rebuild_heap()
@@ -0,0 +1,93 @@
+import heapq
+import time
+from itertools import count
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+DEFAULT_HOLD_TTL = 900.0
+COMPACT_SLACK = 64
+
+
+class Hold(NamedTuple):
+    hold_id: int
+    product_name: str
+    quantity: int
+    expires_at: float
+
+
+class ReservationBook:
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._holds: Dict[int, Hold] = {}
+        self._reserved: Dict[str, int] = {}
+        self._expiry: List[Tuple[float, int]] = []
+        self._ids = count(1)
+
+    def __len__(self) -> int:
+        return len(self._holds)
+
+    def reserved(self, product_name: str) -> int:
+        self._expire_due()
+        return self._reserved.get(product_name, 0)
+
+    def available(self, product_name: str, on_hand: int) -> int:
+        return on_hand - self.reserved(product_name)
+
+    def get(self, hold_id: int) -> Hold:
+        self._expire_due()
+        hold = self._holds.get(hold_id)
+        if hold is None:
+            raise ValueError(f"Резерв {hold_id} не знайдено або термін його дії минув")
+        return hold
+
+    def reserve(self, product_name: str, quantity: int, on_hand: int, ttl: float = DEFAULT_HOLD_TTL) -> Hold:
+        if quantity <= 0:
+            raise ValueError("Кількість для резервування повинна бути більше нуля")
+        if ttl <= 0:
+            raise ValueError("Термін дії резерву повинен бути більше нуля")
+
+        available = self.available(product_name, on_hand)
+        if quantity > available:
+            raise ValueError(f"Недостатня кількість товару для резервування. Доступно: {available}")
+
+        hold = Hold(next(self._ids), product_name, quantity, self.clock() + ttl)
+        self._holds[hold.hold_id] = hold
+        self._reserved[product_name] = self._reserved.get(product_name, 0) + quantity
+        heapq.heappush(self._expiry, (hold.expires_at, hold.hold_id))
+        return hold
+
+    def release(self, hold_id: int) -> Hold:
+        hold = self.get(hold_id)
+        self._drop(hold)
+        return hold
+
+    def expire(self, now: Optional[float] = None) -> List[Hold]:
+        now = self.clock() if now is None else now
+        expired = []
+        while self._expiry and self._expiry[0][0] <= now:
+            _, hold_id = heapq.heappop(self._expiry)
+            hold = self._holds.get(hold_id)
+            if hold is not None:
+                self._drop(hold)
+                expired.append(hold)
+        return expired
+
+    def holds(self, product_name: Optional[str] = None) -> List[Hold]:
+        self._expire_due()
+        return [hold for hold in self._holds.values() if product_name is None or hold.product_name == product_name]
+
+    def _expire_due(self) -> None:
+        if self._expiry and self._expiry[0][0] <= self.clock():
+            self.expire()
+
+    def _drop(self, hold: Hold) -> None:
+        del self._holds[hold.hold_id]
+        reserved = self._reserved[hold.product_name] - hold.quantity
+        if reserved:
+            self._reserved[hold.product_name] = reserved
+        else:
+            del self._reserved[hold.product_name]
+
+        if len(self._expiry) > 2 * len(self._holds) + COMPACT_SLACK:
+            self._expiry = [(live.expires_at, live.hold_id) for live in self._holds.values()]
+            heapq.heapify(self._expiry)
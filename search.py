@@ -0,0 +1,204 @@
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from math import ceil
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from indexes import BULK_THRESHOLD
+
+GRAM_SIZE = 3
+MIN_SIMILARITY = 0.35
+DEFAULT_SEARCH_LIMIT = 10
+
+_TOKEN = re.compile(r"\w+")
+_COMBINING = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]")
+
+
+def normalize(text: str) -> str:
+    text = text.casefold()
+    if text.isascii():
+        return text
+    return _COMBINING.sub("", unicodedata.normalize('NFKD', text))
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(normalize(text))
+
+
+def grams(token: str) -> Set[str]:
+    padded = f" {token} "
+    return {padded[i:i + GRAM_SIZE] for i in range(len(padded) - GRAM_SIZE + 1)}
+
+
+class SearchIndex:
+
+    def __init__(self):
+        self._tokens: List[Tuple[str, str]] = []
+        self._keys: Dict[str, Tuple[str, ...]] = {}
+        self._vocabulary: Dict[str, int] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._source: Optional[Callable[[], Iterable[str]]] = None
+
+    def __len__(self) -> int:
+        self._ensure_built()
+        return len(self._keys)
+
+    def build(self, names: Iterable[str]) -> None:
+        self._source = None
+        self._tokens = []
+        self._keys = {}
+        self._vocabulary = {}
+        self._grams = {}
+        self._add_all(names)
+
+    def build_lazily(self, source: Callable[[], Iterable[str]]) -> None:
+        self._tokens = []
+        self._keys = {}
+        self._vocabulary = {}
+        self._grams = {}
+        self._source = source
+
+    def add(self, name: str) -> None:
+        if self._source is not None or name in self._keys:
+            return
+        for entry in self._index(name):
+            insort(self._tokens, entry)
+
+    def add_many(self, names: Iterable[str]) -> None:
+        if self._source is not None:
+            return
+        self._add_all(names)
+
+    def remove(self, name: str) -> None:
+        if self._source is not None:
+            return
+        tokens = self._keys.pop(name, None)
+        if tokens is None:
+            return
+
+        for token in set(tokens):
+            entry = (token, name)
+            i = bisect_left(self._tokens, entry)
+            if i < len(self._tokens) and self._tokens[i] == entry:
+                del self._tokens[i]
+
+            count = self._vocabulary.pop(token) - 1
+            if count:
+                self._vocabulary[token] = count
+                continue
+            if token.isdigit():
+                continue
+            for gram in grams(token):
+                tokens_with_gram = self._grams[gram]
+                tokens_with_gram.discard(token)
+                if not tokens_with_gram:
+                    del self._grams[gram]
+
+    def prefix(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[str]:
+        self._ensure_built()
+        terms = tokenize(query)
+        if not terms or limit <= 0:
+            return []
+
+        if len(terms) == 1:
+            found: List[str] = []
+            seen = set()
+            for name in self._names_with_prefix(terms[0]):
+                if name not in seen:
+                    seen.add(name)
+                    found.append(name)
+                    if len(found) >= limit:
+                        break
+            return found
+
+        candidates: Optional[Set[str]] = None
+        for term in sorted(set(terms), key=len, reverse=True):
+            matches = set(self._names_with_prefix(term))
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+
+        def rank(name: str) -> Tuple[bool, int, str]:
+            in_order = all(token.startswith(term) for token, term in zip(self._keys[name], terms))
+            return not in_order, len(name), name
+
+        return heapq.nsmallest(limit, candidates, key=rank)
+
+    def fuzzy(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT,
+              min_similarity: float = MIN_SIMILARITY) -> List[str]:
+        self._ensure_built()
+        terms = set(tokenize(query))
+        if not terms or limit <= 0:
+            return []
+
+        scores: Dict[str, float] = {}
+        for term in terms:
+            best: Dict[str, float] = {}
+            for token, similarity in self._similar_tokens(term, min_similarity):
+                for name in self._names_with_token(token):
+                    if similarity > best.get(name, 0.0):
+                        best[name] = similarity
+            for name, similarity in best.items():
+                scores[name] = scores.get(name, 0.0) + similarity
+
+        return heapq.nsmallest(limit, scores, key=lambda name: (-scores[name], len(name), name))
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[str]:
+        found = self.prefix(query, limit)
+        if len(found) < limit:
+            seen = set(found)
+            found.extend(name for name in self.fuzzy(query, limit) if name not in seen)
+        return found[:limit]
+
+    def _index(self, name: str) -> Iterator[Tuple[str, str]]:
+        tokens = tuple(tokenize(name))
+        self._keys[name] = tokens
+        unique_tokens = set(tokens)
+        for token in unique_tokens:
+            count = self._vocabulary.get(token, 0)
+            self._vocabulary[token] = count + 1
+            if not count and not token.isdigit():
+                for gram in grams(token):
+                    self._grams.setdefault(gram, set()).add(token)
+        return ((token, name) for token in unique_tokens)
+
+    def _add_all(self, names: Iterable[str]) -> None:
+        entries = sorted(entry for name in names if name not in self._keys for entry in self._index(name))
+        if len(entries) < BULK_THRESHOLD:
+            for entry in entries:
+                insort(self._tokens, entry)
+        else:
+            self._tokens.extend(entries)
+            self._tokens.sort()
+
+    def _names_with_prefix(self, term: str) -> Iterator[str]:
+        tokens = self._tokens
+        i = bisect_left(tokens, (term,))
+        while i < len(tokens) and tokens[i][0].startswith(term):
+            yield tokens[i][1]
+            i += 1
+
+    def _names_with_token(self, token: str) -> Iterator[str]:
+        tokens = self._tokens
+        i = bisect_left(tokens, (token,))
+        while i < len(tokens) and tokens[i][0] == token:
+            yield tokens[i][1]
+            i += 1
+
+    def _similar_tokens(self, term: str, min_similarity: float) -> Iterator[Tuple[str, float]]:
+        term_grams = grams(term)
+        postings = sorted((self._grams.get(gram, ()) for gram in term_grams), key=len)
+        required = max(1, ceil(min_similarity * len(term_grams) / 2))
+        candidates = set()
+        for tokens in postings[:len(postings) - required + 1]:
+            candidates.update(tokens)
+
+        for token in candidates:
+            token_grams = grams(token)
+            similarity = 2 * len(term_grams & token_grams) / (len(term_grams) + len(token_grams))
+            if similarity >= min_similarity:
+                yield token, similarity
+
+    def _ensure_built(self) -> None:
+        if self._source is not None:
+            self.build(self._source())
@@ -0,0 +1,411 @@
+import asyncio
+import signal
+from datetime import datetime
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+from supplier import Supplier
+from product import Product
+from enums import TransactionType
+from warehouse import Warehouse
+from search import DEFAULT_SEARCH_LIMIT
+from reservations import DEFAULT_HOLD_TTL
+from changefeed import DEFAULT_FEED_BATCH, ChangeFeed
+from analytics import DEFAULT_TURNOVER_DAYS
+from protocol import (
+    DEFAULT_HOST, DEFAULT_PORT, MAX_MESSAGE_SIZE, decode_message, encode_lot, encode_message,
+    encode_product, encode_supplier, encode_transaction,
+)
+
+DEFAULT_BATCH_SIZE = 512
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_BACKLOG = 4096
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_PIPELINE_DEPTH = 256
+
+BatchItem = Tuple[str, Any]
+Response = Tuple[bool, Any]
+
+
+class Deferred(NamedTuple):
+    build: Callable[[], Any]
+
+
+class MicroBatcher:
+
+    def __init__(
+        self,
+        apply: Callable[[List[BatchItem]], List[Optional[str]]],
+        max_batch: int = DEFAULT_BATCH_SIZE,
+        window: float = DEFAULT_BATCH_WINDOW,
+    ):
+        self.apply = apply
+        self.max_batch = max_batch
+        self.window = window
+        self.batches = 0
+        self.items = 0
+        self._pending: List[Tuple[BatchItem, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def submit(self, item: BatchItem) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+        self.batches += 1
+        self.items += len(pending)
+
+        try:
+            errors = self.apply([item for item, _ in pending])
+        except Exception as e:
+            for _, future in pending:
+                future.set_result((False, str(e)))
+            return
+
+        for (_, future), error in zip(pending, errors):
+            future.set_result((True, None) if error is None else (False, error))
+
+
+class WarehouseServer:
+
+    def __init__(
+        self,
+        warehouse: Warehouse,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        max_batch: int = DEFAULT_BATCH_SIZE,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        max_message_size: int = MAX_MESSAGE_SIZE,
+        max_pipeline: int = DEFAULT_PIPELINE_DEPTH,
+    ):
+        if max_pipeline <= 0:
+            raise ValueError("Глибина конвеєра повинна бути більше нуля")
+        self.warehouse = warehouse
+        self.host = host
+        self.port = port
+        self.max_message_size = max_message_size
+        self.max_pipeline = max_pipeline
+        self.batcher = MicroBatcher(self._apply_batch, max_batch, batch_window)
+        self.changes = ChangeFeed()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._operations: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            'add_supplier': self._add_supplier,
+            'update_supplier_info': self._update_supplier_info,
+            'add_product': self._add_product,
+            'ship_order': self._ship_order,
+            'update_product_info': self._update_product_info,
+            'get_all_products': self._list_products,
+            'get_products_sorted': self._get_products_sorted,
+            'get_all_suppliers': self._get_all_suppliers,
+            'get_supplier_products': self._get_supplier_products,
+            'search_products': self._search_products,
+            'reserve_product': self._reserve_product,
+            'confirm_reservation': self._confirm_reservation,
+            'release_reservation': self._release_reservation,
+            'get_availability': self._get_availability,
+            'get_product_lots': self._get_product_lots,
+            'get_stock_cost': self._get_stock_cost,
+            'get_stock_value': self._get_stock_value,
+            'get_turnover': self._get_turnover,
+            'reorder_suggestions': self._reorder_suggestions,
+            'list_products': self._list_products,
+            'list_transactions': self._list_transactions,
+            'transaction_totals': self._transaction_totals,
+            'read_changes': self._read_changes,
+        }
+
+    async def start(self) -> None:
+        self.changes.attach(self.warehouse)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  backlog=DEFAULT_BACKLOG, limit=self.max_message_size)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.batcher.flush()
+        self.changes.detach(self.warehouse)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        responses: asyncio.Queue = asyncio.Queue(self.max_pipeline)
+        writer_task = asyncio.create_task(self._write_responses(responses, writer))
+
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as e:
+                    line = e.partial
+                    if not line:
+                        break
+                except asyncio.LimitOverrunError as e:
+                    await _discard_line(reader, e.consumed)
+                    await responses.put(_reply(None, (False, f"Запит перевищує {self.max_message_size} байт")))
+                    continue
+                await responses.put(self._dispatch(line))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            await responses.put(None)
+            await writer_task
+
+    async def _write_responses(self, responses: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        connected = True
+        try:
+            while True:
+                entry = await responses.get()
+                if entry is None:
+                    break
+                request_id, future = entry
+                ok, payload = await future
+                if not connected:
+                    continue
+                key = 'result' if ok else 'error'
+                try:
+                    writer.write(encode_message({'id': request_id, 'ok': ok, key: payload}))
+                    if responses.empty():
+                        await writer.drain()
+                except ConnectionError:
+                    connected = False
+        finally:
+            writer.close()
+
+    def _dispatch(self, line: bytes) -> Tuple[Any, Awaitable[Response]]:
+        request_id = None
+        try:
+            message = decode_message(line)
+            request_id = message.get('id')
+            operation = message.get('op')
+            args = message.get('args') or {}
+
+            if operation == 'add_product' and args.get('expiry_date') is None:
+                return request_id, self.batcher.submit(('receipt', args))
+            if operation == 'remove_product':
+                if int(args['quantity']) <= 0:
+                    raise ValueError("Кількість для відвантаження повинна бути більше нуля")
+                return request_id, self.batcher.submit(('shipment', (args['name'], int(args['quantity']))))
+
+            handler = self._operations.get(operation)
+            if handler is None:
+                raise ValueError(f"Невідома операція: '{operation}'")
+
+            self.batcher.flush()
+            value = handler(args)
+            if isinstance(value, Deferred):
+                return request_id, asyncio.get_running_loop().run_in_executor(None, _build, value.build)
+            result: Response = (True, value)
+        except (ValueError, KeyError, TypeError) as e:
+            result = (False, str(e))
+        except Exception as e:
+            result = (False, f"Внутрішня помилка сервера: {type(e).__name__}: {e}")
+
+        return _reply(request_id, result)
+
+    def _apply_batch(self, items: List[BatchItem]) -> List[Optional[str]]:
+        errors: List[Optional[str]] = []
+        start = 0
+        while start < len(items):
+            kind = items[start][0]
+            stop = start
+            while stop < len(items) and items[stop][0] == kind:
+                stop += 1
+            run = [payload for _, payload in items[start:stop]]
+            if kind == 'receipt':
+                errors.extend(self._apply_receipts(run))
+            else:
+                errors.extend(self.warehouse.bulk_remove_products(run))
+            start = stop
+        return errors
+
+    def _apply_receipts(self, rows: List[Dict[str, Any]]) -> List[Optional[str]]:
+        errors: List[Optional[str]] = [None] * len(rows)
+        report = self.warehouse.bulk_add_products(rows, batch_size=len(rows))
+        for rejected in report.rejected:
+            errors[rejected.line - 1] = rejected.reason
+        return errors
+
+    def _add_supplier(self, args: Dict[str, Any]) -> None:
+        self.warehouse.add_supplier(Supplier(args['name'], args['email'], args['phone'], args['address']))
+
+    def _update_supplier_info(self, args: Dict[str, Any]) -> None:
+        self.warehouse.update_supplier_info(args['name'], args.get('email'), args.get('phone'), args.get('address'))
+
+    def _add_product(self, args: Dict[str, Any]) -> None:
+        supplier = self.warehouse.suppliers.get(args['supplier'])
+        if supplier is None:
+            raise ValueError(f"Постачальник '{args['supplier']}' не зареєстрований")
+        product = Product(args['name'], int(args['quantity']), float(args['price']), supplier,
+                          description=args.get('description', ""))
+        self.warehouse.add_product(product, expiry_date=datetime.fromtimestamp(args['expiry_date']))
+
+    def _ship_order(self, args: Dict[str, Any]) -> None:
+        self.warehouse.ship_order([(name, int(quantity)) for name, quantity in args['lines']])
+
+    def _update_product_info(self, args: Dict[str, Any]) -> None:
+        self.warehouse.update_product_info(args['name'], args.get('quantity'), args.get('price'))
+
+    def _get_products_sorted(self, args: Dict[str, Any]) -> Deferred:
+        return self._list_products(dict(args, sort_by=args['sort_key']))
+
+    def _get_all_suppliers(self, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [encode_supplier(supplier) for supplier in self.warehouse.get_all_suppliers()]
+
+    def _get_supplier_products(self, args: Dict[str, Any]) -> Deferred:
+        products = self.warehouse.get_supplier_products(args['supplier_name'])
+        return Deferred(lambda: [encode_product(product) for product in products])
+
+    def _reserve_product(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        hold = self.warehouse.reserve_product(args['name'], int(args['quantity']),
+                                              float(args.get('ttl') or DEFAULT_HOLD_TTL))
+        return {
+            'hold_id': hold.hold_id,
+            'name': hold.product_name,
+            'quantity': hold.quantity,
+            'expires_in': hold.expires_at - self.warehouse.reservations.clock(),
+        }
+
+    def _confirm_reservation(self, args: Dict[str, Any]) -> None:
+        self.warehouse.confirm_reservation(int(args['hold_id']))
+
+    def _release_reservation(self, args: Dict[str, Any]) -> None:
+        self.warehouse.release_reservation(int(args['hold_id']))
+
+    def _get_availability(self, args: Dict[str, Any]) -> Dict[str, int]:
+        name = args['name']
+        product = self.warehouse.products.get(name)
+        return {
+            'on_hand': product.quantity if product is not None else 0,
+            'reserved': self.warehouse.reserved_quantity(name),
+            'available': self.warehouse.available_quantity(name),
+        }
+
+    def _get_product_lots(self, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [encode_lot(lot) for lot in self.warehouse.get_product_lots(args['name'])]
+
+    def _get_stock_cost(self, args: Dict[str, Any]) -> Dict[str, float]:
+        return {
+            'stock_cost': self.warehouse.stock_cost(),
+            'cost_of_goods_sold': self.warehouse.cost_of_goods_sold(args.get('name')),
+        }
+
+    def _get_stock_value(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'total': self.warehouse.stock_value(),
+            'suppliers': self.warehouse.supplier_stock_values(),
+        }
+
+    def _get_turnover(self, args: Dict[str, Any]) -> float:
+        return self.warehouse.inventory_turnover(args.get('name'), int(args.get('days') or DEFAULT_TURNOVER_DAYS))
+
+    def _reorder_suggestions(self, args: Dict[str, Any]) -> Dict[str, List[List[Any]]]:
+        grouped = self.warehouse.reorder_suggestions(args.get('lead_time_days'), args.get('cover_days'))
+        return {supplier_name: [list(suggestion) for suggestion in suggestions]
+                for supplier_name, suggestions in grouped.items()}
+
+    def _search_products(self, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+        limit = min(int(args.get('limit') or DEFAULT_SEARCH_LIMIT), DEFAULT_PAGE_SIZE)
+        return [encode_product(product) for product in self.warehouse.search_products(args['query'], limit)]
+
+    def _list_products(self, args: Dict[str, Any]) -> Deferred:
+        sort_by = args.get('sort_by')
+        after = args.get('after')
+        if isinstance(after, list):
+            after = tuple(after)
+        limit = min(int(args.get('limit') or DEFAULT_PAGE_SIZE), DEFAULT_PAGE_SIZE)
+
+        products = list(self.warehouse.iter_products(sort_by, after, limit))
+        cursor = self.warehouse.product_cursor(products[-1], sort_by) if len(products) == limit else None
+        return Deferred(lambda: {'items': [encode_product(product) for product in products], 'next': cursor})
+
+    def _list_transactions(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        limit = min(int(args.get('limit') or DEFAULT_PAGE_SIZE), DEFAULT_PAGE_SIZE)
+        rows = self.warehouse.history.transactions(*_history_filters(args), after=int(args.get('after', -1)))
+        page = list(islice(rows, limit))
+        cursor = page[-1][0] if len(page) == limit else None
+        return {'items': [encode_transaction(transaction) for _, transaction in page], 'next': cursor}
+
+    def _read_changes(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        after = args.get('after')
+        offset = int(after) + 1 if after is not None else self.changes.oldest_offset
+        limit = min(int(args.get('limit') or DEFAULT_FEED_BATCH), DEFAULT_PAGE_SIZE)
+        events = self.changes.read(offset, limit)
+        return {
+            'items': [[event.offset, event.event, event.data, event.timestamp] for event in events],
+            'next': self.changes.next_offset,
+        }
+
+    def _transaction_totals(self, args: Dict[str, Any]) -> List[List[Any]]:
+        totals = self.warehouse.history.totals(args['period'], *_history_filters(args))
+        return [
+            [bucket.timestamp(), {transaction_type.name: quantity for transaction_type, quantity in volumes.items()}]
+            for bucket, volumes in totals
+        ]
+
+
+def _history_filters(args: Dict[str, Any]) -> Tuple[Any, ...]:
+    since = args.get('since')
+    until = args.get('until')
+    transaction_type = args.get('type')
+    return (
+        datetime.fromtimestamp(since) if since is not None else None,
+        datetime.fromtimestamp(until) if until is not None else None,
+        TransactionType[transaction_type] if transaction_type is not None else None,
+        args.get('product'),
+        args.get('supplier'),
+    )
+
+
+def _build(build: Callable[[], Any]) -> Response:
+    try:
+        return True, build()
+    except Exception as e:
+        return False, f"Внутрішня помилка сервера: {type(e).__name__}: {e}"
+
+
+def _reply(request_id: Any, result: Response) -> Tuple[Any, Awaitable[Response]]:
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(result)
+    return request_id, future
+
+
+async def _discard_line(reader: asyncio.StreamReader, consumed: int) -> None:
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b'\n')
+            return
+        except asyncio.LimitOverrunError as e:
+            consumed = e.consumed
+
+
+async def serve(warehouse: Warehouse, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    server = WarehouseServer(warehouse, host, port)
+    await server.start()
+    print(f"Сервер складу '{warehouse.name}' слухає {server.host}:{server.port}")
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signal_number, stopped.set)
+        except NotImplementedError:
+            pass
+
+    try:
+        await stopped.wait()
+    finally:
+        await server.stop()
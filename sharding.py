@@ -0,0 +1,470 @@
+import json
+import multiprocessing
+import os
+import threading
+import time
+import zlib
+from datetime import datetime
+from itertools import count
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from supplier import Supplier
+from product import Product
+from lots import LotLayer
+from warehouse import Warehouse
+from storage import StorageEngine
+from protocol import decode_product, encode_product, encode_supplier
+
+TRANSFER_HOLD_TTL = 3600.0
+TRANSFER_COMMIT_RETRIES = 3
+TRANSFER_LOG_FILE = 'transfers.log'
+
+TRANSFER_COMMITTING = 'commit'
+TRANSFER_DONE = 'done'
+TRANSFER_ABORTED = 'aborted'
+TRANSFER_COMPENSATED = 'compensated'
+TRANSFER_IN_DOUBT = 'in_doubt'
+RESOLVED_STATES = (TRANSFER_DONE, TRANSFER_ABORTED, TRANSFER_COMPENSATED)
+
+Response = Tuple[bool, Any]
+Prepared = Tuple[str, Any, int, float]
+
+
+class TransferRecord(NamedTuple):
+    transfer_id: int
+    product_name: str
+    quantity: int
+    source: int
+    destination: int
+    timestamp: float
+    state: str
+
+
+def site_for(product_name: str, site_count: int) -> int:
+    return zlib.crc32(product_name.encode('utf-8')) % site_count
+
+
+class SiteWorker:
+
+    def __init__(self, name: str, directory: Optional[str] = None, clock: Callable[[], float] = time.monotonic):
+        self.storage = StorageEngine(directory) if directory else None
+        self.warehouse = self.storage.open(name) if self.storage else Warehouse(name)
+        self.clock = clock
+        self._prepared: Dict[int, Prepared] = {}
+        self._operations: Dict[str, Callable[..., Any]] = {
+            'add_supplier': self.add_supplier,
+            'add_product': self.add_product,
+            'remove_product': self.remove_product,
+            'update_product_info': self.update_product_info,
+            'get_product': self.get_product,
+            'get_all_products': self.get_all_products,
+            'total_stock_value': self.total_stock_value,
+            'prepare_transfer_out': self.prepare_transfer_out,
+            'prepare_transfer_in': self.prepare_transfer_in,
+            'commit_transfer': self.commit_transfer,
+            'abort_transfer': self.abort_transfer,
+            'prepared_transfers': self.prepared_transfers,
+        }
+
+    def serve(self, connection) -> None:
+        try:
+            while True:
+                try:
+                    operation, args = connection.recv()
+                except EOFError:
+                    break
+                if operation == 'close':
+                    connection.send((True, None))
+                    break
+                connection.send(self.handle(operation, args))
+        finally:
+            if self.storage is not None:
+                self.storage.close()
+
+    def handle(self, operation: str, args: Sequence[Any]) -> Response:
+        try:
+            handler = self._operations.get(operation)
+            if handler is None:
+                raise ValueError(f"Невідома операція: '{operation}'")
+            return True, handler(*args)
+        except (ValueError, KeyError, TypeError) as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Внутрішня помилка складу: {type(e).__name__}: {e}"
+
+    def add_supplier(self, data: Dict[str, Any]) -> None:
+        self.warehouse.add_supplier(Supplier(data['name'], data['email'], data['phone'], data['address']))
+
+    def add_product(self, data: Dict[str, Any], timestamp: float) -> None:
+        product = Product(data['name'], data['quantity'], data['price'],
+                          self._supplier(data['supplier']), description=data['description'])
+        self.warehouse.add_product(product, datetime.fromtimestamp(timestamp))
+
+    def remove_product(self, product_name: str, quantity: int, timestamp: float) -> None:
+        self.warehouse.remove_product(product_name, quantity, datetime.fromtimestamp(timestamp))
+
+    def update_product_info(self, product_name: str, new_quantity: Optional[int], new_price: Optional[float]) -> None:
+        self.warehouse.update_product_info(product_name, new_quantity, new_price)
+
+    def get_product(self, product_name: str) -> Optional[Dict[str, Any]]:
+        product = self.warehouse.products.get(product_name)
+        return encode_product(product) if product is not None else None
+
+    def get_all_products(self) -> List[Dict[str, Any]]:
+        return [encode_product(product) for product in self.warehouse.get_all_products()]
+
+    def total_stock_value(self) -> float:
+        return self.warehouse.analytics.total_stock_value()
+
+    def prepare_transfer_out(self, transfer_id: int, product_name: str, quantity: int) -> Dict[str, Any]:
+        self._expire_prepared()
+        hold = self.warehouse.reserve_product(product_name, quantity, TRANSFER_HOLD_TTL)
+        self._prepared[transfer_id] = ('out', hold, quantity, self.clock() + TRANSFER_HOLD_TTL)
+        return encode_product(self.warehouse.products[product_name])
+
+    def prepare_transfer_in(self, transfer_id: int, data: Dict[str, Any], quantity: int) -> None:
+        self._expire_prepared()
+        self._supplier(data['supplier'])
+        self._prepared[transfer_id] = ('in', data, quantity, self.clock() + TRANSFER_HOLD_TTL)
+
+    def commit_transfer(self, transfer_id: int, timestamp: float,
+                        lots: Optional[List[LotLayer]] = None) -> Optional[List[LotLayer]]:
+        prepared = self._prepared.get(transfer_id)
+        if prepared is None:
+            raise ValueError(f"Переміщення {transfer_id} не підготовлене або термін його дії минув")
+        direction, target, quantity, _ = prepared
+        date = datetime.fromtimestamp(timestamp)
+        if direction == 'out':
+            self._release(target)
+            lots = self.warehouse.transfer_out(target.product_name, quantity, date)
+        else:
+            product = Product._restore(target['name'], quantity, target['price'], self._supplier(target['supplier']),
+                                       target['arrival_date'], target['description'])
+            self.warehouse.transfer_in(product, date, lots)
+            lots = None
+        del self._prepared[transfer_id]
+        return lots
+
+    def abort_transfer(self, transfer_id: int) -> None:
+        prepared = self._prepared.pop(transfer_id, None)
+        if prepared is not None and prepared[0] == 'out':
+            self._release(prepared[1])
+
+    def prepared_transfers(self) -> List[int]:
+        self._expire_prepared()
+        return sorted(self._prepared)
+
+    def _release(self, hold: Any) -> None:
+        try:
+            self.warehouse.release_reservation(hold.hold_id)
+        except ValueError:
+            pass
+
+    def _expire_prepared(self) -> None:
+        now = self.clock()
+        for transfer_id in [transfer_id for transfer_id, prepared in self._prepared.items() if prepared[3] <= now]:
+            self.abort_transfer(transfer_id)
+
+    def _supplier(self, data: Any) -> Supplier:
+        name = data['name'] if isinstance(data, dict) else data
+        supplier = self.warehouse.suppliers.get(name)
+        if supplier is None:
+            raise ValueError(f"Постачальник '{name}' не зареєстрований")
+        return supplier
+
+
+def run_site(connection, name: str, directory: Optional[str]) -> None:
+    SiteWorker(name, directory).serve(connection)
+
+
+class WarehouseCoordinator:
+
+    def __init__(self, site_names: Sequence[str], data_dir: Optional[str] = None):
+        if not site_names:
+            raise ValueError("Потрібен хоча б один склад")
+        self.site_names = list(site_names)
+        self.transfers: Dict[int, TransferRecord] = {}
+        self._connections = []
+        self._processes = []
+        self._locks = [threading.Lock() for _ in self.site_names]
+        self._broken = [False for _ in self.site_names]
+        self._decision_lock = threading.Lock()
+        self._decision_log = None
+
+        last_transfer_id = 0
+        if data_dir:
+            os.makedirs(data_dir, exist_ok=True)
+            log_path = os.path.join(data_dir, TRANSFER_LOG_FILE)
+            last_transfer_id = self._load_decisions(log_path)
+            self._decision_log = open(log_path, 'a', encoding='utf-8')
+        self._transfer_ids = count(last_transfer_id + 1)
+
+        for i, name in enumerate(self.site_names):
+            directory = os.path.join(data_dir, f"site-{i}") if data_dir else None
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=run_site, args=(child, name, directory), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    def close(self) -> None:
+        with self._decision_lock:
+            if self._decision_log is not None:
+                self._decision_log.close()
+                self._decision_log = None
+        for site in range(len(self.site_names)):
+            with self._locks[site]:
+                if self._broken[site]:
+                    continue
+                try:
+                    self._connections[site].send(('close', ()))
+                    self._connections[site].recv()
+                except (EOFError, OSError):
+                    pass
+                self._connections[site].close()
+        for process in self._processes:
+            process.join()
+
+    def site_for(self, product_name: str) -> int:
+        return site_for(product_name, len(self.site_names))
+
+    def site_index(self, site: Any) -> int:
+        if isinstance(site, int) and 0 <= site < len(self.site_names):
+            return site
+        if site in self.site_names:
+            return self.site_names.index(site)
+        raise ValueError(f"Склад '{site}' не знайдено")
+
+    def add_supplier(self, supplier: Supplier) -> None:
+        errors = [error for ok, error in self._broadcast('add_supplier', encode_supplier(supplier)) if not ok]
+        if errors:
+            raise ValueError(errors[0])
+
+    def add_product(self, product: Product, site: Any = None, date: Optional[datetime] = None) -> None:
+        data = {
+            'name': product.name,
+            'quantity': product.quantity,
+            'price': product.price,
+            'supplier': product.supplier.name,
+            'description': product.description,
+        }
+        self._call(self._route(product.name, site), 'add_product', data, self._timestamp(date))
+
+    def remove_product(self, product_name: str, quantity: int, site: Any = None,
+                       date: Optional[datetime] = None) -> None:
+        self._call(self._route(product_name, site), 'remove_product', product_name, quantity, self._timestamp(date))
+
+    def update_product_info(
+        self,
+        product_name: str,
+        new_quantity: Optional[int] = None,
+        new_price: Optional[float] = None,
+        site: Any = None,
+    ) -> None:
+        self._call(self._route(product_name, site), 'update_product_info', product_name, new_quantity, new_price)
+
+    def transfer(self, product_name: str, quantity: int, source: Any, destination: Any,
+                 date: Optional[datetime] = None) -> None:
+        source, destination = self.site_index(source), self.site_index(destination)
+        if source == destination:
+            raise ValueError("Склад відправлення і склад призначення повинні відрізнятися")
+
+        transfer_id = next(self._transfer_ids)
+        prepared = []
+        try:
+            data = self._call(source, 'prepare_transfer_out', transfer_id, product_name, quantity)
+            prepared.append(source)
+            self._call(destination, 'prepare_transfer_in', transfer_id, data, quantity)
+            prepared.append(destination)
+        except Exception:
+            self._abort(transfer_id, prepared)
+            raise
+
+        record = TransferRecord(transfer_id, product_name, quantity, source, destination,
+                                self._timestamp(date), TRANSFER_COMMITTING)
+        self._log_decision(record)
+
+        try:
+            lots = self._call(source, 'commit_transfer', transfer_id, record.timestamp)
+        except ValueError:
+            self._abort(transfer_id, (source, destination))
+            self._log_decision(record._replace(state=TRANSFER_ABORTED))
+            raise
+        except Exception:
+            self._abort(transfer_id, (destination,))
+            self._log_decision(record._replace(state=TRANSFER_IN_DOUBT))
+            raise
+
+        error: Optional[Exception] = None
+        for _ in range(TRANSFER_COMMIT_RETRIES):
+            try:
+                self._call(destination, 'commit_transfer', transfer_id, record.timestamp, lots)
+                self._log_decision(record._replace(state=TRANSFER_DONE))
+                return
+            except ValueError as e:
+                error = e
+            except Exception:
+                self._log_decision(record._replace(state=TRANSFER_IN_DOUBT))
+                raise
+
+        self._abort(transfer_id, (destination,))
+        try:
+            self._return_stock(source, data, quantity, record.timestamp, lots)
+        except Exception:
+            self._log_decision(record._replace(state=TRANSFER_IN_DOUBT))
+            raise ValueError(f"Переміщення {transfer_id} не зафіксовано на складі призначення, "
+                             f"а товар не вдалося повернути: {error}")
+        self._log_decision(record._replace(state=TRANSFER_COMPENSATED))
+        raise ValueError(f"Переміщення {transfer_id} скасовано, товар повернуто на склад відправлення: {error}")
+
+    def in_doubt_transfers(self) -> List[TransferRecord]:
+        with self._decision_lock:
+            return [record for record in self.transfers.values() if record.state not in RESOLVED_STATES]
+
+    def resolve_transfer(self, transfer_id: int, state: str) -> None:
+        with self._decision_lock:
+            record = self.transfers.get(transfer_id)
+        if record is None:
+            raise ValueError(f"Незавершене переміщення {transfer_id} не знайдено")
+        if state not in RESOLVED_STATES:
+            raise ValueError(f"Неправильний стан переміщення. Доступні: {', '.join(RESOLVED_STATES)}")
+        self._log_decision(record._replace(state=state))
+
+    def prepared_transfers(self) -> Dict[str, List[int]]:
+        return {name: transfer_ids
+                for name, (ok, transfer_ids) in zip(self.site_names, self._broadcast('prepared_transfers')) if ok}
+
+    def stock_by_site(self, product_name: str) -> Dict[str, int]:
+        stock = {}
+        for name, (ok, data) in zip(self.site_names, self._broadcast('get_product', product_name)):
+            if ok and data is not None:
+                stock[name] = data['quantity']
+        return stock
+
+    def total_quantity(self, product_name: str) -> int:
+        return sum(self.stock_by_site(product_name).values())
+
+    def total_stock_value(self) -> float:
+        return sum(value for ok, value in self._broadcast('total_stock_value') if ok)
+
+    def get_site_products(self, site: Any) -> List[Product]:
+        return [decode_product(data) for data in self._call(self.site_index(site), 'get_all_products')]
+
+    def get_all_products(self) -> Dict[str, List[Product]]:
+        return {
+            name: [decode_product(data) for data in products]
+            for name, (ok, products) in zip(self.site_names, self._broadcast('get_all_products')) if ok
+        }
+
+    def _abort(self, transfer_id: int, sites: Sequence[int]) -> None:
+        for site in sites:
+            try:
+                self._call(site, 'abort_transfer', transfer_id)
+            except Exception:
+                pass
+
+    def _return_stock(self, site: int, data: Dict[str, Any], quantity: int, timestamp: float,
+                      lots: List[LotLayer]) -> None:
+        transfer_id = next(self._transfer_ids)
+        self._call(site, 'prepare_transfer_in', transfer_id, data, quantity)
+        try:
+            self._call(site, 'commit_transfer', transfer_id, timestamp, lots)
+        except Exception:
+            self._abort(transfer_id, (site,))
+            raise
+
+    def _log_decision(self, record: TransferRecord) -> None:
+        with self._decision_lock:
+            if record.state in RESOLVED_STATES:
+                self.transfers.pop(record.transfer_id, None)
+            else:
+                self.transfers[record.transfer_id] = record
+            if self._decision_log is not None:
+                self._decision_log.write(json.dumps(record._asdict(), ensure_ascii=False) + '\n')
+                self._decision_log.flush()
+                os.fsync(self._decision_log.fileno())
+
+    def _load_decisions(self, log_path: str) -> int:
+        last_transfer_id = 0
+        if not os.path.exists(log_path):
+            return last_transfer_id
+        with open(log_path, 'rb') as f:
+            for line in f:
+                try:
+                    record = TransferRecord(**json.loads(line))
+                except (ValueError, TypeError):
+                    break
+                last_transfer_id = max(last_transfer_id, record.transfer_id)
+                if record.state in RESOLVED_STATES:
+                    self.transfers.pop(record.transfer_id, None)
+                else:
+                    self.transfers[record.transfer_id] = record._replace(state=TRANSFER_IN_DOUBT)
+
+        temporary_path = log_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            for record in self.transfers.values():
+                f.write(json.dumps(record._asdict(), ensure_ascii=False))
+                f.write('\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary_path, log_path)
+        return last_transfer_id
+
+    def _route(self, product_name: str, site: Any) -> int:
+        return self.site_for(product_name) if site is None else self.site_index(site)
+
+    @staticmethod
+    def _timestamp(date: Optional[datetime]) -> float:
+        return (date or datetime.now()).timestamp()
+
+    def _call(self, site: int, operation: str, *args: Any) -> Any:
+        with self._locks[site]:
+            if self._broken[site]:
+                raise ValueError(self._unavailable(site))
+            try:
+                self._connections[site].send((operation, args))
+                ok, payload = self._connections[site].recv()
+            except BaseException:
+                self._break(site)
+                raise
+        if not ok:
+            raise ValueError(payload)
+        return payload
+
+    def _broadcast(self, operation: str, *args: Any) -> List[Response]:
+        locked = []
+        try:
+            sent = []
+            for site, lock in enumerate(self._locks):
+                lock.acquire()
+                locked.append(lock)
+                sent.append(self._send(site, operation, args))
+            return [self._receive(site) if ok else (False, self._unavailable(site))
+                    for site, ok in enumerate(sent)]
+        finally:
+            for lock in reversed(locked):
+                lock.release()
+
+    def _send(self, site: int, operation: str, args: Tuple[Any, ...]) -> bool:
+        if self._broken[site]:
+            return False
+        try:
+            self._connections[site].send((operation, args))
+            return True
+        except Exception:
+            self._break(site)
+            return False
+
+    def _receive(self, site: int) -> Response:
+        try:
+            return self._connections[site].recv()
+        except Exception:
+            self._break(site)
+            return False, self._unavailable(site)
+
+    def _break(self, site: int) -> None:
+        self._broken[site] = True
+        self._connections[site].close()
+
+    def _unavailable(self, site: int) -> str:
+        return f"Склад '{self.site_names[site]}' недоступний: зв'язок з ним перервано"
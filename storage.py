@@ -0,0 +1,347 @@
+import json
+import mmap
+import os
+import struct
+import threading
+from array import array
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+from supplier import Supplier
+from product import Product
+from warehouse import Warehouse
+from bulk_import import PRODUCT_FIELDS, SUPPLIER_FIELDS
+from journal import Columns
+from pending import PendingWarehouse
+
+SNAPSHOT_MAGIC = b'WHSNAP01'
+SNAPSHOT_FILE = 'snapshot.bin'
+WAL_FILE = 'wal.log'
+
+_HEADER_LENGTH = struct.Struct('<Q')
+NAN = float('nan')
+JOURNAL_TYPECODES = ('I', 'q', 'B', 'd')
+JOURNAL_ROW_SIZE = sum(array(typecode).itemsize for typecode in JOURNAL_TYPECODES)
+
+
+class StorageEngine:
+
+    def __init__(
+        self,
+        directory: str,
+        sync_every: int = 64,
+        sync_interval: float = 1.0,
+        snapshot_every: int = 100000,
+    ):
+        self.directory = directory
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.snapshot_every = snapshot_every
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.wal_path = os.path.join(directory, WAL_FILE)
+        self.warehouse: Optional[Warehouse] = None
+        self._sequence = 0
+        self._snapshot_sequence = 0
+        self._pending = 0
+        self._wal = None
+        self._snapshot_file = None
+        self._snapshot_map: Optional[mmap.mmap] = None
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+        os.makedirs(directory, exist_ok=True)
+
+    def open(
+        self,
+        name: str,
+        journal_dir: Optional[str] = None,
+        warehouse_class: Type[Warehouse] = Warehouse,
+    ) -> Warehouse:
+        warehouse = warehouse_class(name, journal_dir=journal_dir)
+
+        if os.path.exists(self.snapshot_path):
+            self._load_snapshot(warehouse)
+
+        for sequence, event, data in self._read_wal():
+            if sequence > self._snapshot_sequence:
+                apply_event(warehouse, event, data)
+                self._sequence = sequence
+
+        self._wal = open(self.wal_path, 'a', encoding='utf-8')
+        self.warehouse = warehouse
+        warehouse.add_observer(self._on_event)
+        if self.sync_interval > 0:
+            self._stopped.clear()
+            self._flusher = threading.Thread(target=self._flush_periodically, name="wal-flusher", daemon=True)
+            self._flusher.start()
+        return warehouse
+
+    def open_in_background(
+        self,
+        name: str,
+        journal_dir: Optional[str] = None,
+        warehouse_class: Type[Warehouse] = Warehouse,
+    ) -> PendingWarehouse:
+        return PendingWarehouse(lambda: self.open(name, journal_dir, warehouse_class))
+
+    def sync(self) -> None:
+        with self._lock:
+            if self._wal is None:
+                return
+            self._wal.flush()
+            os.fsync(self._wal.fileno())
+            self._pending = 0
+
+    def snapshot(self) -> None:
+        with self._lock:
+            if self.warehouse is None:
+                raise ValueError("Сховище не відкрите")
+
+            self.sync()
+            temporary_path = self.snapshot_path + '.tmp'
+            with open(temporary_path, 'wb') as f:
+                write_snapshot(f, self.warehouse, self._sequence)
+                f.flush()
+                os.fsync(f.fileno())
+            self._release_snapshot()
+            os.replace(temporary_path, self.snapshot_path)
+            self._snapshot_sequence = self._sequence
+
+            self._wal.close()
+            self._wal = open(self.wal_path, 'w', encoding='utf-8')
+            self.sync()
+
+    def close(self) -> None:
+        if self._flusher is not None:
+            self._stopped.set()
+            self._flusher.join()
+            self._flusher = None
+        with self._lock:
+            if self._wal is None:
+                return
+            if self._sequence != self._snapshot_sequence:
+                self.snapshot()
+            self._wal.close()
+            self._release_snapshot()
+            self._wal = None
+            self.warehouse.remove_observer(self._on_event)
+            self.warehouse = None
+
+    def _on_event(self, event: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._sequence += 1
+            self._wal.write(json.dumps({'seq': self._sequence, 'event': event, 'data': data},
+                                       ensure_ascii=False))
+            self._wal.write('\n')
+            self._pending += 1
+
+            if self._pending >= self.sync_every:
+                self.sync()
+
+            if self._sequence - self._snapshot_sequence >= self.snapshot_every:
+                self.snapshot()
+
+    def _flush_periodically(self) -> None:
+        while not self._stopped.wait(self.sync_interval):
+            with self._lock:
+                if self._pending:
+                    self.sync()
+
+    def _read_wal(self) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        if not os.path.exists(self.wal_path):
+            return
+
+        valid_end = 0
+        with open(self.wal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                valid_end += len(line)
+                yield record['seq'], record['event'], record['data']
+
+        if os.path.getsize(self.wal_path) > valid_end:
+            with open(self.wal_path, 'r+b') as f:
+                f.truncate(valid_end)
+
+    def _load_snapshot(self, warehouse: Warehouse) -> None:
+        self._snapshot_file = open(self.snapshot_path, 'rb')
+        try:
+            self._snapshot_map = mmap.mmap(self._snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._snapshot_sequence = read_snapshot(self._snapshot_file, warehouse, self._snapshot_map)
+        except Exception:
+            self._release_snapshot()
+            raise
+        self._sequence = self._snapshot_sequence
+
+    def _release_snapshot(self) -> None:
+        if self._snapshot_map is not None:
+            self._snapshot_map.close()
+            self._snapshot_map = None
+        if self._snapshot_file is not None:
+            self._snapshot_file.close()
+            self._snapshot_file = None
+
+
+def apply_event(warehouse: Warehouse, event: str, data: Dict[str, Any]) -> None:
+    if event == 'add_supplier':
+        warehouse.add_supplier(Supplier(data['name'], data['email'], data['phone'], data['address']))
+    elif event == 'add_product':
+        expiry = data.get('expiry_date')
+        warehouse.add_product(_event_product(warehouse, data), datetime.fromtimestamp(data['date']),
+                              datetime.fromtimestamp(expiry) if expiry is not None else None)
+    elif event == 'transfer_in':
+        warehouse.transfer_in(_event_product(warehouse, data), datetime.fromtimestamp(data['date']), data.get('lots'))
+    elif event == 'transfer_out':
+        warehouse.transfer_out(data['name'], data['quantity'], datetime.fromtimestamp(data['date']))
+    elif event == 'remove_product':
+        warehouse.remove_product(data['name'], data['quantity'], datetime.fromtimestamp(data['date']))
+    elif event == 'ship_order':
+        warehouse.ship_order([tuple(line) for line in data['lines']], datetime.fromtimestamp(data['date']))
+    elif event == 'bulk_remove_products':
+        warehouse.bulk_remove_products([tuple(line) for line in data['lines']],
+                                       datetime.fromtimestamp(data['date']))
+    elif event == 'bulk_add_suppliers':
+        warehouse.bulk_add_suppliers([dict(zip(SUPPLIER_FIELDS, row)) for row in data['rows']])
+    elif event == 'bulk_add_products':
+        warehouse.bulk_add_products([dict(zip(PRODUCT_FIELDS, row)) for row in data['rows']],
+                                    date=datetime.fromtimestamp(data['date']))
+    elif event == 'update_supplier_info':
+        warehouse.update_supplier_info(data['name'], data['email'], data['phone'], data['address'])
+    elif event == 'update_product_info':
+        warehouse.update_product_info(data['name'], data['quantity'], data['price'])
+    else:
+        raise ValueError(f"Невідомий тип події журналу: '{event}'")
+
+
+def _event_product(warehouse: Warehouse, data: Dict[str, Any]) -> Product:
+    return Product(
+        data['name'],
+        data['quantity'],
+        data['price'],
+        warehouse.suppliers[data['supplier']],
+        datetime.fromtimestamp(data['arrival_date']),
+        data['description'],
+    )
+
+
+def write_snapshot(f, warehouse: Warehouse, sequence: int) -> None:
+    suppliers = list(warehouse.suppliers.values())
+    supplier_ids = {supplier.name: i for i, supplier in enumerate(suppliers)}
+    products = list(warehouse.products.values())
+    chunks = list(warehouse.transactions.chunks())
+    product_ids = {p.name: i for i, p in enumerate(products)}
+    lots = [(product_ids[name], lot) for name, product_lots in warehouse.lots.iter_lots()
+            if name in product_ids for lot in product_lots]
+
+    header = {
+        'name': warehouse.name,
+        'sequence': sequence,
+        'suppliers': [[s.name, s.email, s.phone, s.address] for s in suppliers],
+        'product_names': [p.name for p in products],
+        'product_descriptions': [p.description for p in products],
+        'journal_product_names': warehouse.transactions.product_names(),
+        'journal_chunks': [chunk.count for chunk in chunks],
+        'journal_bounds': [[chunk.min_timestamp, chunk.max_timestamp, chunk.ordered] for chunk in chunks],
+        'departed_products': warehouse.replenishment.departed_products(),
+        'lot_count': len(lots),
+        'cost_of_goods': warehouse.lots.cost_of_goods,
+        'written_off': warehouse.lots.written_off,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+
+    f.write(SNAPSHOT_MAGIC)
+    f.write(_HEADER_LENGTH.pack(len(header_bytes)))
+    f.write(header_bytes)
+
+    array('I', [supplier_ids[p.supplier.name] for p in products]).tofile(f)
+    array('q', [p.quantity for p in products]).tofile(f)
+    array('d', [p.price for p in products]).tofile(f)
+    array('d', [p.arrival_timestamp for p in products]).tofile(f)
+
+    for chunk in chunks:
+        for column in chunk.columns():
+            column.tofile(f)
+
+    array('I', [product_id for product_id, _ in lots]).tofile(f)
+    array('q', [lot.quantity for _, lot in lots]).tofile(f)
+    array('d', [lot.unit_cost for _, lot in lots]).tofile(f)
+    array('q', [lot.arrival_timestamp for _, lot in lots]).tofile(f)
+    array('d', [lot.expiry_timestamp if lot.expiry_timestamp is not None else NAN for _, lot in lots]).tofile(f)
+
+
+def read_snapshot(f, warehouse: Warehouse, mapping: Optional[mmap.mmap] = None) -> int:
+    if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+        raise ValueError("Невірний формат знімка складу")
+
+    (header_length,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+    header = json.loads(f.read(header_length).decode('utf-8'))
+
+    suppliers = [Supplier._restore(*fields) for fields in header['suppliers']]
+    names: List[str] = header['product_names']
+    descriptions: List[str] = header['product_descriptions']
+    count = len(names)
+
+    supplier_ids = _read_column(f, 'I', count)
+    quantities = _read_column(f, 'q', count)
+    prices = _read_column(f, 'd', count)
+    arrival_dates = _read_column(f, 'd', count)
+
+    restore = Product._restore
+    products = [
+        restore(name, quantity, price, suppliers[supplier_id], int(arrival), description)
+        for name, quantity, price, supplier_id, arrival, description
+        in zip(names, quantities, prices, supplier_ids, arrival_dates, descriptions)
+    ]
+    warehouse._restore_state(suppliers, products)
+    warehouse._restore_departed(header.get('departed_products', ()))
+
+    journal = warehouse.transactions
+    journal.restore_product_names(header['journal_product_names'])
+    bounds = header.get('journal_bounds') if mapping is not None else None
+    position = f.tell()
+    for number, chunk_count in enumerate(header['journal_chunks']):
+        if bounds is not None and journal.restore_chunk(chunk_count, *bounds[number],
+                                                        _chunk_loader(mapping, position, chunk_count)):
+            position += chunk_count * JOURNAL_ROW_SIZE
+            f.seek(position)
+            continue
+        journal.extend_columns(*(_read_column(f, typecode, chunk_count) for typecode in JOURNAL_TYPECODES))
+        position = f.tell()
+
+    lot_count = header.get('lot_count', 0)
+    if lot_count:
+        lot_products = _read_column(f, 'I', lot_count)
+        lot_columns = zip(_read_column(f, 'q', lot_count), _read_column(f, 'd', lot_count),
+                          _read_column(f, 'q', lot_count), _read_column(f, 'd', lot_count))
+        restored: Dict[int, List[Tuple[int, float, int, Optional[int]]]] = {}
+        for product_id, (quantity, unit_cost, arrival, expiry) in zip(lot_products, lot_columns):
+            restored.setdefault(product_id, []).append(
+                (quantity, unit_cost, arrival, int(expiry) if expiry == expiry else None))
+        for product_id, product_lots in restored.items():
+            warehouse.lots.restore(products[product_id], product_lots)
+    warehouse.lots.cost_of_goods.update(header.get('cost_of_goods', {}))
+    warehouse.lots.written_off.update(header.get('written_off', {}))
+
+    return header['sequence']
+
+
+def _chunk_loader(mapping: mmap.mmap, offset: int, count: int) -> Callable[[], Columns]:
+    def load() -> Columns:
+        columns = tuple(array(typecode) for typecode in JOURNAL_TYPECODES)
+        position = offset
+        for column in columns:
+            size = count * column.itemsize
+            column.frombytes(mapping[position:position + size])
+            position += size
+        return columns
+    return load
+
+
+def _read_column(f, typecode: str, count: int) -> array:
+    column = array(typecode)
+    column.fromfile(f, count)
+    return column
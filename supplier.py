@@ -1,5 +1,12 @@
+NAME_ERROR = "Назва компанії повинна містити щонайменше 2 символи"
+EMAIL_ERROR = "Невірний формат електронної адреси"
+PHONE_ERROR = "Невірний формат номера телефону"
+
+
 class Supplier:
 
+    __slots__ = ('name', 'email', 'phone', 'address')
+
     def __init__(self, name: str, email: str, phone: str, address: str):
         self._validate_supplier_data(name, email, phone)
         self.name = name
@@ -7,15 +14,24 @@ class Supplier:
         self.phone = phone
         self.address = address
 
+    @classmethod
+    def _restore(cls, name: str, email: str, phone: str, address: str) -> "Supplier":
+        supplier = cls.__new__(cls)
+        supplier.name = name
+        supplier.email = email
+        supplier.phone = phone
+        supplier.address = address
+        return supplier
+
     def _validate_supplier_data(self, name: str, email: str, phone: str) -> None:
         if not name or len(name) < 2:
-            raise ValueError("Назва компанії повинна містити щонайменше 2 символи")
+            raise ValueError(NAME_ERROR)
 
         if not self._validate_email(email):
-            raise ValueError("Невірний формат електронної адреси")
+            raise ValueError(EMAIL_ERROR)
 
         if not self._validate_phone(phone):
-            raise ValueError("Невірний формат номера телефону")
+            raise ValueError(PHONE_ERROR)
 
     @staticmethod
     def _validate_email(email: str) -> bool:
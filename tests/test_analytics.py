@@ -0,0 +1,130 @@
+import random
+import unittest
+from collections import defaultdict
+from datetime import datetime, timedelta
+from enums import TransactionType
+from journal import TRANSACTION_TYPES
+from product import Product
+from supplier import Supplier
+from warehouse import Warehouse
+
+SUPPLIERS = [Supplier(f"ТОВ Постачальник {i}", f"supply{i}@example.com", "+380991234567", "м. Київ")
+             for i in range(3)]
+START = datetime(2024, 1, 30, 22)
+
+
+def cents(product):
+    return round(product.quantity * product.price * 100)
+
+
+def bucket(moment, granularity):
+    hour = moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == 'hour':
+        return hour
+    day = hour.replace(hour=0)
+    return day if granularity == 'day' else day.replace(day=1)
+
+
+class AnalyticsBruteForceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(7)
+        self.warehouse = Warehouse("Склад")
+        for supplier in SUPPLIERS:
+            self.warehouse.add_supplier(supplier)
+        self.moment = START
+
+    def mutate(self, steps):
+        rng, warehouse = self.rng, self.warehouse
+        for _ in range(steps):
+            self.moment += timedelta(minutes=rng.randint(1, 300))
+            names = list(warehouse.products)
+            roll = rng.random()
+            if roll < 0.4 or not names:
+                name = f"Товар {rng.randint(0, 30):02d}"
+                price = rng.randint(1, 10000) / 10
+                warehouse.add_product(Product(name, rng.randint(1, 20), price, rng.choice(SUPPLIERS)), self.moment)
+            elif roll < 0.7:
+                name = rng.choice(names)
+                if warehouse.products[name].quantity:
+                    quantity = rng.randint(1, warehouse.products[name].quantity)
+                    warehouse.remove_product(name, quantity, self.moment)
+            elif roll < 0.85:
+                warehouse.update_product_info(rng.choice(names), new_price=rng.randint(1, 10000) / 10)
+            else:
+                warehouse.update_product_info(rng.choice(names), new_quantity=rng.randint(0, 40))
+
+    def assert_stock_matches(self):
+        products = self.warehouse.products.values()
+        self.assertEqual(self.warehouse.stock_value(), sum(cents(product) for product in products) / 100)
+        by_supplier = defaultdict(int)
+        for product in products:
+            by_supplier[product.supplier.name] += cents(product)
+        values = {name: value for name, value in self.warehouse.supplier_stock_values().items() if value}
+        self.assertEqual(values, {name: total / 100 for name, total in by_supplier.items() if total})
+        self.assertEqual(self.warehouse.analytics.total_quantity(), sum(product.quantity for product in products))
+
+    def assert_history_matches(self):
+        analytics = self.warehouse.analytics
+        for granularity in ('hour', 'day', 'month'):
+            expected = defaultdict(lambda: dict.fromkeys(TRANSACTION_TYPES, 0))
+            for transaction in self.warehouse.transactions:
+                expected[bucket(transaction.date, granularity)][transaction.transaction_type] += transaction.quantity
+            self.assertEqual(analytics.rollup(granularity), sorted(expected.items()))
+
+        now = START + timedelta(days=9)
+        first_day = now.date() - timedelta(days=6)
+        shipped = defaultdict(int)
+        for transaction in self.warehouse.transactions:
+            if transaction.transaction_type is TransactionType.SHIPMENT and transaction.date.date() >= first_day:
+                shipped[transaction.product.name] += transaction.quantity
+        self.assertEqual(analytics.shipped_units(days=7, now=now), sum(shipped.values()))
+        for name in list(shipped)[:5]:
+            self.assertEqual(analytics.shipped_units(name, days=7, now=now), shipped[name])
+
+    def test_aggregates_match_brute_force(self):
+        for _ in range(10):
+            self.mutate(40)
+            self.assert_stock_matches()
+            self.assert_history_matches()
+
+    def test_restored_aggregates_match_brute_force(self):
+        self.mutate(300)
+        restored = Warehouse("Склад")
+        restored._restore_state(self.warehouse.suppliers.values(), list(self.warehouse.products.values()))
+        self.assertEqual(restored.stock_value(), self.warehouse.stock_value())
+        self.assertEqual(restored.supplier_stock_values(), {name: value for name, value
+                                                           in self.warehouse.supplier_stock_values().items() if value})
+
+    def test_price_churn_does_not_drift(self):
+        warehouse = self.warehouse
+        warehouse.add_product(Product("Гвинт", 3, 0.1, SUPPLIERS[0]))
+        for i in range(10000):
+            warehouse.update_product_info("Гвинт", new_price=0.1 + (i % 7) / 10)
+        warehouse.update_product_info("Гвинт", new_price=0.1)
+        self.assertEqual(warehouse.stock_value(), 0.3)
+
+
+class TurnoverTest(unittest.TestCase):
+
+    def test_turnover_is_shipments_over_on_hand(self):
+        warehouse = Warehouse("Склад")
+        warehouse.add_supplier(SUPPLIERS[0])
+        now = datetime.now()
+        warehouse.add_product(Product("Ноутбук", 30, 100.0, SUPPLIERS[0]), now - timedelta(days=60))
+        warehouse.add_product(Product("Мишка", 10, 10.0, SUPPLIERS[0]), now - timedelta(days=60))
+        warehouse.remove_product("Ноутбук", 5, now - timedelta(days=40))
+        warehouse.remove_product("Ноутбук", 5, now - timedelta(days=3))
+        warehouse.remove_product("Мишка", 10, now)
+
+        self.assertEqual(warehouse.inventory_turnover("Ноутбук"), 5 / 20)
+        self.assertEqual(warehouse.inventory_turnover("Ноутбук", days=60), 10 / 20)
+        self.assertEqual(warehouse.inventory_turnover(), 15 / 20)
+        self.assertEqual(warehouse.inventory_turnover("Мишка"), float('inf'))
+        self.assertEqual(warehouse.inventory_turnover("Клавіатура"), 0.0)
+        with self.assertRaises(ValueError):
+            warehouse.inventory_turnover(days=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
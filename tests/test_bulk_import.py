@@ -0,0 +1,141 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from bulk_import import MAX_QUANTITY, QUANTITY_LIMIT_ERROR
+from product import PRICE_ERROR, QUANTITY_ERROR
+from supplier import EMAIL_ERROR, Supplier
+from warehouse import SHIP_QUANTITY_ERROR, Warehouse
+
+DATE = datetime(2024, 5, 1, 12, 0)
+
+
+def build_warehouse():
+    warehouse = Warehouse("Склад")
+    warehouse.add_supplier(Supplier("ТОВ Постачання", "supply@example.com", "+380991234567", "м. Київ"))
+    return warehouse
+
+
+def row(name, quantity=10, price=5.0, supplier="ТОВ Постачання"):
+    return {'name': name, 'quantity': quantity, 'price': price, 'supplier': supplier}
+
+
+class BulkAddProductsTest(unittest.TestCase):
+
+    def test_rejected_rows_are_reported_and_valid_rows_applied(self):
+        warehouse = build_warehouse()
+        report = warehouse.bulk_add_products([
+            row("Ноутбук"),
+            row("Мишка", quantity=-1),
+            row("Монітор", price=0),
+            row("Клавіатура", supplier="Невідомий"),
+            row("Кабель", quantity="багато"),
+            row("Сервер", quantity=MAX_QUANTITY + 1),
+            row("Принтер", quantity=3),
+        ], batch_size=3, date=DATE)
+
+        self.assertEqual(report.accepted, 2)
+        self.assertEqual(sorted((r.line, r.name, r.reason) for r in report.rejected), [
+            (2, "Мишка", QUANTITY_ERROR),
+            (3, "Монітор", PRICE_ERROR),
+            (4, "Клавіатура", "Постачальник 'Невідомий' не зареєстрований"),
+            (5, "Кабель", "Кількість і ціна повинні бути числами"),
+            (6, "Сервер", QUANTITY_LIMIT_ERROR),
+        ])
+        self.assertEqual(sorted(warehouse.products), ["Ноутбук", "Принтер"])
+        self.assertEqual([(t.product.name, t.quantity) for t in warehouse.transactions],
+                         [("Ноутбук", 10), ("Принтер", 3)])
+
+    def test_failed_batch_leaves_no_partial_state(self):
+        warehouse = build_warehouse()
+        product_id = warehouse.transactions.product_id
+
+        def failing_product_id(name):
+            if name == "Зламаний":
+                raise RuntimeError("збій журналу")
+            return product_id(name)
+
+        warehouse.transactions.product_id = failing_product_id
+        rows = [row("Ноутбук"), row("Мишка"), row("Монітор"), row("Зламаний")]
+        with self.assertRaises(RuntimeError):
+            warehouse.bulk_add_products(rows, batch_size=2, date=DATE)
+
+        self.assertEqual(sorted(warehouse.products), ["Мишка", "Ноутбук"])
+        self.assertEqual(len(warehouse.transactions), 2)
+        self.assertEqual([p.name for p in warehouse.get_products_sorted('name')], ["Мишка", "Ноутбук"])
+
+    def test_malformed_line_stops_import_after_complete_batches(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "products.jsonl")
+            with open(path, 'w', encoding='utf-8') as f:
+                for name in ("Ноутбук", "Мишка", "Монітор"):
+                    f.write(json.dumps(row(name), ensure_ascii=False) + "\n")
+                f.write("{зіпсований рядок\n")
+
+            warehouse = build_warehouse()
+            with self.assertRaises(ValueError):
+                warehouse.bulk_add_products(path, batch_size=2, date=DATE)
+
+        self.assertEqual(sorted(warehouse.products), ["Мишка", "Ноутбук"])
+        self.assertEqual(len(warehouse.transactions), 2)
+
+    def test_supplier_rows_report_reasons(self):
+        warehouse = build_warehouse()
+        report = warehouse.bulk_add_suppliers([
+            {'name': "ТОВ Нове", 'email': "new@example.com", 'phone': "+380501234567", 'address': "Львів"},
+            {'name': "ТОВ Погане", 'email': "not-an-email", 'phone': "+380501234567", 'address': "Львів"},
+            {'name': "ТОВ Постачання", 'email': "x@example.com", 'phone': "+380501234567", 'address': "Київ"},
+        ])
+
+        self.assertEqual(report.accepted, 1)
+        self.assertEqual([(r.line, r.reason) for r in report.rejected], [
+            (2, EMAIL_ERROR),
+            (3, "Постачальник з назвою 'ТОВ Постачання' вже існує"),
+        ])
+        self.assertIn("ТОВ Нове", warehouse.suppliers)
+
+
+class BulkRemoveProductsTest(unittest.TestCase):
+
+    def test_each_line_gets_its_own_error(self):
+        warehouse = build_warehouse()
+        warehouse.bulk_add_products([row("Ноутбук", quantity=5)], date=DATE)
+        events = []
+        warehouse.add_observer(lambda event, data: events.append((event, data)))
+
+        errors = warehouse.bulk_remove_products([
+            ("Ноутбук", 2),
+            ("Ноутбук", 0),
+            ("Ноутбук", -3),
+            ("Мишка", 1),
+            ("Ноутбук", 10),
+            ("Ноутбук", 3),
+        ], date=DATE)
+
+        self.assertEqual(errors, [
+            None,
+            SHIP_QUANTITY_ERROR,
+            SHIP_QUANTITY_ERROR,
+            "Товар 'Мишка' не знайдено на складі",
+            "Недостатня кількість товару на складі. Доступно: 3",
+            None,
+        ])
+        self.assertNotIn("Ноутбук", warehouse.products)
+        self.assertEqual(events, [('bulk_remove_products', {
+            'lines': [["Ноутбук", 2], ["Ноутбук", 3]],
+            'date': DATE.timestamp(),
+        })])
+
+    def test_single_removal_rejects_non_positive_quantity(self):
+        warehouse = build_warehouse()
+        warehouse.bulk_add_products([row("Ноутбук", quantity=5)], date=DATE)
+
+        for quantity in (0, -1):
+            with self.assertRaises(ValueError):
+                warehouse.remove_product("Ноутбук", quantity)
+        self.assertEqual(warehouse.products["Ноутбук"].quantity, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from menu import PAGE_SIZE, product_rows, supplier_product_rows, supplier_rows
+from product import Product
+from supplier import Supplier
+from warehouse import Warehouse
+
+SUPPLIERS = [Supplier(f"ТОВ Постачальник {i}", f"supply{i}@example.com", "+380991234567", "м. Київ")
+             for i in range(2)]
+
+
+class MenuCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.warehouse = Warehouse("Склад")
+        for supplier in SUPPLIERS:
+            self.warehouse.add_supplier(supplier)
+        self.warehouse.bulk_add_products(
+            {'name': f"Товар {i:04d}", 'quantity': i % 9 + 1, 'price': float(i % 13 + 1),
+             'supplier': SUPPLIERS[i % 2].name, 'description': ""}
+            for i in range(2 * PAGE_SIZE + 17))
+        self.reads = 0
+        iter_products = self.warehouse.iter_products
+
+        def counted(*args, **kwargs):
+            self.reads += 1
+            return iter_products(*args, **kwargs)
+
+        self.warehouse.iter_products = counted
+
+    def rows(self, sort_key=None):
+        return list(product_rows(self.warehouse, sort_key))
+
+    def expected(self, sort_key=None):
+        key = (lambda p: p.name) if sort_key is None else (lambda p: (getattr(p, sort_key), p.name))
+        return [f"{p.name:<30} {p.quantity:<10} {p.price:<15.2f} {p.supplier.name:<20}"
+                for p in sorted(self.warehouse.products.values(), key=key)]
+
+    def test_hit_does_not_walk_the_catalog(self):
+        for sort_key in (None, 'price'):
+            self.assertEqual(self.rows(sort_key), self.expected(sort_key))
+            reads = self.reads
+            self.assertEqual(self.rows(sort_key), self.expected(sort_key))
+            self.assertEqual(self.reads, reads)
+
+    def test_price_and_quantity_changes_invalidate_pages(self):
+        self.rows('quantity')
+        self.warehouse.update_product_info("Товар 0300", new_price=999.5)
+        self.assertEqual(self.rows('quantity'), self.expected('quantity'))
+        self.warehouse.update_product_info("Товар 0001", new_quantity=100)
+        self.assertEqual(self.rows('quantity'), self.expected('quantity'))
+        self.warehouse.remove_product("Товар 0002", self.warehouse.products["Товар 0002"].quantity)
+        self.assertEqual(self.rows('quantity'), self.expected('quantity'))
+
+    def test_supplier_changes_invalidate_supplier_views(self):
+        name = SUPPLIERS[1].name
+        before = supplier_product_rows(self.warehouse, name)
+        self.assertEqual(len(before), len(self.warehouse.get_supplier_products(name)))
+        self.assertIs(supplier_product_rows(self.warehouse, name), before)
+
+        self.warehouse.add_product(Product("Новий товар", 3, 10.0, SUPPLIERS[1]))
+        self.assertIn("Новий товар", [p.name for p in self.warehouse.get_supplier_products(name)])
+        self.assertEqual(len(supplier_product_rows(self.warehouse, name)), len(before) + 1)
+
+        self.warehouse.update_product_info("Новий товар", new_price=12.0)
+        self.assertIn(f"{'Новий товар':<30} {3:<10} {12.0:<15.2f}", supplier_product_rows(self.warehouse, name))
+
+        self.assertIn("+380991234567", supplier_rows(self.warehouse)[0])
+        self.warehouse.update_supplier_info(name, phone="+380501112233")
+        self.assertTrue(any("+380501112233" in row for row in supplier_rows(self.warehouse)))
+
+        self.warehouse.remove_product("Новий товар", 3)
+        self.assertNotIn("Новий товар", [p.name for p in self.warehouse.get_supplier_products(name)])
+        self.assertEqual(len(supplier_product_rows(self.warehouse, name)), len(before))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+import unittest
+from changefeed import ChangeFeed
+from supplier import Supplier
+from warehouse import Warehouse
+
+
+def publish(feed, count, start=0):
+    for i in range(start, start + count):
+        feed.publish('remove_product', {'i': i})
+
+
+class ChangeFeedOverflowTest(unittest.TestCase):
+
+    def test_lag_and_overflow(self):
+        feed = ChangeFeed(capacity=4)
+        subscription = feed.subscribe(0)
+        publish(feed, 3)
+        self.assertEqual(subscription.lag, 3)
+
+        publish(feed, 7, start=3)
+        self.assertEqual(subscription.lag, 10)
+        self.assertEqual((feed.oldest_offset, feed.next_offset, len(feed), feed.evicted), (6, 10, 4, 6))
+        with self.assertRaises(ValueError) as raised:
+            subscription.poll()
+        self.assertIn("6", str(raised.exception))
+
+        subscription.seek(feed.oldest_offset)
+        self.assertEqual([event.data['i'] for event in subscription.poll()], [6, 7, 8, 9])
+        self.assertEqual(subscription.lag, 0)
+        self.assertEqual(subscription.poll(), [])
+
+    def test_read_bounds(self):
+        feed = ChangeFeed(capacity=4, start_offset=100)
+        publish(feed, 2)
+        self.assertEqual([event.offset for event in feed.read(100, limit=1)], [100])
+        self.assertEqual(feed.read(102), [])
+        with self.assertRaises(ValueError):
+            feed.read(103)
+        with self.assertRaises(ValueError):
+            feed.read(99)
+
+    def test_warehouse_events_are_published(self):
+        warehouse = Warehouse("Склад")
+        feed = ChangeFeed().attach(warehouse)
+        subscription = feed.subscribe()
+        warehouse.add_supplier(Supplier("ТОВ Постачання", "supply@example.com", "+380991234567", "м. Київ"))
+        feed.detach(warehouse)
+        warehouse.add_supplier(Supplier("ТОВ Інше", "other@example.com", "+380991234568", "м. Київ"))
+
+        self.assertEqual([(event.event, event.data['name']) for event in subscription.poll()],
+                         [('add_supplier', "ТОВ Постачання")])
+
+
+class ChangeFeedBackpressureTest(unittest.TestCase):
+
+    def start_publisher(self, feed, count):
+        thread = threading.Thread(target=publish, args=(feed, count))
+        thread.start()
+        return thread
+
+    def wait_for(self, condition, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+
+    def test_publisher_waits_for_slowest_subscriber(self):
+        feed = ChangeFeed(capacity=2, block=True)
+        fast, slow = feed.subscribe(0), feed.subscribe(0)
+        publisher = self.start_publisher(feed, 6)
+        self.wait_for(lambda: feed.next_offset == 2)
+
+        fast.poll(timeout=1)
+        time.sleep(0.02)
+        self.assertEqual(feed.next_offset, 2)
+
+        received = []
+        while len(received) < 6:
+            received.extend(event.data['i'] for event in slow.poll(max_events=1, timeout=1))
+            fast.poll()
+        publisher.join(timeout=2)
+
+        self.assertFalse(publisher.is_alive())
+        self.assertEqual(received, list(range(6)))
+
+    def test_block_timeout_falls_back_to_eviction(self):
+        feed = ChangeFeed(capacity=2, block=True, block_timeout=0.01)
+        subscription = feed.subscribe(0)
+        publish(feed, 4)
+
+        self.assertEqual(feed.evicted, 2)
+        with self.assertRaises(ValueError):
+            subscription.poll()
+
+    def test_closing_subscriber_releases_publisher(self):
+        feed = ChangeFeed(capacity=1, block=True)
+        subscription = feed.subscribe(0)
+        publisher = self.start_publisher(feed, 3)
+        self.wait_for(lambda: feed.next_offset == 1)
+
+        subscription.close()
+        publisher.join(timeout=2)
+        self.assertFalse(publisher.is_alive())
+        self.assertEqual(feed.next_offset, 3)
+
+    def test_async_poll_wakes_on_publish_from_another_thread(self):
+        feed = ChangeFeed()
+        subscription = feed.subscribe()
+
+        async def consume():
+            timer = threading.Timer(0.02, publish, args=(feed, 2))
+            timer.start()
+            try:
+                return await subscription.poll_async(timeout=2)
+            finally:
+                timer.join()
+
+        events = asyncio.run(consume())
+        self.assertEqual([event.data['i'] for event in events], [0, 1][:len(events)])
+        self.assertTrue(events)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from columnar import ColumnarFile, export_columnar
+from enums import TransactionType
+from product import Product
+from supplier import Supplier
+from warehouse import Warehouse
+
+START = datetime(2024, 1, 1, 9, 0)
+
+
+def build_warehouse():
+    warehouse = Warehouse("Склад «Центральний»")
+    warehouse.transactions.chunk_size = 4
+    suppliers = [
+        Supplier("ТОВ Постачання", "supply@example.com", "+380991234567", "м. Київ"),
+        Supplier("ФОП Іваненко", "ivan@example.com", "+380671234567", "м. Львів, вул. Зелена, 1"),
+    ]
+    for supplier in suppliers:
+        warehouse.add_supplier(supplier)
+    for i in range(6):
+        product = Product(f"Товар {i} — ünicode", 10 + i, 9.99 * (i + 1), suppliers[i % 2],
+                          description="опис" * i)
+        warehouse.add_product(product, date=START + timedelta(hours=i))
+    for i in range(6):
+        warehouse.remove_product(f"Товар {i} — ünicode", i + 1, date=START + timedelta(days=1, hours=i))
+    return warehouse
+
+
+def state(warehouse):
+    return (
+        warehouse.name,
+        sorted((s.name, s.email, s.phone, s.address) for s in warehouse.suppliers.values()),
+        sorted((p.name, p.quantity, p.price, p.supplier.name, p.arrival_timestamp, p.description)
+               for p in warehouse.products.values()),
+        [(t.product.name, t.quantity, t.transaction_type, t.date) for t in warehouse.transactions],
+    )
+
+
+class ColumnarRoundTripTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "warehouse.whc")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_export_then_load_restores_warehouse(self):
+        original = build_warehouse()
+        export_columnar(original, self.path)
+
+        restored = Warehouse(original.name)
+        with ColumnarFile(self.path) as columnar:
+            self.assertEqual((columnar.supplier_count, columnar.product_count, columnar.transaction_count),
+                             (2, 6, 12))
+            self.assertEqual(len(columnar.row_groups), 3)
+            columnar.load_into(restored)
+
+        self.assertEqual(state(restored), state(original))
+        self.assertEqual([p.name for p in restored.get_products_sorted('price')],
+                         [p.name for p in original.get_products_sorted('price')])
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_transactions_skip_row_groups_outside_range(self):
+        original = build_warehouse()
+        export_columnar(original, self.path)
+        since = START + timedelta(days=1, hours=2)
+
+        with ColumnarFile(self.path) as columnar:
+            shipped = list(columnar.transactions(since, TransactionType.SHIPMENT))
+            self.assertEqual([(t.product.name, t.quantity) for t in shipped],
+                             [(f"Товар {i} — ünicode", i + 1) for i in range(2, 6)])
+            self.assertEqual(list(columnar.transactions(START + timedelta(days=30))), [])
+            self.assertEqual(list(columnar.strings('suppliers.address')),
+                             ["м. Київ", "м. Львів, вул. Зелена, 1"])
+
+    def test_empty_warehouse_round_trips(self):
+        export_columnar(Warehouse("Порожній"), self.path)
+        restored = Warehouse("Порожній")
+        with ColumnarFile(self.path) as columnar:
+            self.assertEqual(columnar.row_groups, [])
+            columnar.load_into(restored)
+        self.assertEqual(state(restored), ("Порожній", [], [], []))
+
+    def test_rejects_corrupted_file(self):
+        export_columnar(build_warehouse(), self.path)
+        with open(self.path, 'r+b') as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b'X')
+        with self.assertRaises(ValueError):
+            ColumnarFile(self.path)
+
+        open(self.path, 'wb').close()
+        with self.assertRaises(ValueError):
+            ColumnarFile(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import tempfile
+import threading
+import unittest
+from concurrent_warehouse import ConcurrentWarehouse
+from product import Product
+from storage import StorageEngine
+from supplier import Supplier
+
+SUPPLIER = "ТОВ Постачання"
+
+
+def product_rows(count):
+    return [{'name': f"Товар {i:06d}", 'quantity': i % 7 + 1, 'price': float(i % 101 + 1),
+             'supplier': SUPPLIER, 'description': ""} for i in range(count)]
+
+
+class RestoredConcurrentWarehouseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        storage = StorageEngine(self.directory.name)
+        warehouse = storage.open("Склад")
+        warehouse.add_supplier(Supplier(SUPPLIER, "supply@example.com", "+380991234567", "м. Київ"))
+        warehouse.bulk_add_products(product_rows(50000))
+        storage.close()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_sorted_reads_race_with_writers_after_restore(self):
+        for sort_key in ('name', 'quantity', 'price'):
+            storage = StorageEngine(self.directory.name)
+            warehouse = storage.open("Склад", warehouse_class=ConcurrentWarehouse)
+            supplier = warehouse.suppliers[SUPPLIER]
+            errors = []
+
+            def write():
+                try:
+                    for i in range(2000):
+                        warehouse.add_product(Product(f"Новий {sort_key} {i:05d}", 1, 5.0, supplier))
+                except Exception as e:
+                    errors.append(e)
+
+            writer = threading.Thread(target=write)
+            writer.start()
+            try:
+                warehouse.get_products_sorted(sort_key)
+                warehouse.get_products_in_range(sort_key)
+            finally:
+                writer.join()
+
+            self.assertEqual(errors, [])
+            expected = sorted((getattr(product, sort_key), product.name) for product in warehouse.products.values())
+            listed = [(getattr(product, sort_key), product.name)
+                      for product in warehouse.get_products_sorted(sort_key)]
+            self.assertEqual(listed, expected)
+            storage.close()
+
+
+class ListingReadTest(unittest.TestCase):
+
+    def test_listings_do_not_wait_for_writers(self):
+        warehouse = ConcurrentWarehouse("Склад")
+        warehouse.add_supplier(Supplier(SUPPLIER, "supply@example.com", "+380991234567", "м. Київ"))
+        warehouse.bulk_add_products(product_rows(100))
+        listings = []
+
+        def read():
+            listings.append(len(warehouse.get_products_sorted('price')))
+            listings.append(len(warehouse.get_products_in_range('quantity', 2, 3)))
+            listings.append(len(list(warehouse.iter_products('quantity', limit=30))))
+
+        with warehouse._catalog_lock, warehouse._journal_lock, warehouse._stripes[0]:
+            reader = threading.Thread(target=read)
+            reader.start()
+            reader.join(5)
+            self.assertFalse(reader.is_alive())
+        self.assertEqual(listings, [100, 29, 30])
+
+
+if __name__ == "__main__":
+    unittest.main()
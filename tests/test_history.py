@@ -0,0 +1,111 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+from enums import TransactionType
+from history import PERIODS, TransactionHistory, next_period, period_start
+from journal import TransactionJournal
+
+SUPPLIERS = {"ТОВ А": ["Ноутбук", "Мишка"], "ТОВ Б": ["Монітор"]}
+
+
+def build_history(seed, count=600):
+    rng = random.Random(seed)
+    journal = TransactionJournal(chunk_size=16)
+    base = datetime(2023, 12, 25)
+    records = []
+    for _ in range(count):
+        base += timedelta(minutes=rng.randint(0, 180))
+        name = rng.choice(["Ноутбук", "Мишка", "Монітор"])
+        transaction_type = rng.choice([TransactionType.RECEIPT, TransactionType.SHIPMENT])
+        quantity = rng.randint(1, 9)
+        journal.record(name, quantity, transaction_type, base)
+        records.append((name, quantity, transaction_type, base))
+    return TransactionHistory(journal, lambda supplier: SUPPLIERS.get(supplier, [])), records
+
+
+class PeriodTest(unittest.TestCase):
+
+    def test_boundaries(self):
+        moment = datetime(2023, 12, 31, 23, 59, 59, 999999)
+        self.assertEqual(period_start(moment, 'hour'), datetime(2023, 12, 31, 23))
+        self.assertEqual(next_period(period_start(moment, 'hour'), 'hour'), datetime(2024, 1, 1))
+        self.assertEqual(next_period(period_start(moment, 'day'), 'day'), datetime(2024, 1, 1))
+        self.assertEqual(period_start(moment, 'week'), datetime(2023, 12, 25))
+        self.assertEqual(period_start(datetime(2024, 1, 3), 'week'), datetime(2024, 1, 1))
+        self.assertEqual(period_start(datetime(2024, 3, 2), 'week'), datetime(2024, 2, 26))
+        self.assertEqual(period_start(moment, 'month'), datetime(2023, 12, 1))
+        self.assertEqual(next_period(datetime(2023, 12, 1), 'month'), datetime(2024, 1, 1))
+        self.assertEqual(next_period(datetime(2024, 1, 1), 'month'), datetime(2024, 2, 1))
+
+    def test_every_moment_falls_inside_its_period(self):
+        rng = random.Random(1)
+        for _ in range(500):
+            moment = datetime(2023, 1, 1) + timedelta(seconds=rng.randint(0, 3 * 365 * 86400))
+            for period in PERIODS:
+                start = period_start(moment, period)
+                self.assertTrue(start <= moment < next_period(start, period), (moment, period))
+                self.assertEqual(period_start(next_period(start, period), period), next_period(start, period))
+
+
+class TransactionHistoryTest(unittest.TestCase):
+
+    def test_totals_match_brute_force_across_boundaries(self):
+        history, records = build_history(seed=4)
+        ranges = [
+            (None, None),
+            (datetime(2024, 1, 1), None),
+            (None, datetime(2024, 1, 1)),
+            (datetime(2023, 12, 31, 23), datetime(2024, 1, 1, 1)),
+            (datetime(2024, 1, 29), datetime(2024, 2, 5)),
+        ]
+        for period in PERIODS:
+            for start, end in ranges:
+                for transaction_type in (None, TransactionType.SHIPMENT):
+                    expected = {}
+                    for name, quantity, record_type, date in records:
+                        if start is not None and date < start or end is not None and date >= end:
+                            continue
+                        if transaction_type is not None and record_type != transaction_type:
+                            continue
+                        bucket = expected.setdefault(period_start(date, period), {})
+                        bucket[record_type] = bucket.get(record_type, 0) + quantity
+
+                    totals = history.totals(period, start, end, transaction_type)
+                    self.assertEqual(totals, sorted(expected.items()), (period, start, end))
+
+    def test_filters_and_cursor_match_brute_force(self):
+        history, records = build_history(seed=8)
+        start, end = datetime(2024, 1, 1), datetime(2024, 1, 15)
+        expected = [
+            (position, name, quantity)
+            for position, (name, quantity, _, date) in enumerate(records)
+            if start <= date < end and name in SUPPLIERS["ТОВ А"]
+        ]
+        found = [(position, t.product.name, t.quantity)
+                 for position, t in history.transactions(start, end, supplier_name="ТОВ А")]
+        self.assertEqual(found, expected)
+
+        middle = expected[len(expected) // 2][0]
+        resumed = [position for position, _ in history.transactions(start, end, supplier_name="ТОВ А",
+                                                                    after=middle)]
+        self.assertEqual(resumed, [position for position, _, _ in expected if position > middle])
+
+        only = [t.product.name for _, t in history.transactions(product_name="Монітор", supplier_name="ТОВ А")]
+        self.assertEqual(only, [])
+
+    def test_departed_products_stay_in_supplier_history(self):
+        history, records = build_history(seed=2, count=50)
+        history.restore_departed([("Мишка", "ТОВ В")])
+
+        found = [t.quantity for _, t in history.transactions(supplier_name="ТОВ В")]
+        self.assertEqual(found, [quantity for name, quantity, _, _ in records if name == "Мишка"])
+        self.assertTrue(found)
+
+    def test_unknown_period_is_rejected(self):
+        history, _ = build_history(seed=1, count=1)
+        with self.assertRaises(ValueError):
+            history.totals('year')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import random
+import unittest
+from indexes import SortedIndex
+
+
+class SortedIndexTest(unittest.TestCase):
+
+    def assert_matches(self, index, values):
+        entries = sorted((value, name) for name, value in values.items())
+        self.assertEqual(len(index), len(entries))
+        self.assertEqual(list(index.names()), [name for _, name in entries])
+        self.assertEqual(list(index.names(reverse=True)), [name for _, name in reversed(entries)])
+        self.assertEqual(list(index.iter_after(page_size=7)), entries)
+
+        for _ in range(20):
+            low = random.choice((None, random.randint(-5, 105)))
+            high = random.choice((None, random.randint(-5, 105)))
+            expected = [name for value, name in entries
+                        if (low is None or value >= low) and (high is None or value <= high)]
+            self.assertEqual(list(index.names_between(low, high)), expected)
+
+        if entries:
+            after = random.choice(entries)
+            limit = random.randint(1, len(entries))
+            expected = [entry for entry in entries if entry > after][:limit]
+            self.assertEqual(list(index.iter_after(after, limit, page_size=3)), expected)
+
+    def test_matches_brute_force_after_updates_and_removals(self):
+        random.seed(7)
+        index = SortedIndex('quantity', chunk_size=4)
+        values = {f"Товар {i}": random.randint(0, 100) for i in range(200)}
+        index.build((value, name) for name, value in values.items())
+        self.assert_matches(index, values)
+
+        for step in range(600):
+            action = random.random()
+            if action < 0.3:
+                name = f"Новий {step}"
+                values[name] = random.randint(0, 100)
+                index.add(name, values[name])
+            elif action < 0.6 and values:
+                name = random.choice(list(values))
+                index.remove(name, values.pop(name))
+            elif values:
+                name = random.choice(list(values))
+                new_value = random.randint(0, 100)
+                index.update(name, values[name], new_value)
+                values[name] = new_value
+            if step % 50 == 0:
+                self.assert_matches(index, values)
+        self.assert_matches(index, values)
+
+    def test_bulk_changes_match_brute_force(self):
+        random.seed(11)
+        index = SortedIndex('price', chunk_size=8)
+        values = {}
+        for batch in range(5):
+            added = {f"Товар {batch}-{i}": random.randint(0, 100) for i in range(150)}
+            index.add_many((value, name) for name, value in added.items())
+            values.update(added)
+            self.assert_matches(index, values)
+
+            changed = random.sample(list(values), 100)
+            changes = [(name, values[name], random.randint(0, 100)) for name in changed]
+            index.update_many(changes)
+            values.update((name, new_value) for name, _, new_value in changes)
+            self.assert_matches(index, values)
+
+        for name in random.sample(list(values), len(values) - 3):
+            index.remove(name, values.pop(name))
+        self.assert_matches(index, values)
+
+    def test_readers_keep_their_snapshot(self):
+        index = SortedIndex('name', chunk_size=2)
+        index.build((name, name) for name in "abcdef")
+        names = index.names()
+        self.assertEqual(next(names), "a")
+
+        index.remove("b", "b")
+        index.add("bb", "bb")
+        self.assertEqual(list(names), ["b", "c", "d", "e", "f"])
+        self.assertEqual(list(index.names()), ["a", "bb", "c", "d", "e", "f"])
+
+    def test_duplicate_add_is_ignored(self):
+        index = SortedIndex('quantity', chunk_size=2)
+        index.build([])
+        for _ in range(3):
+            index.add("Товар", 5)
+        self.assertEqual(len(index), 1)
+        self.assertEqual(list(index.names()), ["Товар"])
+
+
+if __name__ == "__main__":
+    unittest.main()
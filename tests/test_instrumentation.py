@@ -0,0 +1,142 @@
+import random
+import time
+import unittest
+from instrumentation import (
+    SUB_BUCKET_BITS, Histogram, Metrics, SamplingProfiler, instrumentation_for, rejection_reason,
+)
+from product import Product
+from supplier import Supplier
+from warehouse import Warehouse
+
+
+def build_warehouse():
+    warehouse = Warehouse("Склад")
+    supplier = Supplier("ТОВ Постачання", "supply@example.com", "+380991234567", "м. Київ")
+    warehouse.add_supplier(supplier)
+    warehouse.add_product(Product("Ноутбук", 5, 100.0, supplier))
+    return warehouse
+
+
+class HistogramTest(unittest.TestCase):
+
+    def test_percentiles_are_within_bucket_error_of_brute_force(self):
+        rng = random.Random(5)
+        values = [int(rng.lognormvariate(10, 2)) for _ in range(5000)]
+        histogram = Histogram()
+        for value in values:
+            histogram.record(value)
+
+        values.sort()
+        self.assertEqual((histogram.count, histogram.total), (len(values), sum(values)))
+        self.assertEqual((histogram.min, histogram.max), (values[0], values[-1]))
+        for fraction in (0.01, 0.5, 0.9, 0.99, 0.999, 1.0):
+            exact = values[max(1, int(fraction * len(values) + 0.5)) - 1]
+            estimate = histogram.percentile(fraction)
+            self.assertGreaterEqual(estimate, exact)
+            self.assertLessEqual(estimate - exact, exact / 2 ** SUB_BUCKET_BITS + 1)
+
+    def test_small_values_are_exact(self):
+        histogram = Histogram()
+        for value in range(2 ** (SUB_BUCKET_BITS + 1)):
+            histogram.record(value)
+        self.assertEqual(histogram.percentile(0.5), 31)
+        self.assertEqual(histogram.percentile(1.0), 63)
+
+    def test_empty_histogram(self):
+        self.assertEqual(Histogram().percentile(0.99), 0)
+
+
+class MetricsTest(unittest.TestCase):
+
+    def test_rejection_reasons_are_grouped(self):
+        self.assertEqual(rejection_reason("Товар 'Ноутбук' не знайдено. Доступно: 12.5"),
+                         "Товар '…' не знайдено. Доступно: N")
+
+        metrics = Metrics()
+        metrics.record('remove_product', 1000, "Недостатня кількість товару на складі. Доступно: 3")
+        metrics.record('remove_product', 3000, "Недостатня кількість товару на складі. Доступно: 7")
+        metrics.reject('bulk_add_products', "Постачальник 'А' не зареєстрований", count=2)
+        snapshot = metrics.snapshot()
+
+        self.assertEqual(snapshot['calls'], {'remove_product': 2})
+        self.assertEqual(snapshot['latency_seconds']['remove_product']['count'], 2)
+        self.assertAlmostEqual(snapshot['latency_seconds']['remove_product']['sum'], 4e-6)
+        self.assertEqual(sorted((r['operation'], r['count']) for r in snapshot['rejections']),
+                         [('bulk_add_products', 2), ('remove_product', 2)])
+
+    def test_prometheus_export(self):
+        metrics = Metrics()
+        metrics.gauges['warehouse_products'] = lambda: 3
+        metrics.record('add_product', 2000)
+        text = metrics.to_prometheus()
+
+        self.assertIn('warehouse_calls_total{operation="add_product"} 1\n', text)
+        self.assertIn('warehouse_operation_latency_seconds_count{operation="add_product"} 1\n', text)
+        self.assertIn('warehouse_operation_latency_seconds{operation="add_product",quantile="0.99"}', text)
+        self.assertTrue(text.endswith("warehouse_products 3\n"))
+
+
+class InstrumentationTest(unittest.TestCase):
+
+    def test_enabled_warehouse_records_calls_rejections_and_validation(self):
+        warehouse = build_warehouse()
+        instrumentation = instrumentation_for(warehouse)
+        self.assertIs(instrumentation_for(warehouse), instrumentation)
+        instrumentation.enable()
+        try:
+            warehouse.remove_product("Ноутбук", 1)
+            with self.assertRaises(ValueError):
+                warehouse.remove_product("Мишка", 1)
+            warehouse.bulk_remove_products([("Ноутбук", 100), ("Ноутбук", 1)])
+            warehouse.bulk_add_products([{'name': "Мишка", 'quantity': 1, 'price': 0, 'supplier': "ТОВ Постачання"}])
+            warehouse.update_product_info("Ноутбук", new_price=120.0)
+            snapshot = instrumentation.metrics.snapshot()
+        finally:
+            instrumentation.disable()
+
+        self.assertEqual(snapshot['calls']['remove_product'], 2)
+        self.assertEqual(snapshot['calls']['bulk_remove_products'], 1)
+        self.assertEqual(snapshot['calls']['Product.update_price'], 1)
+        reasons = {(r['operation'], r['reason']) for r in snapshot['rejections']}
+        self.assertIn(('remove_product', "Товар '…' не знайдено на складі"), reasons)
+        self.assertIn(('bulk_remove_products', "Недостатня кількість товару на складі. Доступно: N"), reasons)
+        self.assertIn(('bulk_add_products', "Ціна товару повинна бути більше нуля"), reasons)
+        self.assertEqual(snapshot['gauges']['warehouse_products'], 1)
+
+    def test_disable_restores_methods(self):
+        warehouse = build_warehouse()
+        update_price = Product.update_price
+        instrumentation = instrumentation_for(warehouse)
+        instrumentation.enable()
+        self.assertIsNot(Product.update_price, update_price)
+        self.assertIn('remove_product', vars(warehouse))
+
+        instrumentation.disable()
+        self.assertIs(Product.update_price, update_price)
+        self.assertNotIn('remove_product', vars(warehouse))
+        warehouse.remove_product("Ноутбук", 1)
+        self.assertEqual(instrumentation.metrics.snapshot()['calls'], {})
+
+
+class SamplingProfilerTest(unittest.TestCase):
+
+    def test_samples_busy_main_thread(self):
+        def spin():
+            deadline = time.perf_counter() + 0.2
+            while time.perf_counter() < deadline:
+                pass
+
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        try:
+            spin()
+        finally:
+            profiler.stop()
+
+        self.assertFalse(profiler.running)
+        self.assertGreater(profiler.samples, 0)
+        self.assertTrue(any(location.endswith(" spin") for location, _, _ in profiler.report()))
+
+
+if __name__ == "__main__":
+    unittest.main()
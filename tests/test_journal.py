@@ -0,0 +1,47 @@
+import tempfile
+import unittest
+from datetime import datetime
+from enums import TransactionType
+from journal import TransactionJournal
+
+
+class SpilledJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, journal, count):
+        for i in range(count):
+            journal.record(f"Товар {i % 3}", i + 1, TransactionType.RECEIPT, datetime.fromtimestamp(1_700_000_000 + i))
+
+    def test_spilled_chunks_are_decoded_once(self):
+        journal = TransactionJournal(chunk_size=4, spill_dir=self.directory.name, spill_cache_chunks=2)
+        self.record(journal, 10)
+        first, second, active = journal.chunks()
+        self.assertIsNotNone(first.path)
+
+        columns = first.columns()
+        self.assertIs(first.columns(), columns)
+        self.assertEqual(list(columns[1]), [1, 2, 3, 4])
+
+        second.columns()
+        self.assertIs(first.columns(), columns)
+        self.assertEqual([t.quantity for t in journal], list(range(1, 11)))
+
+    def test_spill_cache_is_bounded(self):
+        journal = TransactionJournal(chunk_size=2, spill_dir=self.directory.name, spill_cache_chunks=1)
+        self.record(journal, 6)
+        first, second, third = journal.chunks()
+
+        columns = first.columns()
+        second.columns()
+        self.assertIsNot(first.columns(), columns)
+        self.assertEqual(first.columns(), columns)
+        self.assertEqual(sum(t.quantity for t in journal), 21)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from lots import FEFO
+from product import Product
+from storage import WAL_FILE, StorageEngine
+from supplier import Supplier
+from warehouse import Warehouse
+
+SUPPLIER = Supplier("ТОВ Постачання", "supply@example.com", "+380991234567", "м. Київ")
+PRODUCT = "Молоко"
+
+
+def receive(warehouse, quantity, price, day, expiry_day=None):
+    expiry = datetime(2024, 3, expiry_day) if expiry_day is not None else None
+    warehouse.add_product(Product(PRODUCT, quantity, price, SUPPLIER, datetime(2024, 1, day)),
+                          datetime(2024, 1, day), expiry)
+
+
+def layers(warehouse):
+    return [(lot.quantity, lot.unit_cost) for lot in warehouse.get_product_lots(PRODUCT)]
+
+
+class LotPickingTest(unittest.TestCase):
+
+    def make(self, policy='fifo'):
+        warehouse = Warehouse("Склад", picking_policy=policy)
+        warehouse.add_supplier(SUPPLIER)
+        return warehouse
+
+    def test_fifo_ships_oldest_lots_first(self):
+        warehouse = self.make()
+        receive(warehouse, 5, 10.0, 2)
+        receive(warehouse, 5, 20.0, 3)
+        receive(warehouse, 5, 30.0, 1)
+
+        warehouse.remove_product(PRODUCT, 7, datetime(2024, 1, 4))
+        self.assertEqual(warehouse.cost_of_goods_sold(PRODUCT), 5 * 30.0 + 2 * 10.0)
+        self.assertEqual(layers(warehouse), [(3, 10.0), (5, 20.0)])
+        self.assertEqual(warehouse.stock_cost(), 3 * 10.0 + 5 * 20.0)
+
+    def test_fefo_ships_earliest_expiry_first(self):
+        warehouse = self.make(FEFO)
+        receive(warehouse, 4, 10.0, 1, expiry_day=20)
+        receive(warehouse, 4, 20.0, 2)
+        receive(warehouse, 4, 30.0, 3, expiry_day=5)
+
+        self.assertEqual([lot.expiry_date for lot in warehouse.get_product_lots(PRODUCT)],
+                         [datetime(2024, 3, 5), datetime(2024, 3, 20), None])
+        warehouse.remove_product(PRODUCT, 6, datetime(2024, 1, 4))
+        self.assertEqual(warehouse.cost_of_goods_sold(PRODUCT), 4 * 30.0 + 2 * 10.0)
+        self.assertEqual(layers(warehouse), [(2, 10.0), (4, 20.0)])
+
+    def test_transfer_carries_lot_costs_without_cogs(self):
+        source, destination = self.make(), self.make()
+        receive(source, 5, 10.0, 1, expiry_day=10)
+        receive(source, 5, 20.0, 2)
+
+        lots = source.transfer_out(PRODUCT, 7, datetime(2024, 1, 3))
+        self.assertEqual(source.cost_of_goods_sold(), 0.0)
+        self.assertEqual(layers(source), [(3, 20.0)])
+
+        destination.transfer_in(Product(PRODUCT, 7, 20.0, SUPPLIER), datetime(2024, 1, 3), lots)
+        self.assertEqual(layers(destination), [(5, 10.0), (2, 20.0)])
+        self.assertEqual(destination.get_product_lots(PRODUCT)[0].expiry_date, datetime(2024, 3, 10))
+        destination.remove_product(PRODUCT, 7, datetime(2024, 1, 4))
+        self.assertEqual(destination.cost_of_goods_sold(), 5 * 10.0 + 2 * 20.0)
+
+    def test_transfer_lots_must_match_quantity(self):
+        destination = self.make()
+        with self.assertRaises(ValueError):
+            destination.transfer_in(Product(PRODUCT, 7, 20.0, SUPPLIER), datetime(2024, 1, 3),
+                                    [(5, 10.0, 0, None)])
+        self.assertNotIn(PRODUCT, destination.products)
+
+
+class LotReplayTest(unittest.TestCase):
+
+    def test_transferred_lots_survive_wal_replay(self):
+        with tempfile.TemporaryDirectory() as directory:
+            storage = StorageEngine(directory)
+            warehouse = storage.open("Склад")
+            warehouse.add_supplier(SUPPLIER)
+            receive(warehouse, 2, 50.0, 1)
+            warehouse.transfer_in(Product(PRODUCT, 3, 20.0, SUPPLIER), datetime(2024, 1, 2),
+                                  [(1, 10.0, 0, None), (2, 15.0, 0, None)])
+            storage.sync()
+            storage._wal.close()
+            storage._wal = None
+
+            self.assertTrue(os.path.getsize(os.path.join(directory, WAL_FILE)))
+            storage = StorageEngine(directory)
+            self.assertEqual(storage.open("Склад").stock_cost(), 2 * 50.0 + 10.0 + 2 * 15.0)
+            storage.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
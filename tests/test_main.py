@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from storage import SNAPSHOT_FILE
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+SEEDED = "Тестові дані успішно додані."
+
+
+class MainExitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.directory.name, SNAPSHOT_FILE)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_menu(self, choices):
+        environment = dict(os.environ, WAREHOUSE_DATA_DIR=self.directory.name)
+        completed = subprocess.run([sys.executable, MAIN], input="".join(f"{c}\n" for c in choices),
+                                   capture_output=True, text=True, encoding='utf-8', env=environment, timeout=60)
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        return completed.stdout
+
+    def test_exit_without_loading_writes_nothing(self):
+        output = self.run_menu([0])
+        self.assertNotIn(SEEDED, output)
+        self.assertFalse(os.path.exists(self.snapshot_path))
+
+    def test_snapshot_written_only_when_changed(self):
+        output = self.run_menu([5, 0])
+        self.assertIn(SEEDED, output)
+        written = os.stat(self.snapshot_path)
+
+        output = self.run_menu([5, 0])
+        self.assertNotIn(SEEDED, output)
+        self.assertIn("ТОВ Технології", output)
+        self.assertEqual(os.stat(self.snapshot_path).st_mtime_ns, written.st_mtime_ns)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from product import Product
+from replenishment import DAY
+from storage import StorageEngine
+from supplier import Supplier
+from warehouse import Warehouse
+
+SUPPLIER = "ТОВ Постачання"
+
+
+class ReplenishmentRestartTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def ship_out(self, warehouse):
+        supplier = Supplier(SUPPLIER, "supply@example.com", "+380991234567", "м. Київ")
+        warehouse.add_supplier(supplier)
+        now = datetime.now()
+        warehouse.add_product(Product("Ноутбук", 30, 450.0, supplier), now - timedelta(days=10))
+        warehouse.add_product(Product("Мишка", 100, 20.0, supplier), now - timedelta(days=10))
+        for day in range(10, 0, -1):
+            warehouse.remove_product("Ноутбук", 3, now - timedelta(days=day - 0.5))
+        warehouse.remove_product("Мишка", 1, now - timedelta(days=1))
+        self.assertNotIn("Ноутбук", warehouse.products)
+
+    def assert_departed_suggested(self, warehouse):
+        suggestions = {suggestion.product_name: suggestion
+                       for suggestion in warehouse.reorder_suggestions().get(SUPPLIER, [])}
+        self.assertIn("Ноутбук", suggestions)
+        self.assertEqual(suggestions["Ноутбук"].on_hand, 0)
+        self.assertGreater(suggestions["Ноутбук"].quantity, 0)
+        self.assertAlmostEqual(suggestions["Ноутбук"].estimated_cost, suggestions["Ноутбук"].quantity * 450.0)
+        self.assertEqual(len(list(warehouse.iter_transactions(supplier_name=SUPPLIER))), 13)
+
+    def test_departed_products_survive_snapshot_restart(self):
+        storage = StorageEngine(self.directory.name)
+        warehouse = storage.open("Склад")
+        self.ship_out(warehouse)
+        self.assert_departed_suggested(warehouse)
+        storage.close()
+
+        storage = StorageEngine(self.directory.name)
+        self.assert_departed_suggested(storage.open("Склад"))
+        storage.close()
+
+    def test_departed_products_survive_wal_replay(self):
+        storage = StorageEngine(self.directory.name)
+        storage.open("Склад").add_supplier(Supplier("ПП Інше", "other@example.com", "+380991234567", "м. Львів"))
+        storage.close()
+
+        storage = StorageEngine(self.directory.name)
+        self.ship_out(storage.open("Склад"))
+        storage.sync()
+
+        self.assert_departed_suggested(StorageEngine(self.directory.name).open("Склад"))
+
+    def test_restocked_product_is_not_departed(self):
+        storage = StorageEngine(self.directory.name)
+        warehouse = storage.open("Склад")
+        self.ship_out(warehouse)
+        warehouse.add_product(Product("Ноутбук", 1, 470.0, warehouse.suppliers[SUPPLIER]))
+        storage.close()
+
+        warehouse = StorageEngine(self.directory.name).open("Склад")
+        self.assertNotIn("Ноутбук", [name for name, _, _ in warehouse.replenishment.departed_products()])
+        suggestion = {s.product_name: s for s in warehouse.reorder_suggestions()[SUPPLIER]}["Ноутбук"]
+        self.assertEqual(suggestion.on_hand, 1)
+        self.assertAlmostEqual(suggestion.estimated_cost, suggestion.quantity * 470.0)
+
+
+class ReplenishmentHorizonTest(unittest.TestCase):
+
+    def setUp(self):
+        self.warehouse = Warehouse("Склад")
+        supplier = Supplier(SUPPLIER, "supply@example.com", "+380991234567", "м. Київ")
+        self.warehouse.add_supplier(supplier)
+        self.now = datetime.now()
+        self.warehouse.add_product(Product("Ноутбук", 6, 450.0, supplier), self.now - timedelta(days=3))
+        self.warehouse.add_product(Product("Мишка", 50, 20.0, supplier), self.now - timedelta(days=3))
+        for day in (3, 2, 1):
+            self.warehouse.remove_product("Ноутбук", 2, self.now - timedelta(days=day))
+            self.warehouse.remove_product("Мишка", 1, self.now - timedelta(days=day))
+
+    def test_zero_horizon_lists_only_empty_stock(self):
+        planner = self.warehouse.replenishment
+        self.assertEqual([name for name, _ in planner.at_risk(0)], ["Ноутбук"])
+        self.assertEqual([name for name, _ in planner.at_risk(-1)], ["Ноутбук"])
+        self.assertEqual(self.warehouse.reorder_suggestions(0, 0), {})
+        (suggestion,) = self.warehouse.reorder_suggestions(0, 10)[SUPPLIER]
+        self.assertEqual(suggestion.product_name, "Ноутбук")
+
+    def test_departed_demand_fades_out(self):
+        planner = self.warehouse.replenishment
+        later = self.now.timestamp() + 365 * DAY
+        self.assertIn("Ноутбук", [name for name, _ in planner.at_risk(7)])
+        self.assertEqual(planner.suggestions(7, 30, now=later), {})
+        self.assertEqual(planner.at_risk(now=later), [])
+        self.assertEqual(planner.daily_demand("Ноутбук"), 0.0)
+        self.assertGreater(planner.daily_demand("Мишка"), 0.0)
+        self.assertIn("Ноутбук", [name for name, _, _ in planner.departed_products()])
+
+        self.warehouse.remove_product("Мишка", 1)
+        self.assertEqual([name for name, _ in planner.at_risk(7)], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
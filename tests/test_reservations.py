@@ -0,0 +1,117 @@
+import random
+import unittest
+from product import Product
+from reservations import ReservationBook
+from supplier import Supplier
+from warehouse import Warehouse
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def build_warehouse(clock):
+    warehouse = Warehouse("Склад")
+    warehouse.reservations.clock = clock
+    supplier = Supplier("ТОВ Постачання", "supply@example.com", "+380991234567", "м. Київ")
+    warehouse.add_supplier(supplier)
+    warehouse.add_product(Product("Ноутбук", 5, 100.0, supplier))
+    return warehouse
+
+
+class WarehouseReservationTest(unittest.TestCase):
+
+    def test_expired_hold_releases_stock(self):
+        clock = Clock()
+        warehouse = build_warehouse(clock)
+        hold = warehouse.reserve_product("Ноутбук", 4, ttl=60)
+
+        self.assertEqual(warehouse.available_quantity("Ноутбук"), 1)
+        with self.assertRaises(ValueError):
+            warehouse.remove_product("Ноутбук", 2)
+        with self.assertRaises(ValueError):
+            warehouse.reserve_product("Ноутбук", 2)
+
+        clock.now += 60
+        self.assertEqual(warehouse.reserved_quantity("Ноутбук"), 0)
+        self.assertEqual(warehouse.available_quantity("Ноутбук"), 5)
+        with self.assertRaises(ValueError):
+            warehouse.confirm_reservation(hold.hold_id)
+        warehouse.remove_product("Ноутбук", 2)
+        self.assertEqual(warehouse.products["Ноутбук"].quantity, 3)
+
+    def test_confirm_before_expiry_ships_held_stock(self):
+        clock = Clock()
+        warehouse = build_warehouse(clock)
+        hold = warehouse.reserve_product("Ноутбук", 3, ttl=60)
+        clock.now += 59
+
+        warehouse.confirm_reservation(hold.hold_id)
+        self.assertEqual(warehouse.products["Ноутбук"].quantity, 2)
+        self.assertEqual(warehouse.available_quantity("Ноутбук"), 2)
+        with self.assertRaises(ValueError):
+            warehouse.release_reservation(hold.hold_id)
+
+    def test_release_returns_stock_immediately(self):
+        warehouse = build_warehouse(Clock())
+        hold = warehouse.reserve_product("Ноутбук", 5)
+        self.assertEqual(warehouse.available_quantity("Ноутбук"), 0)
+
+        self.assertEqual(warehouse.release_reservation(hold.hold_id), hold)
+        self.assertEqual(warehouse.available_quantity("Ноутбук"), 5)
+
+
+class ReservationBookTest(unittest.TestCase):
+
+    def test_rejects_invalid_holds(self):
+        book = ReservationBook(Clock())
+        for quantity, ttl in ((0, 10), (-1, 10), (1, 0)):
+            with self.assertRaises(ValueError):
+                book.reserve("Ноутбук", quantity, 10, ttl)
+        self.assertEqual(len(book), 0)
+
+    def test_expire_returns_due_holds_in_deadline_order(self):
+        clock = Clock()
+        book = ReservationBook(clock)
+        late = book.reserve("Ноутбук", 1, 10, ttl=30)
+        early = book.reserve("Мишка", 2, 10, ttl=10)
+        book.reserve("Ноутбук", 3, 10, ttl=90)
+
+        self.assertEqual(book.expire(clock.now + 30), [early, late])
+        self.assertEqual(book.reserved("Ноутбук"), 3)
+        self.assertEqual(book.reserved("Мишка"), 0)
+
+    def test_reserved_totals_match_brute_force(self):
+        clock = Clock()
+        rng = random.Random(9)
+        book = ReservationBook(clock)
+        live = {}
+        names = ["Ноутбук", "Мишка", "Монітор"]
+
+        for _ in range(2000):
+            action = rng.random()
+            if action < 0.5:
+                hold = book.reserve(rng.choice(names), rng.randint(1, 3), 10 ** 6, ttl=rng.uniform(1, 50))
+                live[hold.hold_id] = hold
+            elif action < 0.7 and live:
+                hold_id = rng.choice(list(live))
+                book.release(hold_id)
+                del live[hold_id]
+            else:
+                clock.now += rng.uniform(0, 5)
+            live = {hold_id: hold for hold_id, hold in live.items() if hold.expires_at > clock.now}
+
+            name = rng.choice(names)
+            expected = sum(hold.quantity for hold in live.values() if hold.product_name == name)
+            self.assertEqual(book.reserved(name), expected)
+            self.assertEqual(len(book), len(live))
+        self.assertLessEqual(len(book._expiry), 2 * len(live) + 64 + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import random
+import unittest
+from product import Product
+from search import SearchIndex, normalize, tokenize
+from supplier import Supplier
+from warehouse import Warehouse
+
+WORDS = ["ноутбук", "монітор", "мишка", "кабель", "café", "Émile", "usb", "hdmi", "клавіатура", "2024"]
+
+
+def random_names(count, seed):
+    rng = random.Random(seed)
+    return {" ".join(rng.sample(WORDS, rng.randint(1, 3))) + f" {i}" for i in range(count)}
+
+
+class SearchIndexTest(unittest.TestCase):
+
+    def brute_force_prefix(self, names, query):
+        terms = tokenize(query)
+        return {name for name in names
+                if all(any(token.startswith(term) for token in tokenize(name)) for term in terms)}
+
+    def test_prefix_matches_brute_force_after_adds_and_removals(self):
+        names = random_names(300, seed=3)
+        index = SearchIndex()
+        index.build(list(names)[:150])
+        index.add_many(list(names)[150:])
+        for name in list(names)[:100:3]:
+            index.remove(name)
+            names.discard(name)
+        self.assertEqual(len(index), len(names))
+
+        for query in ("но", "МОН", "cafe", "emile", "usb hd", "кла 2024", "миш кабель", "xyz"):
+            expected = self.brute_force_prefix(names, query)
+            found = index.prefix(query, limit=len(names) + 1)
+            self.assertEqual(len(found), len(set(found)))
+            self.assertEqual(set(found), expected, query)
+
+    def test_prefix_respects_limit_and_ranks_in_order_matches_first(self):
+        index = SearchIndex()
+        index.build(["кабель usb", "usb кабель довгий", "usb кабель", "адаптер usb"])
+
+        self.assertEqual(len(index.prefix("usb", limit=2)), 2)
+        self.assertEqual(index.prefix("usb каб", limit=3), ["usb кабель", "usb кабель довгий", "кабель usb"])
+        self.assertEqual(index.prefix("", limit=3), [])
+        self.assertEqual(index.prefix("usb", limit=0), [])
+
+    def test_normalization_ignores_case_and_diacritics(self):
+        self.assertEqual(normalize("CAFÉ"), "cafe")
+        self.assertEqual(tokenize("Émile-Zola, 2024!"), ["emile", "zola", "2024"])
+        index = SearchIndex()
+        index.build(["Café Crème"])
+        self.assertEqual(index.search("cafe creme"), ["Café Crème"])
+
+    def test_fuzzy_tolerates_typos(self):
+        index = SearchIndex()
+        index.build(["Ноутбук Lenovo", "Монітор Dell", "Мишка Logitech"])
+
+        self.assertEqual(index.search("Ноутбк")[0], "Ноутбук Lenovo")
+        self.assertEqual(index.search("Logitek")[0], "Мишка Logitech")
+        self.assertEqual(index.fuzzy("zzzz"), [])
+
+    def test_removed_tokens_leave_no_grams(self):
+        index = SearchIndex()
+        index.build(["Ноутбук", "Ноутбук Pro"])
+        index.remove("Ноутбук Pro")
+        index.remove("Ноутбук")
+        index.remove("Ноутбук")
+
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.search("ноутбук"), [])
+        self.assertEqual(index._grams, {})
+        self.assertEqual(index._vocabulary, {})
+
+    def test_lazy_index_builds_on_first_query(self):
+        names = ["Ноутбук", "Монітор"]
+        index = SearchIndex()
+        index.build_lazily(lambda: names)
+        index.add("Мишка")
+        names.append("Мишка")
+
+        self.assertEqual(index.search("миш"), ["Мишка"])
+        self.assertEqual(len(index), 3)
+
+
+class WarehouseSearchTest(unittest.TestCase):
+
+    def test_search_follows_catalog_changes(self):
+        warehouse = Warehouse("Склад")
+        supplier = Supplier("ТОВ Постачання", "supply@example.com", "+380991234567", "м. Київ")
+        warehouse.add_supplier(supplier)
+        warehouse.add_product(Product("Ноутбук Lenovo", 2, 100.0, supplier))
+        warehouse.add_product(Product("Ноутбук Dell", 1, 90.0, supplier))
+
+        self.assertEqual({p.name for p in warehouse.search_products("ноут")}, {"Ноутбук Lenovo", "Ноутбук Dell"})
+        warehouse.remove_product("Ноутбук Dell", 1)
+        self.assertEqual([p.name for p in warehouse.search_products("ноут")], ["Ноутбук Lenovo"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import asyncio
+import unittest
+from benchmarks.load import run
+from product import Product
+from protocol import MAX_MESSAGE_SIZE, decode_message, encode_message
+from server import DEFAULT_PAGE_SIZE, WarehouseServer
+from supplier import Supplier
+from warehouse import Warehouse
+
+
+def build_warehouse():
+    warehouse = Warehouse("Склад")
+    supplier = Supplier("ТОВ Постачання", "supply@example.com", "+380991234567", "м. Київ")
+    warehouse.add_supplier(supplier)
+    warehouse.add_product(Product("Ноутбук", 5, 100.0, supplier))
+    return warehouse
+
+
+class WarehouseServerTest(unittest.TestCase):
+
+    def exchange(self, server, lines):
+        async def talk():
+            await server.start()
+            try:
+                reader, writer = await asyncio.open_connection(server.host, server.port, limit=MAX_MESSAGE_SIZE)
+                for line in lines:
+                    writer.write(line)
+                await writer.drain()
+                responses = [decode_message(await reader.readline()) for _ in lines]
+                writer.close()
+                await writer.wait_closed()
+                return responses
+            finally:
+                await server.stop()
+        return asyncio.run(talk())
+
+    def test_oversized_request_gets_error_and_connection_survives(self):
+        server = WarehouseServer(build_warehouse(), port=0, max_message_size=1024)
+        oversized = encode_message({'id': 1, 'op': 'search_products', 'args': {'query': "x" * 5000}})
+        ok = encode_message({'id': 2, 'op': 'get_availability', 'args': {'name': "Ноутбук"}})
+        first, second = self.exchange(server, [oversized, ok])
+
+        self.assertFalse(first['ok'])
+        self.assertIn("1024", first['error'])
+        self.assertEqual(second['id'], 2)
+        self.assertTrue(second['ok'])
+
+    def test_unexpected_handler_error_is_reported(self):
+        warehouse = build_warehouse()
+
+        def broken(*args):
+            raise RuntimeError("збій")
+
+        warehouse.iter_products = broken
+        server = WarehouseServer(warehouse, port=0)
+        failed, ok = self.exchange(server, [
+            encode_message({'id': 1, 'op': 'get_products_sorted', 'args': {'sort_key': 'name'}}),
+            encode_message({'id': 2, 'op': 'get_all_suppliers'}),
+        ])
+
+        self.assertFalse(failed['ok'])
+        self.assertIn("RuntimeError", failed['error'])
+        self.assertTrue(ok['ok'])
+        self.assertEqual(ok['result'][0]['name'], "ТОВ Постачання")
+
+    def test_product_listings_are_paged(self):
+        warehouse = build_warehouse()
+        supplier = warehouse.suppliers["ТОВ Постачання"]
+        for i in range(DEFAULT_PAGE_SIZE + 20):
+            warehouse.add_product(Product(f"Товар {i:04d}", i + 1, 10.0, supplier))
+        server = WarehouseServer(warehouse, port=0)
+        everything, by_quantity = self.exchange(server, [
+            encode_message({'id': 1, 'op': 'get_all_products'}),
+            encode_message({'id': 2, 'op': 'get_products_sorted', 'args': {'sort_key': 'quantity'}}),
+        ])
+        rest, = self.exchange(server, [
+            encode_message({'id': 3, 'op': 'list_products', 'args': {'after': everything['result']['next']}}),
+        ])
+
+        names = [item['name'] for item in everything['result']['items'] + rest['result']['items']]
+        self.assertEqual(names, sorted(warehouse.products))
+        self.assertIsNone(rest['result']['next'])
+        expected = sorted((product.quantity, product.name) for product in warehouse.products.values())
+        expected = expected[:DEFAULT_PAGE_SIZE]
+        page = [(item['quantity'], item['name']) for item in by_quantity['result']['items']]
+        self.assertEqual(page, expected)
+        self.assertEqual(by_quantity['result']['next'], list(expected[-1]))
+
+    def test_pipelined_requests_beyond_queue_bound_are_answered_in_order(self):
+        server = WarehouseServer(build_warehouse(), port=0, max_pipeline=2)
+        responses = self.exchange(server, [
+            encode_message({'id': i, 'op': 'get_all_products' if i % 3 else 'get_availability',
+                            'args': {'name': "Ноутбук"}})
+            for i in range(60)
+        ])
+
+        self.assertEqual([response['id'] for response in responses], list(range(60)))
+        self.assertTrue(all(response['ok'] for response in responses))
+
+    def test_stock_value_and_turnover(self):
+        warehouse = build_warehouse()
+        warehouse.remove_product("Ноутбук", 1)
+        value, turnover = self.exchange(WarehouseServer(warehouse, port=0), [
+            encode_message({'id': 1, 'op': 'get_stock_value'}),
+            encode_message({'id': 2, 'op': 'get_turnover', 'args': {'name': "Ноутбук", 'days': 7}}),
+        ])
+
+        self.assertEqual(value['result'], {'total': 400.0, 'suppliers': {"ТОВ Постачання": 400.0}})
+        self.assertEqual(turnover['result'], 0.25)
+
+    def test_load_generator_with_default_read_mix(self):
+        asyncio.run(run(clients=4, requests=50, depth=8, sku_count=1000, read_ratio=0.1,
+                        host=None, port=0, seed=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
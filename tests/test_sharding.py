@@ -0,0 +1,204 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from product import Product
+from sharding import (
+    TRANSFER_ABORTED, TRANSFER_COMPENSATED, TRANSFER_DONE, TRANSFER_HOLD_TTL, TRANSFER_LOG_FILE,
+    SiteWorker, WarehouseCoordinator,
+)
+from supplier import Supplier
+
+SUPPLIER = Supplier("ТОВ Постачання", "supply@example.com", "+380991234567", "м. Київ")
+PRODUCT = "Ноутбук"
+
+
+def failing(coordinator, site, operation, times=None):
+    call = coordinator._call
+    failures = []
+
+    def wrapper(target, name, *args):
+        if target == site and name == operation and (times is None or len(failures) < times):
+            failures.append(args)
+            raise ValueError("збій складу")
+        return call(target, name, *args)
+
+    coordinator._call = wrapper
+    return failures
+
+
+class TransferTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.coordinator = WarehouseCoordinator(["Київ", "Львів"], self.directory.name)
+        self.coordinator.add_supplier(SUPPLIER)
+        self.coordinator.add_product(Product(PRODUCT, 10, 500.0, SUPPLIER), site=0)
+
+    def tearDown(self):
+        self.coordinator.close()
+        self.directory.cleanup()
+
+    def decisions(self):
+        with open(os.path.join(self.directory.name, TRANSFER_LOG_FILE), encoding='utf-8') as f:
+            return [json.loads(line)['state'] for line in f]
+
+    def assert_nothing_prepared(self):
+        self.assertEqual(self.coordinator.prepared_transfers(), {"Київ": [], "Львів": []})
+
+    def test_transfer_commits_on_both_sites(self):
+        self.coordinator.transfer(PRODUCT, 4, "Київ", "Львів")
+        self.assertEqual(self.coordinator.stock_by_site(PRODUCT), {"Київ": 6, "Львів": 4})
+        self.assertEqual(self.decisions(), ["commit", TRANSFER_DONE])
+        self.assert_nothing_prepared()
+
+    def test_failed_prepare_releases_source_hold(self):
+        failing(self.coordinator, 1, 'prepare_transfer_in')
+        with self.assertRaises(ValueError):
+            self.coordinator.transfer(PRODUCT, 10, 0, 1)
+        self.assert_nothing_prepared()
+
+        self.coordinator._call = WarehouseCoordinator._call.__get__(self.coordinator)
+        self.coordinator.transfer(PRODUCT, 10, 0, 1)
+        self.assertEqual(self.coordinator.stock_by_site(PRODUCT), {"Львів": 10})
+
+    def test_failed_source_commit_aborts_destination(self):
+        failing(self.coordinator, 0, 'commit_transfer')
+        with self.assertRaises(ValueError):
+            self.coordinator.transfer(PRODUCT, 4, 0, 1)
+        self.assertEqual(self.coordinator.stock_by_site(PRODUCT), {"Київ": 10})
+        self.assertEqual(self.decisions(), ["commit", TRANSFER_ABORTED])
+        self.assertEqual(self.coordinator.in_doubt_transfers(), [])
+        self.assert_nothing_prepared()
+
+    def test_destination_commit_is_retried(self):
+        failures = failing(self.coordinator, 1, 'commit_transfer', times=2)
+        self.coordinator.transfer(PRODUCT, 4, 0, 1)
+        self.assertEqual(len(failures), 2)
+        self.assertEqual(self.coordinator.stock_by_site(PRODUCT), {"Київ": 6, "Львів": 4})
+        self.assert_nothing_prepared()
+
+    def test_failed_destination_commit_returns_stock(self):
+        failing(self.coordinator, 1, 'commit_transfer')
+        with self.assertRaises(ValueError):
+            self.coordinator.transfer(PRODUCT, 4, 0, 1)
+        self.assertEqual(self.coordinator.stock_by_site(PRODUCT), {"Київ": 10})
+        self.assertEqual(self.coordinator.total_quantity(PRODUCT), 10)
+        self.assertEqual(self.decisions(), ["commit", TRANSFER_COMPENSATED])
+        self.assert_nothing_prepared()
+
+    def test_unresolved_decisions_survive_restart(self):
+        self.coordinator._call = self._disconnecting(self.coordinator._call)
+        with self.assertRaises(EOFError):
+            self.coordinator.transfer(PRODUCT, 4, 0, 1)
+        self.coordinator.close()
+
+        self.coordinator = WarehouseCoordinator(["Київ", "Львів"], self.directory.name)
+        (record,) = self.coordinator.in_doubt_transfers()
+        self.assertEqual((record.product_name, record.quantity, record.source, record.destination),
+                         (PRODUCT, 4, 0, 1))
+        self.coordinator.resolve_transfer(record.transfer_id, TRANSFER_ABORTED)
+        self.assertEqual(self.coordinator.in_doubt_transfers(), [])
+        self.coordinator.close()
+        self.coordinator = WarehouseCoordinator(["Київ", "Львів"], self.directory.name)
+        self.assertEqual(self.coordinator.in_doubt_transfers(), [])
+
+    def test_dead_site_is_retired(self):
+        self.coordinator._processes[1].terminate()
+        self.coordinator._processes[1].join()
+        with self.assertRaises((EOFError, OSError)):
+            self.coordinator.transfer(PRODUCT, 4, 0, 1)
+        with self.assertRaises(ValueError):
+            self.coordinator.transfer(PRODUCT, 4, 0, 1)
+        self.assertEqual(self.coordinator.stock_by_site(PRODUCT), {"Київ": 10})
+        self.assertEqual(self.coordinator.prepared_transfers(), {"Київ": []})
+
+    def test_concurrent_transfers_log_whole_lines(self):
+        def move(source, destination):
+            for _ in range(20):
+                try:
+                    self.coordinator.transfer(PRODUCT, 1, source, destination)
+                except ValueError:
+                    pass
+
+        threads = [threading.Thread(target=move, args=pair) for pair in ((0, 1), (1, 0), (0, 1), (1, 0))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        states = self.decisions()
+        self.assertEqual(states.count("commit"), states.count(TRANSFER_DONE))
+        self.assertEqual(self.coordinator.total_quantity(PRODUCT), 10)
+
+    @staticmethod
+    def _disconnecting(call):
+        def wrapper(target, name, *args):
+            if name == 'commit_transfer':
+                raise EOFError
+            return call(target, name, *args)
+        return wrapper
+
+
+class SiteWorkerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.worker = SiteWorker("Київ", clock=lambda: self.now)
+        self.worker.warehouse.reservations.clock = lambda: self.now
+        self.worker.add_supplier({'name': SUPPLIER.name, 'email': SUPPLIER.email,
+                                  'phone': SUPPLIER.phone, 'address': SUPPLIER.address})
+        self.worker.add_product({'name': PRODUCT, 'quantity': 10, 'price': 500.0,
+                                 'supplier': SUPPLIER.name, 'description': ""}, 1_700_000_000.0)
+
+    def test_commit_after_hold_expired(self):
+        data = self.worker.prepare_transfer_out(1, PRODUCT, 4)
+        self.worker.warehouse.reservations.clock = lambda: TRANSFER_HOLD_TTL + 1
+        self.assertEqual(self.worker.warehouse.reserved_quantity(PRODUCT), 0)
+
+        ok, lots = self.worker.handle('commit_transfer', (1, 1_700_000_100.0))
+        self.assertTrue(ok)
+        self.assertEqual([lot[:2] for lot in lots], [(4, 500.0)])
+        self.assertEqual(self.worker.warehouse.products[PRODUCT].quantity, 6)
+        self.assertEqual(self.worker.prepared_transfers(), [])
+        self.assertEqual(data['name'], PRODUCT)
+
+    def test_transferred_stock_keeps_source_lot_costs(self):
+        self.worker.add_product({'name': PRODUCT, 'quantity': 5, 'price': 600.0,
+                                 'supplier': SUPPLIER.name, 'description': ""}, 1_700_000_050.0)
+        destination = SiteWorker("Львів", clock=lambda: self.now)
+        destination.add_supplier({'name': SUPPLIER.name, 'email': SUPPLIER.email,
+                                  'phone': SUPPLIER.phone, 'address': SUPPLIER.address})
+
+        data = self.worker.prepare_transfer_out(1, PRODUCT, 12)
+        destination.prepare_transfer_in(1, data, 12)
+        lots = self.worker.commit_transfer(1, 1_700_000_100.0)
+        destination.commit_transfer(1, 1_700_000_100.0, lots)
+
+        self.assertEqual(self.worker.warehouse.cost_of_goods_sold(), 0.0)
+        self.assertEqual(self.worker.warehouse.stock_cost(), 3 * 600.0)
+        self.assertEqual(destination.warehouse.stock_cost(), 10 * 500.0 + 2 * 600.0)
+
+    def test_stale_prepared_transfers_expire(self):
+        self.worker.prepare_transfer_out(1, PRODUCT, 4)
+        self.worker.prepare_transfer_in(2, {'supplier': SUPPLIER.name}, 3)
+        self.assertEqual(self.worker.prepared_transfers(), [1, 2])
+
+        self.now = TRANSFER_HOLD_TTL + 1
+        self.assertEqual(self.worker.prepared_transfers(), [])
+        self.assertEqual(self.worker.warehouse.reserved_quantity(PRODUCT), 0)
+        ok, error = self.worker.handle('commit_transfer', (2, 1_700_000_100.0))
+        self.assertFalse(ok)
+        self.assertIn("2", error)
+
+    def test_abort_clears_both_directions(self):
+        self.worker.prepare_transfer_out(1, PRODUCT, 4)
+        self.worker.prepare_transfer_in(2, {'supplier': SUPPLIER.name}, 3)
+        self.worker.abort_transfer(1)
+        self.worker.abort_transfer(2)
+        self.assertEqual(self.worker.prepared_transfers(), [])
+        self.assertEqual(self.worker.warehouse.reserved_quantity(PRODUCT), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from product import Product
+from storage import SNAPSHOT_FILE, WAL_FILE, StorageEngine
+from supplier import Supplier
+
+SUPPLIER = "ТОВ Постачання"
+
+
+def fill(warehouse, count=3):
+    supplier = Supplier(SUPPLIER, "supply@example.com", "+380991234567", "м. Київ")
+    warehouse.add_supplier(supplier)
+    for i in range(count):
+        warehouse.add_product(Product(f"Товар {i}", 10 + i, 100.0 + i, supplier), datetime(2024, 1, 1 + i))
+
+
+class StorageEngineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.wal_path = os.path.join(self.directory.name, WAL_FILE)
+        self.snapshot_path = os.path.join(self.directory.name, SNAPSHOT_FILE)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def crash(self, storage):
+        storage.sync()
+        storage._wal.close()
+        storage._wal = None
+
+    def test_torn_wal_tail_is_dropped_and_truncated(self):
+        storage = StorageEngine(self.directory.name)
+        fill(storage.open("Склад"))
+        self.crash(storage)
+        valid_size = os.path.getsize(self.wal_path)
+        with open(self.wal_path, 'ab') as f:
+            f.write('{"seq": 5, "event": "remove_product", "data": {"name": "Тов'.encode('utf-8'))
+
+        storage = StorageEngine(self.directory.name)
+        warehouse = storage.open("Склад")
+        self.assertEqual(sorted(warehouse.products), ["Товар 0", "Товар 1", "Товар 2"])
+        self.assertEqual(len(warehouse.transactions), 3)
+        self.assertEqual(os.path.getsize(self.wal_path), valid_size)
+
+        warehouse.remove_product("Товар 1", 4, datetime(2024, 2, 1))
+        self.crash(storage)
+        warehouse = StorageEngine(self.directory.name).open("Склад")
+        self.assertEqual(warehouse.products["Товар 1"].quantity, 7)
+        self.assertEqual(len(warehouse.transactions), 4)
+
+    def test_corrupt_wal_record_stops_replay(self):
+        storage = StorageEngine(self.directory.name)
+        fill(storage.open("Склад"))
+        self.crash(storage)
+        with open(self.wal_path, 'rb') as f:
+            lines = f.readlines()
+        with open(self.wal_path, 'wb') as f:
+            f.writelines(lines[:2] + [b'{"seq": \xff\n'] + lines[2:])
+
+        warehouse = StorageEngine(self.directory.name).open("Склад")
+        self.assertEqual(list(warehouse.products), ["Товар 0"])
+        self.assertEqual(os.path.getsize(self.wal_path), sum(map(len, lines[:2])))
+
+    def test_close_without_changes_keeps_snapshot(self):
+        storage = StorageEngine(self.directory.name)
+        fill(storage.open("Склад"))
+        storage.close()
+        written = os.stat(self.snapshot_path)
+
+        storage = StorageEngine(self.directory.name)
+        warehouse = storage.open("Склад")
+        self.assertEqual(len(warehouse.transactions), 3)
+        storage.close()
+        self.assertEqual(os.stat(self.snapshot_path).st_mtime_ns, written.st_mtime_ns)
+        self.assertEqual(os.stat(self.snapshot_path).st_ino, written.st_ino)
+
+        storage = StorageEngine(self.directory.name)
+        storage.open("Склад").update_product_info("Товар 0", new_quantity=1)
+        storage.close()
+        self.assertEqual(StorageEngine(self.directory.name).open("Склад").products["Товар 0"].quantity, 1)
+
+    def test_idle_wal_is_synced_by_timer(self):
+        storage = StorageEngine(self.directory.name, sync_every=1000, sync_interval=0.2)
+        fill(storage.open("Склад"))
+        self.assertTrue(storage._pending)
+        for _ in range(100):
+            if not storage._pending:
+                break
+            time.sleep(0.02)
+        self.assertEqual(storage._pending, 0)
+
+        flusher = storage._flusher
+        storage.close()
+        self.assertFalse(flusher.is_alive())
+
+    def test_open_in_background(self):
+        storage = StorageEngine(self.directory.name)
+        fill(storage.open("Склад"))
+        storage.close()
+
+        storage = StorageEngine(self.directory.name)
+        pending = storage.open_in_background("Склад")
+        warehouse = pending.result()
+        self.assertTrue(pending.ready)
+        self.assertIs(storage.warehouse, warehouse)
+        self.assertEqual([product.name for product in warehouse.get_products_sorted('name')],
+                         ["Товар 0", "Товар 1", "Товар 2"])
+        warehouse.remove_product("Товар 2", 12)
+        storage.close()
+        self.assertNotIn("Товар 2", StorageEngine(self.directory.name).open("Склад").products)
+
+    def test_open_in_background_reports_errors(self):
+        with open(self.snapshot_path, 'wb') as f:
+            f.write(b'NOTASNAPSHOT')
+
+        pending = StorageEngine(self.directory.name).open_in_background("Склад")
+        with self.assertRaises(ValueError):
+            pending.result()
+        self.assertTrue(pending.ready)
+
+
+if __name__ == "__main__":
+    unittest.main()
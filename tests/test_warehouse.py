@@ -0,0 +1,72 @@
+import threading
+import unittest
+from itertools import islice
+from concurrent_warehouse import ConcurrentWarehouse
+from product import Product
+from supplier import Supplier
+from warehouse import Warehouse
+
+
+def build_warehouse(warehouse_class=Warehouse, count=20):
+    warehouse = warehouse_class("Склад")
+    supplier = Supplier("ТОВ Постачання", "supply@example.com", "+380991234567", "м. Київ")
+    warehouse.add_supplier(supplier)
+    for i in range(count):
+        warehouse.add_product(Product(f"Товар {i:03d}", i % 4 + 1, float(i % 5 + 1), supplier))
+    return warehouse
+
+
+class IterProductsTest(unittest.TestCase):
+
+    def page_through_with_deleted_cursor(self, warehouse, sort_by):
+        expected = [product.name for product in warehouse.iter_products(sort_by)]
+        first_page = list(warehouse.iter_products(sort_by, limit=5))
+        cursor = warehouse.product_cursor(first_page[-1], sort_by)
+        warehouse.remove_product(first_page[-1].name, first_page[-1].quantity)
+        self.assertNotIn(first_page[-1].name, warehouse.products)
+
+        rest = list(warehouse.iter_products(sort_by, after=cursor))
+        self.assertEqual([product.name for product in first_page + rest], expected)
+
+    def test_unsorted_paging_survives_deleted_cursor(self):
+        self.page_through_with_deleted_cursor(build_warehouse(), None)
+
+    def test_sorted_paging_survives_deleted_cursor(self):
+        for sort_by in ('name', 'quantity', 'price'):
+            self.page_through_with_deleted_cursor(build_warehouse(), sort_by)
+
+    def test_concurrent_paging_during_writes(self):
+        warehouse = build_warehouse(ConcurrentWarehouse, 5000)
+        supplier = warehouse.suppliers["ТОВ Постачання"]
+        stop = threading.Event()
+        errors = []
+
+        def write():
+            i = 0
+            while not stop.is_set():
+                warehouse.add_product(Product(f"Новий {i:06d}", 1, 1.0, supplier))
+                name = f"Товар {i % 5000:03d}"
+                if name in warehouse.products:
+                    warehouse.remove_product(name, 1)
+                i += 1
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            for sort_by in (None, 'price'):
+                after = None
+                for _ in range(20):
+                    page = list(islice(warehouse.iter_products(sort_by, after), 500))
+                    if not page:
+                        break
+                    after = warehouse.product_cursor(page[-1], sort_by)
+        except RuntimeError as e:
+            errors.append(e)
+        finally:
+            stop.set()
+            writer.join()
+        self.assertEqual(errors, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,55 +1,244 @@
-from typing import List, Dict, Optional
-from supplier import Supplier
+from array import array
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, List, Dict, Iterable, Iterator, Optional, Tuple
+from supplier import EMAIL_ERROR, PHONE_ERROR, Supplier
 from product import Product
-from transaction import Transaction
 from enums import TransactionType
+from transaction import Transaction
+from indexes import SortedIndex
+from journal import TYPE_CODES, TransactionJournal
+from analytics import DEFAULT_TURNOVER_DAYS, InventoryAnalytics
+from history import TransactionHistory
+from search import DEFAULT_SEARCH_LIMIT, SearchIndex
+from reservations import DEFAULT_HOLD_TTL, Hold, ReservationBook
+from lots import FIFO, LotLayer, LotLedger, StockLot
+from replenishment import DepartedProduct, ReorderSuggestion, ReplenishmentPlanner
+from cache import CATALOG, SUPPLIERS, QueryCache, attribute_key, product_key, supplier_key
+from bulk_import import (
+    BULK_BATCH_SIZE, ImportReport, ProductRow, RowSource, SupplierRow,
+    iter_batches, read_rows, validate_product_rows, validate_supplier_rows,
+)
+
+SORT_KEYS = ('name', 'quantity', 'price')
+
+SHIP_QUANTITY_ERROR = "Кількість для відвантаження повинна бути більше нуля"
+
+Observer = Callable[[str, Dict[str, Any]], None]
 
 
 class Warehouse:
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, journal_dir: Optional[str] = None, picking_policy: str = FIFO):
         self.name = name
         self.products: Dict[str, Product] = {}
         self.suppliers: Dict[str, Supplier] = {}
-        self.transactions: List[Transaction] = []
+        self.transactions = TransactionJournal(spill_dir=journal_dir, resolve_product=self.products.get)
+        self._supplier_index: Dict[str, Dict[str, Product]] = {}
+        self._sorted_indexes: Dict[str, SortedIndex] = {key: SortedIndex(key) for key in SORT_KEYS}
+        self.analytics = InventoryAnalytics(self.products.values, self.transactions)
+        self.history = TransactionHistory(self.transactions, lambda name: self._supplier_index.get(name, {}))
+        self._search_index = SearchIndex()
+        self.reservations = ReservationBook()
+        self.lots = LotLedger(picking_policy)
+        self.replenishment = ReplenishmentPlanner(self.products.get, self.transactions)
+        self.cache = QueryCache()
+        self._product_listeners = (self._on_product_changed,)
+        self._observers: List[Observer] = []
+        self._deferred_index_updates: Optional[Dict[Tuple[str, str], Tuple[Product, Any]]] = None
+
+    def add_observer(self, observer: Observer) -> None:
+        self._observers.append(observer)
+
+    def remove_observer(self, observer: Observer) -> None:
+        if observer in self._observers:
+            self._observers.remove(observer)
 
     def add_supplier(self, supplier: Supplier) -> None:
         if supplier.name in self.suppliers:
             raise ValueError(f"Постачальник з назвою '{supplier.name}' вже існує")
         self.suppliers[supplier.name] = supplier
+        self._supplier_index.setdefault(supplier.name, {})
+        self.cache.bump(SUPPLIERS, supplier_key(supplier.name))
+
+        self._emit('add_supplier', {
+            'name': supplier.name,
+            'email': supplier.email,
+            'phone': supplier.phone,
+            'address': supplier.address,
+        })
+
+    def update_supplier_info(
+        self,
+        supplier_name: str,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        address: Optional[str] = None,
+    ) -> None:
+        supplier = self.suppliers.get(supplier_name)
+        if supplier is None:
+            raise ValueError(f"Постачальник '{supplier_name}' не знайдено")
+        if email is not None and not Supplier._validate_email(email):
+            raise ValueError(EMAIL_ERROR)
+        if phone is not None and not Supplier._validate_phone(phone):
+            raise ValueError(PHONE_ERROR)
+
+        if email is not None:
+            supplier.email = email
+        if phone is not None:
+            supplier.phone = phone
+        if address is not None:
+            supplier.address = address
+        self.cache.bump(SUPPLIERS, supplier_key(supplier_name))
+
+        self._emit('update_supplier_info', {
+            'name': supplier_name,
+            'email': email,
+            'phone': phone,
+            'address': address,
+        })
 
-    def add_product(self, product: Product) -> None:
+    def add_product(
+        self,
+        product: Product,
+        date: Optional[datetime] = None,
+        expiry_date: Optional[datetime] = None,
+    ) -> None:
         if product.supplier.name not in self.suppliers:
             raise ValueError(f"Постачальник '{product.supplier.name}' не зареєстрований")
 
+        expiry_timestamp = int(expiry_date.timestamp()) if expiry_date is not None else None
         if product.name in self.products:
             existing_product = self.products[product.name]
-            existing_product.quantity += product.quantity
+            self.lots.receive(existing_product, product.quantity, product.price,
+                              product.arrival_timestamp, expiry_timestamp)
+            existing_product.update_quantity(existing_product.quantity + product.quantity)
             existing_product.update_price(product.price)
         else:
-            self.products[product.name] = product
+            product.supplier = self.suppliers[product.supplier.name]
+            self._insert_product(product)
+            if expiry_timestamp is not None:
+                self.lots.track(product, expiry_timestamp)
 
-        self.transactions.append(
-            Transaction(product, product.quantity, TransactionType.RECEIPT)
-        )
+        date = date or datetime.now()
+        self._record_transaction(product.name, product.quantity, TransactionType.RECEIPT, date)
+
+        self._emit('add_product', {
+            'name': product.name,
+            'quantity': product.quantity,
+            'price': product.price,
+            'supplier': product.supplier.name,
+            'arrival_date': product.arrival_timestamp,
+            'expiry_date': expiry_timestamp,
+            'description': product.description,
+            'date': date.timestamp(),
+        })
 
-    def remove_product(self, product_name: str, quantity: int) -> None:
+    def remove_product(self, product_name: str, quantity: int, date: Optional[datetime] = None) -> None:
+        self._remove_product(product_name, quantity, date)
+
+    def _remove_product(self, product_name: str, quantity: int, date: Optional[datetime]) -> None:
         if product_name not in self.products:
             raise ValueError(f"Товар '{product_name}' не знайдено на складі")
 
+        if quantity <= 0:
+            raise ValueError(SHIP_QUANTITY_ERROR)
+
         product = self.products[product_name]
+        available = self._available(product)
 
-        if quantity > product.quantity:
-            raise ValueError(f"Недостатня кількість товару на складі. Доступно: {product.quantity}")
+        if quantity > available:
+            raise ValueError(f"Недостатня кількість товару на складі. Доступно: {available}")
 
-        product.update_quantity(product.quantity - quantity)
+        date = date or datetime.now()
+        self._ship(product, quantity, date)
 
-        self.transactions.append(
-            Transaction(product, quantity, TransactionType.SHIPMENT)
-        )
+        self._emit('remove_product', {
+            'name': product_name,
+            'quantity': quantity,
+            'date': date.timestamp(),
+        })
 
-        if product.quantity == 0:
-            del self.products[product_name]
+    def ship_order(self, lines: List[Tuple[str, int]], date: Optional[datetime] = None) -> None:
+        required: Dict[str, int] = {}
+        for product_name, quantity in lines:
+            if quantity <= 0:
+                raise ValueError(SHIP_QUANTITY_ERROR)
+            required[product_name] = required.get(product_name, 0) + quantity
+
+        for product_name, quantity in required.items():
+            product = self.products.get(product_name)
+            if product is None:
+                raise ValueError(f"Товар '{product_name}' не знайдено на складі")
+            available = self._available(product)
+            if quantity > available:
+                raise ValueError(f"Недостатня кількість товару '{product_name}' на складі. "
+                                 f"Доступно: {available}")
+
+        date = date or datetime.now()
+        for product_name, quantity in lines:
+            self._ship(self.products[product_name], quantity, date)
+
+        self._emit('ship_order', {
+            'lines': [[product_name, quantity] for product_name, quantity in lines],
+            'date': date.timestamp(),
+        })
+
+    def transfer_out(self, product_name: str, quantity: int, date: Optional[datetime] = None) -> List[LotLayer]:
+        product = self.products.get(product_name)
+        if product is None:
+            raise ValueError(f"Товар '{product_name}' не знайдено на складі")
+        if quantity <= 0:
+            raise ValueError("Кількість для переміщення повинна бути більше нуля")
+        available = self._available(product)
+        if quantity > available:
+            raise ValueError(f"Недостатня кількість товару на складі. Доступно: {available}")
+
+        date = date or datetime.now()
+        lots = self._ship(product, quantity, date, TransactionType.TRANSFER)
+
+        self._emit('transfer_out', {
+            'name': product_name,
+            'quantity': quantity,
+            'date': date.timestamp(),
+        })
+        return lots
+
+    def transfer_in(self, product: Product, date: Optional[datetime] = None,
+                    lots: Optional[Iterable[LotLayer]] = None) -> None:
+        if product.supplier.name not in self.suppliers:
+            raise ValueError(f"Постачальник '{product.supplier.name}' не зареєстрований")
+        if lots is not None:
+            lots = [tuple(lot) for lot in lots]
+            if sum(lot[0] for lot in lots) != product.quantity:
+                raise ValueError("Кількість у партіях не збігається з кількістю переміщеного товару")
+
+        existing_product = self.products.get(product.name)
+        if existing_product is not None:
+            if lots is None:
+                self.lots.receive(existing_product, product.quantity, product.price, product.arrival_timestamp)
+            else:
+                self.lots.receive_lots(existing_product, lots)
+            existing_product.update_quantity(existing_product.quantity + product.quantity)
+        else:
+            product.supplier = self.suppliers[product.supplier.name]
+            self._insert_product(product)
+            if lots is not None:
+                self.lots.restore(product, lots)
+
+        date = date or datetime.now()
+        self._record_transaction(product.name, product.quantity, TransactionType.TRANSFER, date)
+
+        self._emit('transfer_in', {
+            'name': product.name,
+            'quantity': product.quantity,
+            'price': product.price,
+            'supplier': product.supplier.name,
+            'arrival_date': product.arrival_timestamp,
+            'description': product.description,
+            'lots': [list(lot) for lot in lots] if lots is not None else None,
+            'date': date.timestamp(),
+        })
 
     def update_product_info(
         self,
@@ -61,6 +250,10 @@ class Warehouse:
             raise ValueError(f"Товар '{product_name}' не знайдено на складі")
 
         product = self.products[product_name]
+        reserved = self.reserved_quantity(product_name)
+
+        if new_quantity is not None and 0 <= new_quantity < reserved:
+            raise ValueError(f"Кількість не може бути меншою за зарезервовану: {reserved}")
 
         if new_quantity is not None:
             product.update_quantity(new_quantity)
@@ -68,20 +261,413 @@ class Warehouse:
         if new_price is not None:
             product.update_price(new_price)
 
+        self._emit('update_product_info', {
+            'name': product_name,
+            'quantity': new_quantity,
+            'price': new_price,
+        })
+
+    def reserve_product(self, product_name: str, quantity: int, ttl: float = DEFAULT_HOLD_TTL) -> Hold:
+        product = self.products.get(product_name)
+        if product is None:
+            raise ValueError(f"Товар '{product_name}' не знайдено на складі")
+        return self.reservations.reserve(product_name, quantity, product.quantity, ttl)
+
+    def confirm_reservation(self, hold_id: int, date: Optional[datetime] = None) -> None:
+        hold = self.release_reservation(hold_id)
+        self._remove_product(hold.product_name, hold.quantity, date)
+
+    def release_reservation(self, hold_id: int) -> Hold:
+        return self.reservations.release(hold_id)
+
+    def available_quantity(self, product_name: str) -> int:
+        product = self.products.get(product_name)
+        return self._available(product) if product is not None else 0
+
+    def reserved_quantity(self, product_name: str) -> int:
+        return self.reservations.reserved(product_name)
+
+    def get_product_lots(self, product_name: str) -> List[StockLot]:
+        product = self.products.get(product_name)
+        if product is None:
+            raise ValueError(f"Товар '{product_name}' не знайдено на складі")
+        return self.lots.lots(product)
+
+    def stock_cost(self) -> float:
+        return self.lots.total_stock_cost(self.products.values())
+
+    def cost_of_goods_sold(self, product_name: Optional[str] = None) -> float:
+        if product_name is None:
+            return self.lots.total_cost_of_goods()
+        return self.lots.cost_of_goods.get(product_name, 0.0)
+
+    def reorder_suggestions(
+        self,
+        lead_time_days: Optional[float] = None,
+        cover_days: Optional[float] = None,
+    ) -> Dict[str, List[ReorderSuggestion]]:
+        return self.replenishment.suggestions(lead_time_days, cover_days)
+
+    def stockout_risk(self, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        return self.replenishment.at_risk(limit=limit)
+
+    def stock_value(self, supplier_name: Optional[str] = None) -> float:
+        if supplier_name is None:
+            return self.analytics.total_stock_value()
+        return self.analytics.supplier_stock_value(supplier_name)
+
+    def supplier_stock_values(self) -> Dict[str, float]:
+        return self.analytics.supplier_stock_values()
+
+    def inventory_turnover(self, product_name: Optional[str] = None, days: int = DEFAULT_TURNOVER_DAYS) -> float:
+        if product_name is None:
+            on_hand = self.analytics.total_quantity()
+        else:
+            product = self.products.get(product_name)
+            on_hand = product.quantity if product is not None else 0
+        return self.analytics.turnover(on_hand, product_name, days)
+
+    def bulk_add_suppliers(self, source: RowSource, batch_size: int = BULK_BATCH_SIZE) -> ImportReport:
+        report = ImportReport()
+        first_line = 1
+        existing = set(self.suppliers)
+
+        for batch in iter_batches(read_rows(source), batch_size):
+            rows = validate_supplier_rows(batch, first_line, existing, report)
+            first_line += len(batch)
+            self._apply_supplier_rows(rows)
+            report.accepted += len(rows)
+
+        return report
+
+    def bulk_add_products(
+        self,
+        source: RowSource,
+        batch_size: int = BULK_BATCH_SIZE,
+        date: Optional[datetime] = None,
+    ) -> ImportReport:
+        report = ImportReport()
+        first_line = 1
+        registered = set(self.suppliers)
+
+        for batch in iter_batches(read_rows(source), batch_size):
+            rows = validate_product_rows(batch, first_line, registered, report)
+            first_line += len(batch)
+            self._apply_product_rows(rows, date or datetime.now())
+            report.accepted += len(rows)
+
+        return report
+
+    def bulk_remove_products(
+        self,
+        lines: List[Tuple[str, int]],
+        date: Optional[datetime] = None,
+    ) -> List[Optional[str]]:
+        date = date or datetime.now()
+        errors: List[Optional[str]] = []
+        shipped: List[Tuple[str, int]] = []
+
+        self._deferred_index_updates = {}
+        try:
+            for product_name, quantity in lines:
+                product = self.products.get(product_name)
+                available = self._available(product) if product is not None else 0
+                if product is None:
+                    errors.append(f"Товар '{product_name}' не знайдено на складі")
+                elif quantity <= 0:
+                    errors.append(SHIP_QUANTITY_ERROR)
+                elif quantity > available:
+                    errors.append(f"Недостатня кількість товару на складі. Доступно: {available}")
+                else:
+                    self._ship(product, quantity, date)
+                    shipped.append((product_name, quantity))
+                    errors.append(None)
+        finally:
+            self._flush_index_updates()
+
+        if shipped:
+            self._emit('bulk_remove_products', {
+                'lines': [[product_name, quantity] for product_name, quantity in shipped],
+                'date': date.timestamp(),
+            })
+        return errors
+
     def get_all_products(self) -> List[Product]:
         return list(self.products.values())
 
     def get_products_sorted(self, sort_key: str) -> List[Product]:
-        if sort_key not in ['name', 'quantity', 'price']:
-            raise ValueError("Неправильний ключ сортування. Доступні: 'name', 'quantity', 'price'")
+        index = self._get_sorted_index(sort_key)
+        return list(self.cache.get(
+            ('products_sorted', sort_key),
+            lambda: self._resolve_names(index.names()),
+            (CATALOG, attribute_key(sort_key)),
+            len,
+        ))
+
+    def get_products_in_range(
+        self,
+        sort_key: str,
+        min_value: Optional[Any] = None,
+        max_value: Optional[Any] = None,
+    ) -> List[Product]:
+        index = self._get_sorted_index(sort_key)
+        return list(self.cache.get(
+            ('products_in_range', sort_key, min_value, max_value),
+            lambda: self._resolve_names(index.names_between(min_value, max_value)),
+            (CATALOG, attribute_key(sort_key)),
+            len,
+        ))
 
-        return sorted(self.products.values(), key=lambda p: getattr(p, sort_key))
+    def iter_products(
+        self,
+        sort_by: Optional[str] = None,
+        after: Optional[Any] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Product]:
+        index = self._get_sorted_index(sort_by or 'name')
+        if sort_by in (None, 'name') and isinstance(after, str):
+            after = (after, after)
+        for _, name in index.iter_after(after, limit):
+            product = self.products.get(name)
+            if product is not None:
+                yield product
+
+    def product_cursor(self, product: Product, sort_by: Optional[str] = None) -> Any:
+        if sort_by is None:
+            return product.name
+        return getattr(product, sort_by), product.name
+
+    def iter_transactions(
+        self,
+        since: Optional[datetime] = None,
+        transaction_type: Optional[TransactionType] = None,
+        limit: Optional[int] = None,
+        until: Optional[datetime] = None,
+        product_name: Optional[str] = None,
+        supplier_name: Optional[str] = None,
+    ) -> Iterator[Transaction]:
+        rows = self.history.transactions(since, until, transaction_type, product_name, supplier_name)
+        for _, transaction in islice(rows, limit):
+            yield transaction
+
+    def transaction_totals(
+        self,
+        period: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        transaction_type: Optional[TransactionType] = None,
+        product_name: Optional[str] = None,
+        supplier_name: Optional[str] = None,
+    ) -> List[Tuple[datetime, Dict[TransactionType, int]]]:
+        return self.history.totals(period, since, until, transaction_type, product_name, supplier_name)
+
+    def search_products(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[Product]:
+        return self._resolve_names(self._search_index.search(query, limit))
 
     def get_supplier_products(self, supplier_name: str) -> List[Product]:
         if supplier_name not in self.suppliers:
             raise ValueError(f"Постачальник '{supplier_name}' не знайдено")
 
-        return [p for p in self.products.values() if p.supplier.name == supplier_name]
+        return list(self.cache.get(
+            ('supplier_products', supplier_name),
+            lambda: list(self._supplier_index.get(supplier_name, {}).values()),
+            (supplier_key(supplier_name),),
+            len,
+        ))
 
     def get_all_suppliers(self) -> List[Supplier]:
-        return list(self.suppliers.values())
\ No newline at end of file
+        return list(self.suppliers.values())
+
+    def _apply_supplier_rows(self, rows: List[SupplierRow]) -> None:
+        if not rows:
+            return
+
+        for row in rows:
+            self.suppliers[row.name] = Supplier._restore(row.name, row.email, row.phone, row.address)
+            self._supplier_index.setdefault(row.name, {})
+        self.cache.bump(SUPPLIERS, *(supplier_key(row.name) for row in rows))
+
+        self._emit('bulk_add_suppliers', {
+            'rows': [[row.name, row.email, row.phone, row.address] for row in rows],
+        })
+
+    def _apply_product_rows(self, rows: List[ProductRow], date: datetime) -> None:
+        if not rows:
+            return
+
+        journal = self.transactions
+        timestamp = date.timestamp()
+        columns = (
+            array('I', [journal.product_id(row.name) for row in rows]),
+            array('q', [row.quantity for row in rows]),
+            array('B', [TYPE_CODES[TransactionType.RECEIPT]]) * len(rows),
+            array('d', [timestamp]) * len(rows),
+        )
+
+        new_products = []
+        receipts: Dict[str, List] = {}
+        arrival_timestamp = int(date.timestamp())
+        lots = self.lots
+        self._deferred_index_updates = {}
+        try:
+            for row in rows:
+                product = self.products.get(row.name)
+                if product is None:
+                    product = Product._restore(row.name, row.quantity, row.price, self.suppliers[row.supplier],
+                                               arrival_timestamp, row.description)
+                    self.products[row.name] = product
+                    new_products.append(product)
+                    continue
+                lots.receive(product, row.quantity, row.price, arrival_timestamp)
+                entry = receipts.get(row.name)
+                if entry is None:
+                    receipts[row.name] = [product, row.quantity, row.price]
+                else:
+                    entry[1] += row.quantity
+                    entry[2] = row.price
+
+            for product, quantity, price in receipts.values():
+                product.update_quantity(product.quantity + quantity)
+                product.update_price(price)
+        finally:
+            self._flush_index_updates()
+        self._index_products(new_products)
+
+        journal.extend_columns(*columns)
+        self.analytics.on_transactions((row.name for row in rows), (row.quantity for row in rows),
+                                       TYPE_CODES[TransactionType.RECEIPT], timestamp)
+
+        self._emit('bulk_add_products', {
+            'rows': [[row.name, row.quantity, row.price, row.supplier, row.description] for row in rows],
+            'date': timestamp,
+        })
+
+    def _ship(self, product: Product, quantity: int, date: datetime,
+              transaction_type: TransactionType = TransactionType.SHIPMENT) -> List[LotLayer]:
+        if transaction_type == TransactionType.SHIPMENT:
+            lots = self.lots.pick(product, quantity)
+        else:
+            lots = self.lots.take(product, quantity)
+        product.update_quantity(product.quantity - quantity)
+        self._record_transaction(product.name, quantity, transaction_type, date)
+
+        if product.quantity == 0:
+            self._delete_product(product)
+        return lots
+
+    def _available(self, product: Product) -> int:
+        return self.reservations.available(product.name, product.quantity)
+
+    def _insert_product(self, product: Product) -> None:
+        self.products[product.name] = product
+        self._index_product(product)
+
+    def _delete_product(self, product: Product) -> None:
+        del self.products[product.name]
+        self._unindex_product(product)
+        self.lots.discard(product.name)
+
+    def _record_transaction(self, product_name: str, quantity: int,
+                            transaction_type: TransactionType, date: datetime) -> None:
+        self.transactions.record(product_name, quantity, transaction_type, date)
+        type_code, timestamp = TYPE_CODES[transaction_type], date.timestamp()
+        self.analytics.on_transaction(product_name, quantity, type_code, timestamp)
+        self.replenishment.on_transaction(product_name, quantity, type_code, timestamp)
+
+    def _restore_state(self, suppliers: Iterable[Supplier], products: Iterable[Product]) -> None:
+        for supplier in suppliers:
+            self.suppliers[supplier.name] = supplier
+            self._supplier_index.setdefault(supplier.name, {})
+
+        listeners = self._product_listeners
+        catalog, supplier_index = self.products, self._supplier_index
+        for product in products:
+            catalog[product.name] = product
+            supplier_index.setdefault(product.supplier.name, {})[product.name] = product
+            product.add_listeners(listeners)
+
+        for key, index in self._sorted_indexes.items():
+            index.build_lazily(self._index_source(key))
+        self._search_index.build_lazily(self.products.keys)
+        self.analytics.invalidate()
+        self.replenishment.invalidate()
+        self.cache.invalidate()
+
+    def _restore_departed(self, departed: Iterable[DepartedProduct]) -> None:
+        departed = [(name, supplier_name, price) for name, supplier_name, price in departed]
+        self.replenishment.restore_departed(departed)
+        self.history.restore_departed((name, supplier_name) for name, supplier_name, _ in departed)
+
+    def _index_source(self, key: str) -> Callable[[], Iterable]:
+        return lambda: ((getattr(product, key), name) for name, product in self.products.items())
+
+    def _emit(self, event: str, data: Dict[str, Any]) -> None:
+        for observer in self._observers:
+            observer(event, data)
+
+    def _resolve_names(self, names: Iterable[str]) -> List[Product]:
+        products = [self.products.get(name) for name in names]
+        return [product for product in products if product is not None]
+
+    def _get_sorted_index(self, sort_key: str) -> SortedIndex:
+        if sort_key not in SORT_KEYS:
+            raise ValueError("Неправильний ключ сортування. Доступні: 'name', 'quantity', 'price'")
+        return self._sorted_indexes[sort_key]
+
+    def _index_product(self, product: Product) -> None:
+        self._supplier_index.setdefault(product.supplier.name, {})[product.name] = product
+        for key, index in self._sorted_indexes.items():
+            index.add(product.name, getattr(product, key))
+        product.add_listeners(self._product_listeners)
+        self._search_index.add(product.name)
+        self.analytics.on_product_added(product)
+        self.replenishment.on_product_added(product)
+        self.cache.bump(CATALOG, supplier_key(product.supplier.name))
+
+    def _index_products(self, products: List[Product]) -> None:
+        listeners = self._product_listeners
+        for product in products:
+            self._supplier_index.setdefault(product.supplier.name, {})[product.name] = product
+            product.add_listeners(listeners)
+            self.analytics.on_product_added(product)
+            self.replenishment.on_product_added(product)
+        for key, index in self._sorted_indexes.items():
+            index.add_many((getattr(product, key), product.name) for product in products)
+        self._search_index.add_many(product.name for product in products)
+        self.cache.bump(CATALOG, *{supplier_key(product.supplier.name) for product in products})
+
+    def _unindex_product(self, product: Product) -> None:
+        product.remove_listener(self._product_listeners[0])
+        self.analytics.on_product_removed(product)
+        self.history.on_product_removed(product)
+        self.replenishment.on_product_removed(product)
+        self.cache.bump(CATALOG, supplier_key(product.supplier.name))
+        self._search_index.remove(product.name)
+        self._supplier_index.get(product.supplier.name, {}).pop(product.name, None)
+        deferred = self._deferred_index_updates
+        for key, index in self._sorted_indexes.items():
+            value = getattr(product, key)
+            if deferred is not None and (key, product.name) in deferred:
+                value = deferred.pop((key, product.name))[1]
+            index.remove(product.name, value)
+
+    def _on_product_changed(self, product: Product, attribute: str, old_value: Any) -> None:
+        self.analytics.on_product_changed(product, attribute, old_value)
+        self.lots.on_product_changed(product, attribute, old_value)
+        self.replenishment.on_product_changed(product, attribute, old_value)
+        self.cache.bump(product_key(product.name), attribute_key(attribute))
+        index = self._sorted_indexes.get(attribute)
+        if index is None:
+            return
+        if self._deferred_index_updates is not None:
+            self._deferred_index_updates.setdefault((attribute, product.name), (product, old_value))
+        else:
+            index.update(product.name, old_value, getattr(product, attribute))
+
+    def _flush_index_updates(self) -> None:
+        deferred, self._deferred_index_updates = self._deferred_index_updates, None
+        changes: Dict[str, List[Tuple[str, Any, Any]]] = {}
+        for (attribute, name), (product, old_value) in deferred.items():
+            changes.setdefault(attribute, []).append((name, old_value, getattr(product, attribute)))
+        for attribute, attribute_changes in changes.items():
+            self._sorted_indexes[attribute].update_many(attribute_changes)
\ No newline at end of file